@@ -0,0 +1,62 @@
+"""
+Synthetic review generator benchmark.
+
+Times ReviewScraper._get_mock_reviews on a small sample, then
+ReviewGenerator producing column arrays and ReviewBatch chunks, and
+streaming a corpus to disk in each requested format. Writing is compared
+with generation alone, to show how much of the load-test setup is I/O.
+
+Usage:
+    python benchmarks/bench_generator.py [--rows 1000000] [--formats csv,jsonl] [--dir /tmp]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "..", "src"))
+
+from components.ReviewGenerator import ReviewGenerator
+from components.ReviewScraper import ReviewScraper
+
+def report(label, rows, seconds, extra=""):
+    print(f"{label:<28}{rows:>11,} rows{seconds:>9.2f}s{rows / seconds:>14,.0f} rows/s{extra}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000, help="reviews per generator run")
+    parser.add_argument("--chunk-size", type=int, default=100000, help="reviews per chunk")
+    parser.add_argument("--formats", default="csv,jsonl", help="output formats to time, comma separated")
+    parser.add_argument("--dir", default=tempfile.gettempdir(), help="directory for the output files")
+    parser.add_argument("--seed", type=int, default=0, help="generator seed")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    sample = min(args.rows, 100000)
+    start = time.perf_counter()
+    ReviewScraper()._get_mock_reviews(sample)
+    report("_get_mock_reviews", sample, time.perf_counter() - start)
+
+    generator = ReviewGenerator(seed=args.seed)
+    for label, chunks in (
+        ("ReviewGenerator arrays", generator.iter_arrays(args.rows, args.chunk_size)),
+        ("ReviewGenerator batches", generator.iter_batches(args.rows, args.chunk_size)),
+    ):
+        start = time.perf_counter()
+        for _ in chunks:
+            pass
+        report(label, args.rows, time.perf_counter() - start)
+
+    for format in args.formats.split(","):
+        path = os.path.join(args.dir, f"synthetic_reviews.{format}")
+        start = time.perf_counter()
+        rows = generator.write(path, args.rows, args.chunk_size)
+        seconds = time.perf_counter() - start
+        report(f"write {format}", rows, seconds, f"{os.path.getsize(path) / 1e6:>10.0f} MB")
+        os.remove(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Training and inference benchmark for the ReviewModel backend.
+
+Trains a model on the Flipkart dataset with the notebook's weak labels
+(sentiment rules included when the VADER lexicon is installed) or loads a
+saved one, reports its accuracy, ROC AUC and calibration against the weak
+labels on the held-out split (ReviewModel.holdout_mask, never trained
+on), then times single-core predict_proba over one large batch and
+compares the throughput with the target.
+
+Usage:
+    python benchmarks/bench_model.py [--model DIR] [--save DIR] [--rows 100000] [--holdout 0.1]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "..", "src"))
+
+# Measure one core: keep BLAS and OpenMP from spreading the work
+for variable in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(variable, "1")
+
+import pandas as pd
+from components.DatasetLoader import DatasetLoader
+from components.ReviewAnalyzer import ReviewAnalyzer
+from components.ReviewModel import ReviewModel
+
+TARGET_PER_SECOND = 100000
+
+def time_call(function, repeat):
+    """
+    Return the median seconds per call over repeat runs.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", help="saved model directory to load instead of training")
+    parser.add_argument("--save", help="directory to save the trained model to")
+    parser.add_argument("--rows", type=int, default=100000, help="reviews per scored batch")
+    parser.add_argument("--ngrams", type=int, default=1, help="largest word n-gram when training")
+    parser.add_argument("--epochs", type=int, default=5, help="passes over the data when training")
+    parser.add_argument("--alpha", type=float, default=1e-5, help="regularization strength when training")
+    parser.add_argument("--holdout", type=float, default=0.1, help="share of reviews held out of training")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs")
+    args = parser.parse_args()
+
+    loader = DatasetLoader(chunksize=50000)
+    analyzer = ReviewAnalyzer()
+
+    def labeler(frame):
+        return analyzer.sentiment_features(frame)["rule_fake"].to_numpy()
+
+    if args.model:
+        model = ReviewModel.load(args.model)
+    else:
+        start = time.perf_counter()
+        model = ReviewModel.train(
+            loader.iter_frames, labeler, ngram_range=(1, args.ngrams), epochs=args.epochs, alpha=args.alpha,
+            holdout=args.holdout,
+        )
+        print(f"trained in {time.perf_counter() - start:.1f}s")
+        if args.save:
+            model.save(args.save)
+            model = ReviewModel.load(args.save)
+
+    frames = list(loader.iter_frames())
+    quality = model.evaluate(frames, labeler, holdout=args.holdout)
+    print(f"ngram_range {model.ngram_range}, {model.n_features} hashed features")
+    print(f"held-out reviews: {quality['reviews']} ({quality['label_rate']:.1%} labeled fake, "
+          f"{quality['predicted_rate']:.1%} predicted fake)")
+    print(f"accuracy {quality['accuracy']:.3f}  ROC AUC {quality['auc']:.3f}  "
+          f"Brier {quality['brier']:.3f}  ECE {quality['ece']:.3f}")
+    print("probability percentiles (5/50/95): " + " ".join(f"{value:.3f}" for value in quality["percentiles"]))
+    print("calibration:")
+    print(quality["calibration"].to_string(float_format=lambda value: f"{value:.3f}"))
+
+    frame = pd.concat(frames, ignore_index=True)
+    if len(frame) < args.rows:
+        frame = frame.sample(args.rows, replace=True, random_state=0).reset_index(drop=True)
+    frame = frame.iloc[:args.rows]
+
+    seconds = time_call(lambda: model.predict_proba(frame), args.repeat)
+    throughput = len(frame) / seconds
+
+    print(f"{len(frame)} reviews in {seconds * 1000:.0f} ms: {throughput:,.0f} reviews/s "
+          f"({'meets' if throughput >= TARGET_PER_SECOND else 'below'} {TARGET_PER_SECOND:,} target)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Parse-time benchmark for review extraction over the saved HTML fixtures.
+
+Times every installed parser backend on each fixture page, plus the old
+path (BeautifulSoup with html.parser over the whole page) as a reference,
+and checks that all backends extract identical fields.
+
+Usage:
+    python benchmarks/bench_parse.py [--repeat 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "..", "src"))
+
+from bs4 import BeautifulSoup
+from components.ReviewExtractor import BACKENDS, ReviewExtractor
+
+FIXTURES = os.path.join(ROOT, "fixtures")
+
+def full_page_bs4(extractor, html):
+    """
+    Reference: parse the whole page with BeautifulSoup's html.parser.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    return soup.select(extractor.selectors["review"])
+
+def time_call(function, repeat):
+    """
+    Return the median seconds per call over repeat runs.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50, help="runs per backend and page")
+    args = parser.parse_args()
+
+    print(f"{'page':<22}{'backend':<22}{'ms/page':>10}{'reviews/s':>12}")
+    for name in sorted(os.listdir(FIXTURES)):
+        site = name.split("_")[0]
+        with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+            html = f.read()
+
+        reference = ReviewExtractor(site, "bs4")
+        seconds = time_call(lambda: full_page_bs4(reference, html), args.repeat)
+        count = len(full_page_bs4(reference, html))
+        print(f"{name:<22}{'bs4 full page':<22}{seconds * 1000:>10.2f}{count / seconds:>12.0f}")
+
+        expected = None
+        for backend in BACKENDS:
+            extractor = ReviewExtractor(site, backend)
+            reviews = extractor.extract(html)
+            if expected is None:
+                expected = reviews
+            elif reviews != expected:
+                print(f"  warning: {backend} output differs from {BACKENDS[0]}")
+
+            seconds = time_call(lambda: extractor.extract(html), args.repeat)
+            print(f"{'':<22}{backend:<22}{seconds * 1000:>10.2f}{len(reviews) / seconds:>12.0f}")
+
+if __name__ == "__main__":
+    main()
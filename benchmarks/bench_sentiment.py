@@ -0,0 +1,58 @@
+"""
+Sentiment benchmark: the EDA notebook's per-row VADER against SentimentScorer.
+
+Runs the notebook's cleaning plus polarity_scores through DataFrame.apply
+over a sample of the Flipkart dataset, then SentimentScorer over the whole
+dataset (cold, then with a warm cache), and checks both give identical
+compound scores on the sample.
+
+Usage:
+    python benchmarks/bench_sentiment.py [--sample 20000]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "..", "src"))
+
+import numpy as np
+import pandas as pd
+from components.DatasetLoader import DatasetLoader
+from components.SentimentScorer import SentimentScorer
+
+def notebook_sentiment(analyzer, texts):
+    """
+    Reference: the notebook's row-by-row cleaning and scoring.
+    """
+    clean = texts.astype(str).apply(lambda x: re.sub(r"[^a-zA-Z\s]", "", x.lower()))
+    return clean.apply(lambda x: analyzer.polarity_scores(x)["compound"]).to_numpy()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sample", type=int, default=20000, help="rows scored by the per-row reference")
+    args = parser.parse_args()
+
+    texts = pd.concat([frame["text"] for frame in DatasetLoader().iter_frames()], ignore_index=True)
+    sample = texts.sample(min(args.sample, len(texts)), random_state=0)
+    scorer = SentimentScorer()
+
+    start = time.perf_counter()
+    expected = notebook_sentiment(scorer.analyzer, sample)
+    seconds = time.perf_counter() - start
+    print(f"{'per-row (notebook)':<24}{len(sample):>9} rows{seconds:>9.2f}s"
+          f"   ~{seconds * len(texts) / len(sample):.0f}s for all {len(texts)} rows")
+
+    for label in ("SentimentScorer cold", "SentimentScorer cached"):
+        start = time.perf_counter()
+        scores = scorer.score(texts)
+        seconds = time.perf_counter() - start
+        print(f"{label:<24}{len(texts):>9} rows{seconds:>9.2f}s")
+
+    mismatches = int(np.sum(scores[sample.index.to_numpy()] != expected))
+    print(f"mismatches on sample: {mismatches}")
+
+if __name__ == "__main__":
+    main()
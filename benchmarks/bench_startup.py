@@ -0,0 +1,84 @@
+"""
+Cold-start and rerun benchmark for the Streamlit app.
+
+First imports each component in a fresh interpreter with python -X
+importtime and lists the slowest modules it pulls in. Then runs src/app.py
+headless with Streamlit's AppTest: the first (cold) run of the landing
+page, an analysis of a URL served by mock reviews, and reruns of that
+analysis, which hit the scrape and analysis caches. AppTest needs
+Streamlit 1.28 or later.
+
+Usage:
+    python benchmarks/bench_startup.py [--reruns 20] [--top 10]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(ROOT, "..", "src")
+sys.path.insert(0, SRC)
+
+MODULES = ["components.Metrics", "components.ReviewScraper", "components.ReviewAnalyzer", "components.DuplicateIndex"]
+
+# Not a supported site, so the scraper answers with mock reviews offline
+MOCK_URL = "https://shop.example.com/product/1"
+
+def import_times(module):
+    """
+    (cumulative microseconds, module) of every import done by importing module.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC, capture_output=True, text=True, check=True,
+    )
+    times = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times.append((int(cumulative), name.strip()))
+    return times
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reruns", type=int, default=20, help="cached reruns of the analysis to time")
+    parser.add_argument("--top", type=int, default=10, help="slowest imported modules to list per component")
+    args = parser.parse_args()
+
+    for module in MODULES:
+        times = import_times(module)
+        total = next(cumulative for cumulative, name in times if name == module)
+        print(f"{module:<32}{total / 1e6:>8.3f}s")
+        for cumulative, name in sorted(times, reverse=True)[1:args.top + 1]:
+            print(f"    {name.strip():<44}{cumulative / 1e6:>8.3f}s")
+
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(SRC)
+    app = AppTest.from_file(os.path.join(SRC, "app.py"), default_timeout=120)
+    start = time.perf_counter()
+    app.run()
+    print(f"\n{'landing page, cold':<32}{time.perf_counter() - start:>8.3f}s")
+
+    app.text_input[0].input(MOCK_URL)
+    app.button[0].click()
+    start = time.perf_counter()
+    app.run()
+    print(f"{'first analysis':<32}{time.perf_counter() - start:>8.3f}s")
+    if app.exception or app.error:
+        sys.exit(f"app failed: {app.exception or app.error}")
+
+    latencies = []
+    for _ in range(args.reruns):
+        start = time.perf_counter()
+        app.run()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    print(f"{'cached rerun, median':<32}{latencies[len(latencies) // 2]:>8.3f}s")
+    print(f"{'cached rerun, max':<32}{latencies[-1]:>8.3f}s")
+
+if __name__ == "__main__":
+    main()
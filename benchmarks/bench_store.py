@@ -0,0 +1,97 @@
+"""
+ResultStore benchmark: appending scored batches and querying aggregates.
+
+Builds a store from seeded synthetic reviews (ReviewGenerator) spread
+over many products with random prices, flushing after every batch. The reviews get random fake scores
+instead of being analyzed, so only the store is timed. Then reopens the
+store and times the queries the app and batch jobs make, next to the
+pandas group-by over the raw scores that they replace.
+
+Usage:
+    python benchmarks/bench_store.py [--rows 1000000] [--products 10000] [--dir /tmp]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "..", "src"))
+
+import numpy as np
+import pandas as pd
+from components.ResultStore import PRICE_BINS, PRICE_LABELS, ResultStore
+from components.ReviewGenerator import ReviewGenerator
+
+def median(values):
+    return sorted(values)[len(values) // 2]
+
+def timed(function, repeat=20):
+    """
+    Median seconds of repeated calls of function.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000, help="reviews to store")
+    parser.add_argument("--products", type=int, default=10000, help="distinct products")
+    parser.add_argument("--chunk-size", type=int, default=100000, help="reviews per added batch")
+    parser.add_argument("--dir", default=tempfile.gettempdir(), help="directory for the store")
+    parser.add_argument("--seed", type=int, default=0, help="generator seed")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    names = np.array([f"product-{index:06d}" for index in range(args.products)], dtype=object)
+    product_prices = rng.choice([199.0, 649.0, 1499.0, 3999.0, 7999.0, 24999.0], args.products)
+    path = os.path.join(args.dir, "bench_result_store")
+    shutil.rmtree(path, ignore_errors=True)
+
+    store = ResultStore(path)
+    frames = []
+    flushes = []
+    start = time.perf_counter()
+    for index, batch in enumerate(ReviewGenerator(seed=args.seed).iter_batches(args.rows, args.chunk_size)):
+        products = rng.integers(0, args.products, len(batch))
+        scored = batch.with_scores(rng.random(len(batch)), np.zeros(len(batch), dtype=np.uint64), [])
+        store.add(names[products], scored, product_prices[products], batch_id=str(index))
+        flush_start = time.perf_counter()
+        store.flush()
+        flushes.append(time.perf_counter() - flush_start)
+        frames.append(pd.DataFrame({"product": names[products], "price": product_prices[products], "score": scored.fake_scores}))
+    seconds = time.perf_counter() - start
+    print(f"{'add + flush':<32}{args.rows:>11,} rows{seconds:>9.2f}s{args.rows / seconds:>14,.0f} rows/s")
+    # Flushes write what changed, so they should not slow down as the store grows
+    half = len(flushes) // 2
+    print(f"{'flush, first half median':<32}{median(flushes[:half] or flushes) * 1000:>10.2f}ms")
+    print(f"{'flush, second half median':<32}{median(flushes[half:]) * 1000:>10.2f}ms")
+
+    start = time.perf_counter()
+    store = ResultStore(path)
+    print(f"{'reopen':<32}{(time.perf_counter() - start) * 1000:>10.2f}ms")
+
+    raw = pd.concat(frames, ignore_index=True)
+    name = names[0]
+    for label, function in (
+        ("fake_rate(product)", lambda: store.fake_rate(name, 0.7)),
+        ("price_band_rates", lambda: store.price_band_rates(0.7)),
+        ("product_table", lambda: store.product_table(0.7)),
+        ("products(prefix)", lambda: store.products("product-0001")),
+        ("reviews(product)", lambda: store.reviews(name)),
+        ("pandas: product fake rate", lambda: (raw.loc[raw["product"] == name, "score"] > 0.7).mean()),
+        ("pandas: price band fake rate", lambda: raw.assign(fake=raw["score"] > 0.7).groupby(
+            pd.cut(raw["price"], PRICE_BINS, labels=PRICE_LABELS), observed=False)["fake"].mean()),
+    ):
+        print(f"{label:<32}{timed(function) * 1000:>10.2f}ms")
+
+    shutil.rmtree(path, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
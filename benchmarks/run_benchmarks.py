@@ -0,0 +1,316 @@
+"""
+Benchmark suite for the scrape, parse, score and export stages.
+
+Builds review workloads of several sizes from seeded mock reviews
+(ReviewScraper._get_mock_reviews) and from the bundled Flipkart dataset,
+then times each stage and reports throughput, p50/p99 latency and peak
+RSS. Per-review stages are timed call by call; batch stages are timed
+per run. Page stages (parse, scrape) use the saved HTML fixtures, with
+scrape going through a local HTTP server so no network is involved.
+
+Every case runs in a fresh process, so peak RSS belongs to that case
+alone: workload_rss_mb is the high-water mark once the workload is built,
+and peak_rss_mb the mark after the stage ran.
+
+Results can be written as a JSON baseline and compared with a later run;
+a throughput drop beyond the tolerance is reported as a regression and
+makes the script exit with status 1.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output baseline.json
+    python benchmarks/run_benchmarks.py --compare baseline.json
+    python benchmarks/run_benchmarks.py --sizes 1k --stages analyze_reviews
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "..", "src"))
+
+import numpy as np
+from components.DatasetLoader import DatasetLoader
+from components.PageFetcher import PageFetcher
+from components.ReviewAnalyzer import ReviewAnalyzer
+from components.ReviewExtractor import ReviewExtractor
+from components.ReviewScraper import ReviewScraper
+
+FIXTURES = os.path.join(ROOT, "fixtures")
+
+# Stages over review workloads, and stages over fixture pages
+REVIEW_STAGES = ["calculate_fake_probability", "get_flags", "create_export_csv", "analyze_reviews"]
+PAGE_STAGES = ["parse", "scrape"]
+WORKLOADS = ["mock", "flipkart"]
+
+def parse_size(text):
+    """
+    Parse a size such as "1k", "100k" or "1M".
+    """
+    multipliers = {"k": 1000, "m": 1000000}
+    suffix = text[-1].lower()
+    if suffix in multipliers:
+        return int(float(text[:-1]) * multipliers[suffix])
+    return int(text)
+
+def build_reviews(workload, size, seed):
+    """
+    Review dictionaries for one workload, repeated up to size.
+    """
+    if workload == "mock":
+        random.seed(seed)
+        return ReviewScraper()._get_mock_reviews(size)
+
+    reviews = []
+    for frame in DatasetLoader().iter_frames():
+        reviews.extend(DatasetLoader().to_reviews(frame))
+        if len(reviews) >= size:
+            break
+    # The dataset has about 190k reviews; larger workloads cycle through it
+    return [reviews[i % len(reviews)] for i in range(size)]
+
+def load_pages():
+    """
+    (site, html) for every saved fixture page.
+    """
+    pages = []
+    for name in sorted(os.listdir(FIXTURES)):
+        with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+            pages.append((name.split("_")[0], f.read()))
+    return pages
+
+def time_each(function, items):
+    """
+    Call function on every item, timing each call.
+
+    Returns:
+        tuple: (total seconds, per-call latencies in seconds)
+    """
+    latencies = np.empty(len(items))
+    clock = time.perf_counter
+    begin = clock()
+    for index, item in enumerate(items):
+        start = clock()
+        function(item)
+        latencies[index] = clock() - start
+    return clock() - begin, latencies
+
+def time_runs(function, repeat):
+    """
+    Run function repeat times, timing each run.
+
+    Returns:
+        tuple: (median seconds per run, per-run latencies in seconds)
+    """
+    latencies = np.array([time_each(lambda _: function(), [None])[0] for _ in range(repeat)])
+    return float(np.median(latencies)), latencies
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """
+    Serves the current fixture page for every GET request.
+    """
+
+    html = b""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(self.html)))
+        self.end_headers()
+        self.wfile.write(self.html)
+
+    def log_message(self, format, *args):
+        pass
+
+def run_review_stage(stage, reviews, repeat):
+    """
+    Time one review stage. Returns (items, seconds, latencies).
+    """
+    analyzer = ReviewAnalyzer()
+
+    if stage == "calculate_fake_probability":
+        seconds, latencies = time_each(analyzer._calculate_fake_probability, reviews)
+    elif stage == "get_flags":
+        seconds, latencies = time_each(lambda review: analyzer._get_flags(review, 0.5), reviews)
+    elif stage == "analyze_reviews":
+        seconds, latencies = time_runs(lambda: analyzer.analyze_reviews(reviews), repeat)
+    else:
+        result = analyzer.analyze_reviews(reviews)
+        rows = len(result)
+        seconds, latencies = time_runs(
+            lambda: analyzer._create_export_csv(result.review(index) for index in range(rows)), repeat
+        )
+    return len(reviews), seconds, latencies
+
+def run_page_stage(stage, pages, count):
+    """
+    Time one page stage over count pages. Returns (items, seconds, latencies).
+    """
+    pages = [pages[index % len(pages)] for index in range(count)]
+
+    if stage == "parse":
+        extractors = {site: ReviewExtractor(site) for site, _ in pages}
+        seconds, latencies = time_each(lambda page: extractors[page[0]].extract(page[1]), pages)
+        return len(pages), seconds, latencies
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    scraper = ReviewScraper(fetcher=PageFetcher(min_interval=0))
+    url = f"http://127.0.0.1:{server.server_port}/dp/B000000000"
+
+    # One scrape of up to five pages per fixture page
+    def scrape(page):
+        site, html = page
+        FixtureHandler.html = html.encode("utf-8")
+        return scraper.scrape(url, min_count=50, max_pages=5, site=site)
+
+    try:
+        seconds, latencies = time_each(scrape, pages)
+    finally:
+        server.shutdown()
+        scraper.fetcher.close()
+    return len(pages), seconds, latencies
+
+def peak_rss_mb():
+    """
+    High-water mark of this process's resident memory, in MB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_case(case):
+    """
+    Run one benchmark case; called in a fresh worker process.
+    """
+    stage, workload, size, repeat, seed = case
+    if stage in PAGE_STAGES:
+        data = load_pages()
+    else:
+        data = build_reviews(workload, size, seed)
+    workload_rss = peak_rss_mb()
+
+    random.seed(seed)
+    if stage in PAGE_STAGES:
+        items, seconds, latencies = run_page_stage(stage, data, size)
+    else:
+        items, seconds, latencies = run_review_stage(stage, data, repeat)
+
+    return {
+        "stage": stage,
+        "workload": workload,
+        "size": size,
+        "unit": "pages" if stage in PAGE_STAGES else "reviews",
+        "seconds": round(seconds, 6),
+        "throughput": round(items / seconds, 2) if seconds else None,
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 6),
+        "p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 6),
+        "workload_rss_mb": round(workload_rss, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+def cases(args):
+    """
+    Every (stage, workload, size, repeat, seed) case selected by the arguments.
+    """
+    for stage in args.stages:
+        if stage in PAGE_STAGES:
+            yield stage, "fixtures", args.pages, 1, args.seed
+            continue
+        for workload in args.workloads:
+            for size in args.sizes:
+                repeat = 1 if size >= 1000000 else args.repeat
+                yield stage, workload, size, repeat, args.seed
+
+def environment():
+    """
+    Description of the machine and revision, stored with the results.
+    """
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+    }
+
+def compare(results, baseline, tolerance):
+    """
+    Print throughput changes against a baseline; return the regressions.
+    """
+    previous = {(r["stage"], r["workload"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+
+    print(f"\n{'stage':<28}{'workload':<10}{'size':>9}{'baseline/s':>14}{'now/s':>14}{'change':>9}")
+    for result in results:
+        key = (result["stage"], result["workload"], result["size"])
+        if key not in previous or not previous[key]["throughput"] or not result["throughput"]:
+            continue
+        change = result["throughput"] / previous[key]["throughput"] - 1
+        marker = ""
+        if change < -tolerance:
+            marker = "  REGRESSION"
+            regressions.append(result)
+        print(f"{key[0]:<28}{key[1]:<10}{key[2]:>9}{previous[key]['throughput']:>14,.0f}"
+              f"{result['throughput']:>14,.0f}{change:>+9.1%}{marker}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1k,100k,1M", help="review workload sizes, comma separated")
+    parser.add_argument("--workloads", default=",".join(WORKLOADS), help="mock and/or flipkart")
+    parser.add_argument("--stages", default=",".join(PAGE_STAGES + REVIEW_STAGES), help="stages to run")
+    parser.add_argument("--pages", type=int, default=30, help="fixture pages per page stage")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per batch stage (1 at 1M and above)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for mock reviews and score jitter")
+    parser.add_argument("--output", help="write results as a JSON baseline to this path")
+    parser.add_argument("--compare", help="baseline JSON to compare throughput against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed throughput drop, as a fraction")
+    args = parser.parse_args()
+
+    args.sizes = [parse_size(size) for size in args.sizes.split(",")]
+    args.workloads = args.workloads.split(",")
+    args.stages = args.stages.split(",")
+    unknown = set(args.stages) - set(PAGE_STAGES + REVIEW_STAGES) | set(args.workloads) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"unknown stages or workloads: {', '.join(sorted(unknown))}")
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+    print(f"{'stage':<28}{'workload':<10}{'size':>9}{'items/s':>14}{'p50 ms':>11}{'p99 ms':>11}{'peak MB':>9}")
+    for case in cases(args):
+        with ProcessPoolExecutor(1, mp_context=context) as pool:
+            result = pool.submit(run_case, case).result()
+        results.append(result)
+        print(f"{result['stage']:<28}{result['workload']:<10}{result['size']:>9}{result['throughput']:>14,.0f}"
+              f"{result['p50_ms']:>11.3f}{result['p99_ms']:>11.3f}{result['peak_rss_mb']:>9.0f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,20 @@
+import time
+RUN_STARTED = time.perf_counter()
+import copy
+import io
+import os
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import numpy as np
-from components.ReviewScraper import ReviewScraper
-from components.ReviewAnalyzer import ReviewAnalyzer
+from components.Metrics import METRICS
+
+# Python caches imported modules, so only the first run of a process pays
+# for them: the max of this timer is the cold-start import time
+METRICS.observe("app.imports", time.perf_counter() - RUN_STARTED)
+
+# Scraped reviews are reused for this long before a URL is fetched again
+SCRAPE_TTL_SECONDS = 15 * 60
+
+# ResultStore directory shared with batch jobs (batch.py --store); unset disables it
+RESULT_STORE_PATH = os.environ.get("RESULT_STORE_PATH")
 
 # Set page configuration
 st.set_page_config(
@@ -13,6 +24,132 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_resource
+def get_scraper():
+    """
+    Shared scraper, so its connection pool survives reruns and sessions.
+    """
+    # Imported on first use, so the page renders before pandas and requests load
+    from components.ReviewScraper import ReviewScraper
+    return ReviewScraper()
+
+@st.cache_resource
+def get_analyzer():
+    """
+    Shared analyzer, so the patterns are compiled once per process.
+    """
+    from components.ReviewAnalyzer import ReviewAnalyzer
+    return ReviewAnalyzer()
+
+@st.cache_data(ttl=SCRAPE_TTL_SECONDS, max_entries=256, show_spinner=False)
+def scrape_reviews(url, min_count):
+    """
+    Scrape reviews, cached by (url, min_count) for SCRAPE_TTL_SECONDS.
+    """
+    return get_scraper().scrape(url, min_count=min_count)
+
+def product_analyzer():
+    """
+    The shared analyzer with fresh duplicate and timeline indexes for one product.
+    """
+    from components.DuplicateIndex import DuplicateIndex
+    from components.TemporalIndex import TemporalIndex
+    analyzer = copy.copy(get_analyzer())
+    analyzer.duplicates = DuplicateIndex()
+    analyzer.temporal = TemporalIndex()
+    return analyzer
+
+@st.cache_data(ttl=SCRAPE_TTL_SECONDS, max_entries=256, show_spinner=False)
+def analyze_reviews(reviews_hash, _reviews):
+    """
+    Score a ReviewBatch, cached by its fingerprint.
+    
+    The result is threshold independent: callers re-slice it with
+    with_threshold(). The reviews themselves are excluded from Streamlit's
+    argument hashing (leading underscore); reviews_hash identifies them.
+    Near-duplicates and review bursts are looked for among the reviews of
+    this product only.
+    """
+    return product_analyzer().analyze_reviews(_reviews)
+
+@st.cache_resource
+def get_product_store():
+    """
+    Shared per-product state for incremental re-checks.
+    """
+    from components.ProductStore import ProductStore
+    return ProductStore()
+
+@st.cache_resource
+def get_result_store():
+    """
+    Shared ResultStore, or None when RESULT_STORE_PATH is not set.
+    """
+    if not RESULT_STORE_PATH:
+        return None
+    from components.ResultStore import ResultStore
+    return ResultStore(RESULT_STORE_PATH)
+
+def record_check(url, scored):
+    """
+    Add the new reviews of an incremental check to the result store.
+    
+    Only incremental checks are recorded, since they analyze each review
+    of a product once; the batch id makes reruns of the page no-ops.
+    """
+    store = get_result_store()
+    if store is not None and len(scored):
+        key = get_scraper().product_key(url)
+        if store.add(key, scored, batch_id=f"{key}:{scored.batch.fingerprint()}"):
+            store.flush()
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def refresh_product(url, min_count, checked_at):
+    """
+    Re-check a product, scraping and scoring only reviews new since the last check.
+    
+    Cached per check (checked_at is the time the check was requested), so
+    reruns of the page show the same check instead of starting another.
+    
+    Returns:
+        tuple: (ProductState after the check, ScoredResult of the new reviews)
+    """
+    return get_product_store().refresh(url, get_scraper(), product_analyzer(), min_count=min_count)
+
+@st.cache_data(max_entries=101, show_spinner=False)
+def gauge_svg(real_percentage):
+    """
+    Authenticity gauge as an inline SVG, cached per percentage.
+    
+    Replaces a matplotlib figure per run: the markup is a few hundred bytes
+    and is sent with the page instead of as a rendered image.
+    """
+    def x(value):
+        return 40 + value * 5.6
+    
+    bands = "".join(
+        f'<rect x="{x(start)}" y="40" width="{x(end) - x(start)}" height="160" fill="{color}" fill-opacity="0.8"/>'
+        for start, end, color in ((0, 30, "#ef4444"), (30, 70, "#fbbf24"), (70, 100, "#22c55e"))
+    )
+    ticks = "".join(
+        f'<text x="{x(value)}" y="222" text-anchor="middle" font-size="13">{value}</text>'
+        for value in (0, 25, 50, 75, 100)
+    )
+    labels = "".join(
+        f'<text x="{x(value)}" y="176" text-anchor="middle" font-size="15">{label}</text>'
+        for value, label in ((15, "Mostly Fake"), (50, "Mixed"), (85, "Mostly Real"))
+    )
+    marker = x(real_percentage)
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 640 240" width="100%" '
+        'role="img" aria-label="Review authenticity gauge" font-family="sans-serif">'
+        '<text x="320" y="26" text-anchor="middle" font-size="20">Review Authenticity</text>'
+        f'{bands}<rect x="40" y="40" width="560" height="160" fill="none" stroke="#111827"/>{ticks}{labels}'
+        f'<text x="{marker}" y="84" text-anchor="middle" font-size="18" font-weight="bold">{real_percentage}%</text>'
+        f'<polygon points="{marker - 10},96 {marker + 10},96 {marker},124" fill="black"/>'
+        '</svg>'
+    )
+
 # Add custom CSS
 st.markdown("""
 <style>
@@ -77,133 +214,209 @@ url = st.text_input("Enter product URL:", placeholder="https://www.amazon.com/pr
 with st.expander("Advanced Options"):
     min_reviews = st.slider("Minimum reviews to analyze", 10, 100, 30)
     confidence_threshold = st.slider("Confidence threshold", 0.5, 0.95, 0.7)
+    incremental = st.checkbox("Only analyze reviews added since this product was last checked")
+    profile_run = st.checkbox("Profile scraping and analysis (sampling profiler)")
 
 if st.button("Analyze Reviews"):
     if url:
-        # Show progress
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        # Step 1: Scrape reviews
-        status_text.text("Scraping reviews from the provided URL...")
-        progress_bar.progress(10)
+        # Remember the request so reruns (slider changes, downloads) keep showing results
+        st.session_state["analysis_request"] = {
+            "url": url,
+            "min_reviews": min_reviews,
+            "incremental": incremental,
+            "checked_at": time.time(),
+        }
+        st.session_state.pop("export_ready", None)
+    else:
+        st.session_state.pop("analysis_request", None)
+        st.warning("Please enter a valid product URL to analyze.")
+
+request = st.session_state.get("analysis_request")
+if request:
+    import pandas as pd
+    
+    # Show progress
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    
+    # Step 1: Scrape reviews
+    status_text.text("Scraping reviews from the provided URL...")
+    progress_bar.progress(10)
+    
+    # The profiler is shared by all sessions; release it only if this run took it
+    profiling = profile_run
+    if profiling:
+        METRICS.start_profiler()
+    
+    try:
+        product = None
+        if request.get("incremental"):
+            # Scrapes up to the first review seen before and scores only the new ones
+            product, scored = refresh_product(request["url"], request["min_reviews"], request["checked_at"])
+            reviews = scored.batch
+            record_check(request["url"], scored)
+        else:
+            reviews = scrape_reviews(request["url"], request["min_reviews"])
         
-        try:
-            scraper = ReviewScraper()
-            reviews = scraper.scrape(url, min_count=min_reviews)
+        if not (len(product) if product is not None else len(reviews)):
+            st.error("Could not find reviews on the provided page. Please check the URL and try again.")
+        else:
+            progress_bar.progress(40)
             
-            if not reviews:
-                st.error("Could not find reviews on the provided page. Please check the URL and try again.")
-            else:
-                progress_bar.progress(40)
+            # Step 2: Analyze reviews
+            if product is None:
                 status_text.text(f"Successfully scraped {len(reviews)} reviews. Analyzing...")
-                
-                # Step 2: Analyze reviews
-                analyzer = ReviewAnalyzer()
-                results = analyzer.analyze_reviews(reviews, threshold=confidence_threshold)
-                
-                progress_bar.progress(90)
-                status_text.text("Analysis complete! Generating report...")
-                
-                # Step 3: Show results
+                scored = analyze_reviews(reviews.fingerprint(), reviews)
+            results = scored.with_threshold(confidence_threshold)
+            if profiling:
+                METRICS.stop_profiler()
+                profiling = False
+            
+            progress_bar.progress(90)
+            status_text.text("Analysis complete! Generating report...")
+            
+            # Step 3: Show results
+            if product is None:
                 real_percentage = results["real_percentage"]
                 fake_percentage = results["fake_percentage"]
+            else:
+                # Aggregates over every review analyzed for this product so far
+                real_percentage = product.real_percentage(confidence_threshold)
+                fake_percentage = product.fake_percentage(confidence_threshold)
+            
+            # Clear progress indicators
+            progress_bar.progress(100)
+            status_text.empty()
+            
+            # Display results
+            if product is not None:
+                st.info(
+                    f"{len(reviews)} new reviews since the last check. "
+                    f"{len(product)} reviews of this product analyzed over {product.counts['checks']} checks."
+                )
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown('<p class="sub-header">Authenticity Score</p>', unsafe_allow_html=True)
                 
-                # Clear progress indicators
-                progress_bar.progress(100)
-                status_text.empty()
-                
-                # Display results
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.markdown('<p class="sub-header">Authenticity Score</p>', unsafe_allow_html=True)
-                    
-                    # Create authenticity gauge
-                    fig, ax = plt.subplots(figsize=(8, 4))
-                    ax.set_xlim(0, 100)
-                    ax.set_ylim(0, 10)
-                    ax.set_title("Review Authenticity", fontsize=16)
-                    ax.set_xticks([0, 25, 50, 75, 100])
-                    ax.set_yticks([])
-                    
-                    # Create gauge sections
-                    ax.axvspan(0, 30, facecolor='#ef4444', alpha=0.8)
-                    ax.axvspan(30, 70, facecolor='#fbbf24', alpha=0.8)
-                    ax.axvspan(70, 100, facecolor='#22c55e', alpha=0.8)
-                    
-                    # Add gauge arrow
-                    ax.arrow(real_percentage, 5, 0, 0, head_width=2, head_length=5, 
-                             fc='black', ec='black', width=0.5)
-                    
-                    # Add labels
-                    plt.text(15, 2, "Mostly Fake", ha='center', fontsize=12)
-                    plt.text(50, 2, "Mixed", ha='center', fontsize=12)
-                    plt.text(85, 2, "Mostly Real", ha='center', fontsize=12)
-                    plt.text(real_percentage, 8, f"{real_percentage}%", ha='center', 
-                             fontweight='bold', fontsize=14)
-                    
-                    st.pyplot(fig)
-                
-                with col2:
-                    st.markdown('<p class="sub-header">Analysis Details</p>', unsafe_allow_html=True)
-                    
-                    st.markdown(f"""
-                    <div class="result-box">
-                        <h3>Summary</h3>
-                        <p><strong>{real_percentage}%</strong> of reviews appear to be genuine</p>
-                        <p><strong>{fake_percentage}%</strong> of reviews appear to be fake</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    recommendation = ""
-                    if real_percentage >= 70:
-                        recommendation = "✅ Reviews for this product are likely trustworthy."
-                    elif real_percentage >= 30:
-                        recommendation = "⚠️ Mixed reviews - proceed with caution and check the negative reviews."
-                    else:
-                        recommendation = "❌ Reviews appear suspicious. Be cautious when considering this product."
-                    
-                    st.markdown(f"""
-                    <div class="result-box" style="margin-top: 1rem;">
-                        <h3>Recommendation</h3>
-                        <p>{recommendation}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                # Show detailed review breakdown
-                st.markdown('<p class="sub-header">Review Breakdown</p>', unsafe_allow_html=True)
-                
-                # Sample data for demonstration
-                df = pd.DataFrame({
-                    'Review': [r["text"][:100] + "..." for r in results["reviews"][:10]],
-                    'Rating': [r["rating"] for r in results["reviews"][:10]],
-                    'Authenticity': [f"{r['authenticity_score']:.0%}" for r in results["reviews"][:10]],
-                    'Likely Fake': [r["is_fake"] for r in results["reviews"][:10]]
-                })
+                with METRICS.timer("render.gauge"):
+                    st.markdown(gauge_svg(real_percentage), unsafe_allow_html=True)
+            
+            with col2:
+                st.markdown('<p class="sub-header">Analysis Details</p>', unsafe_allow_html=True)
                 
-                # Style the dataframe
-                def color_fake(val):
-                    color = '#fecaca' if val else '#dcfce7'
-                    return f'background-color: {color}'
+                st.markdown(f"""
+                <div class="result-box">
+                    <h3>Summary</h3>
+                    <p><strong>{real_percentage}%</strong> of reviews appear to be genuine</p>
+                    <p><strong>{fake_percentage}%</strong> of reviews appear to be fake</p>
+                </div>
+                """, unsafe_allow_html=True)
                 
-                styled_df = df.style.applymap(color_fake, subset=['Likely Fake'])
-                st.dataframe(styled_df, use_container_width=True)
+                recommendation = ""
+                if real_percentage >= 70:
+                    recommendation = "✅ Reviews for this product are likely trustworthy."
+                elif real_percentage >= 30:
+                    recommendation = "⚠️ Mixed reviews - proceed with caution and check the negative reviews."
+                else:
+                    recommendation = "❌ Reviews appear suspicious. Be cautious when considering this product."
                 
-                # Download detailed results
-                csv = results["export_csv"]
+                st.markdown(f"""
+                <div class="result-box" style="margin-top: 1rem;">
+                    <h3>Recommendation</h3>
+                    <p>{recommendation}</p>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            # Show detailed review breakdown
+            st.markdown('<p class="sub-header">Review Breakdown</p>', unsafe_allow_html=True)
+            
+            # Sample data for demonstration
+            sample = results.head(10)
+            df = pd.DataFrame({
+                'Review': [r["text"][:100] + "..." for r in sample],
+                'Rating': [r["rating"] for r in sample],
+                'Authenticity': [f"{r['authenticity_score']:.0%}" for r in sample],
+                'Likely Fake': [r["is_fake"] for r in sample]
+            })
+            
+            # Style the dataframe
+            def color_fake(val):
+                color = '#fecaca' if val else '#dcfce7'
+                return f'background-color: {color}'
+            
+            styled_df = df.style.applymap(color_fake, subset=['Likely Fake'])
+            st.dataframe(styled_df, use_container_width=True)
+            
+            # Fake rate across all thresholds, from the same scores
+            with st.expander("Fake rate by confidence threshold"):
+                curve = results.threshold_curve() if product is None else product.threshold_curve()
+                st.line_chart(curve.set_index("threshold"))
+            
+            # Download detailed results; the export is only generated on request
+            export_format = st.selectbox("Export format", ["CSV", "JSONL"])
+            if st.button("Prepare Download"):
+                st.session_state["export_ready"] = True
+            
+            if st.session_state.get("export_ready"):
+                if export_format == "CSV":
+                    chunks, file_name, mime = results.iter_csv(), "review_analysis.csv", "text/csv"
+                else:
+                    chunks, file_name, mime = results.iter_jsonl(), "review_analysis.jsonl", "application/jsonl"
+                # Encode chunk by chunk so only the bytes are held, never a full str copy too
+                export = io.BytesIO()
+                for chunk in chunks:
+                    export.write(chunk.encode("utf-8"))
+                export.seek(0)
                 st.download_button(
                     label="Download Detailed Results",
-                    data=csv,
-                    file_name="review_analysis.csv",
-                    mime="text/csv",
+                    data=export,
+                    file_name=file_name,
+                    mime=mime,
                 )
-                
-        except Exception as e:
-            st.error(f"An error occurred: {str(e)}")
             
-    else:
-        st.warning("Please enter a valid product URL to analyze.")
+    except Exception as e:
+        st.error(f"An error occurred: {str(e)}")
+    finally:
+        if profiling:
+            METRICS.stop_profiler()
+    
+    # Where the time went, across every run served by this process
+    with st.expander("Pipeline metrics"):
+        snapshot = METRICS.snapshot()
+        st.caption("Totals since the app process started. Cached scrapes and analyses are not re-timed.")
+        if snapshot["rates"]:
+            st.json({name: round(value, 3) for name, value in snapshot["rates"].items()})
+        if snapshot["timers"]:
+            st.dataframe(pd.DataFrame(snapshot["timers"]).T, use_container_width=True)
+        if snapshot["counters"]:
+            st.json(snapshot["counters"])
+        stacks = METRICS.collapsed_stacks(limit=20)
+        if stacks:
+            st.text("Hottest sampled stacks")
+            st.code(stacks, language=None)
+        st.download_button(
+            label="Download Prometheus metrics",
+            data=METRICS.to_prometheus(),
+            file_name="metrics.prom",
+            mime="text/plain",
+        )
+
+# Aggregates saved by incremental checks and batch jobs, read without rescoring
+result_store = get_result_store()
+if result_store is not None and len(result_store):
+    with st.expander("Stored results"):
+        st.caption(f"{len(result_store)} products in {RESULT_STORE_PATH}, at the confidence threshold above.")
+        prefix = st.text_input("Product name or key starts with:")
+        matches = result_store.products(prefix)
+        if matches:
+            stored = result_store.product_table(confidence_threshold)
+            st.dataframe(stored.loc[matches[:100]], use_container_width=True)
+        else:
+            st.write("No stored products match.")
+        st.text("Fake rate by price band")
+        st.bar_chart(result_store.price_band_rates(confidence_threshold)["fake_rate"])
+
 
 # Footer
 st.markdown("---")
@@ -212,4 +425,6 @@ st.markdown("""
     <p>Review Authenticity Analyzer | Built with Streamlit and Python</p>
     <p>This tool is for educational purposes only. Results should not be considered definitive.</p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+METRICS.observe("app.rerun", time.perf_counter() - RUN_STARTED)
@@ -0,0 +1,106 @@
+"""
+Headless batch analysis of product URLs and review dataset files.
+
+Scrapes, scores and writes every source through a BatchPipeline, without
+the Streamlit app. Sources are product URLs and dataset files (zip or
+CSV in the Flipkart layout), given on the command line or listed one per
+line in --sources-file. Results are the app's export columns with the
+source in front, written in chunks as CSV, JSONL or Parquet (a directory
+of part files). A checkpoint file next to the output records completed
+sources, and --resume continues an interrupted run where it stopped.
+With --store, scored reviews are also added to a ResultStore directory,
+which keeps per-product and per-price-band fake rates for later queries;
+--query prints those from an existing store without analyzing anything.
+
+Usage:
+    python src/batch.py --sources-file urls.txt --output results.csv
+    python src/batch.py flipkart_product_dataset.zip --output results.jsonl --workers 4
+    python src/batch.py --sources-file urls.txt --output results.csv --resume
+    python src/batch.py flipkart_product_dataset.zip --output results.csv --store results_store
+    python src/batch.py --store results_store --query "Apple iPhone"
+"""
+import argparse
+import json
+import sys
+import time
+from components.BatchPipeline import BatchPipeline, ResultWriter
+from components.Metrics import METRICS
+from components.ParallelAnalyzer import ParallelAnalyzer
+from components.ResultStore import ResultStore
+from components.ReviewAnalyzer import ReviewAnalyzer
+from components.ScoreCache import ScoreCache
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="*", help="product URLs and dataset files")
+    parser.add_argument("--sources-file", help="text file with one URL or dataset file per line")
+    parser.add_argument("--output", help="output file (.csv, .jsonl) or Parquet directory (.parquet)")
+    parser.add_argument("--format", choices=ResultWriter.FORMATS, help="output format, by default from --output")
+    parser.add_argument("--resume", action="store_true", help="skip sources completed by an earlier run")
+    parser.add_argument("--min-reviews", type=int, default=30, help="reviews to collect per URL")
+    parser.add_argument("--max-pages", type=int, default=5, help="review pages to fetch at most per URL")
+    parser.add_argument("--scrape-workers", type=int, default=8, help="URLs scraped concurrently")
+    parser.add_argument("--workers", type=int, default=1, help="scoring processes; 1 scores in this process")
+    parser.add_argument("--queue-size", type=int, default=16, help="work units buffered between stages")
+    parser.add_argument("--chunk-rows", type=int, default=10000, help="rows per written chunk")
+    parser.add_argument("--chunksize", type=int, default=50000, help="reviews per work unit for dataset files")
+    parser.add_argument("--threshold", type=float, default=0.7, help="confidence threshold of the is_fake column")
+    parser.add_argument("--model", help="trained ReviewModel directory to score with")
+    parser.add_argument("--cache", help="SQLite file for the score cache")
+    parser.add_argument("--store", help="ResultStore directory to add the scored reviews to")
+    parser.add_argument("--query", metavar="PREFIX", help="print stored aggregates of products starting with PREFIX and by price band, then exit")
+    parser.add_argument("--metrics", help="write pipeline metrics as JSON to this path")
+    args = parser.parse_args()
+
+    if args.query is not None:
+        if not args.store:
+            parser.error("--query needs --store")
+        store = ResultStore(args.store)
+        table = store.product_table(args.threshold)
+        print(table.loc[store.products(args.query)].to_string())
+        print()
+        print(store.price_band_rates(args.threshold).to_string())
+        return
+
+    if not args.output:
+        parser.error("--output is required")
+
+    sources = list(args.sources)
+    if args.sources_file:
+        sources += BatchPipeline.read_sources(args.sources_file)
+    if not sources:
+        parser.error("no sources given")
+
+    analyzer = ReviewAnalyzer(cache=ScoreCache(path=args.cache) if args.cache else None, model=args.model)
+    if args.workers > 1:
+        analyzer = ParallelAnalyzer(analyzer, workers=args.workers)
+    pipeline = BatchPipeline(
+        analyzer=analyzer,
+        scrape_workers=args.scrape_workers,
+        queue_size=args.queue_size,
+        min_count=args.min_reviews,
+        max_pages=args.max_pages,
+        chunksize=args.chunksize,
+        threshold=args.threshold,
+        store=ResultStore(args.store) if args.store else None,
+    )
+
+    writer = ResultWriter(args.output, args.format, args.chunk_rows, resume=args.resume)
+    start = time.perf_counter()
+    try:
+        summary = pipeline.run(sources, writer)
+    finally:
+        writer.close()
+        pipeline.close()
+    seconds = time.perf_counter() - start
+
+    print(f"{summary['units']} units, {summary['reviews']} reviews written in {seconds:.1f}s "
+          f"({summary['reviews'] / seconds if seconds else 0:,.0f} reviews/s); "
+          f"{summary['skipped']} skipped as completed, {summary['errors']} failed", file=sys.stderr)
+    if args.metrics:
+        with open(args.metrics, "w", encoding="utf-8") as f:
+            json.dump(METRICS.snapshot(), f, indent=2)
+    sys.exit(1 if summary["errors"] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,448 @@
+import bisect
+import json
+import os
+import queue
+import sys
+import threading
+from urllib.parse import urlparse
+import numpy as np
+import pandas as pd
+from components.DatasetLoader import DatasetLoader
+from components.Metrics import METRICS
+from components.ReviewAnalyzer import ReviewAnalyzer
+from components.ReviewBatch import ReviewBatch
+from components.ReviewScraper import ReviewScraper
+from components.ScoredResult import EXPORT_COLUMNS, ScoredResult, iter_csv
+
+# Optional dependency, only needed for Parquet output
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+class ResultWriter:
+    """
+    Appends export rows to a CSV, JSONL or Parquet output in chunks.
+
+    Rows are the ScoredResult export rows with the source URL or file in
+    front. Every flush writes one chunk and then records, in a checkpoint
+    file next to the output, which work units are now fully written and
+    where the output ends. Reopening with resume=True cuts the output back
+    to the last checkpoint, so a crash between a write and its checkpoint
+    never leaves duplicate rows, and reports the completed units.
+    before_checkpoint, when set, is called after each chunk is written
+    and before it is checkpointed, e.g. to make a ResultStore durable.
+
+    CSV and JSONL outputs are single files. A Parquet output is a directory
+    of part files, one per chunk, since Parquet files cannot be appended to.
+    """
+
+    FORMATS = ("csv", "jsonl", "parquet")
+
+    def __init__(self, path, format=None, chunk_rows=10000, resume=False, before_checkpoint=None):
+        """
+        Initialize the ResultWriter.
+
+        Args:
+            path (str): Output file, or directory for Parquet.
+            format (str): "csv", "jsonl" or "parquet"; taken from the
+                extension of path by default.
+            chunk_rows (int): Rows buffered before a chunk is written.
+            resume (bool): Continue an earlier run instead of starting over.
+            before_checkpoint (callable): Called with no arguments before
+                each checkpoint; if it fails the chunk is dropped.
+        """
+        self.format = format or os.path.splitext(path)[1].lstrip(".").lower()
+        if self.format not in self.FORMATS:
+            raise ValueError(f"Unsupported format {self.format!r}; use one of {', '.join(self.FORMATS)}")
+        if self.format == "parquet" and pyarrow is None:
+            raise ImportError("Parquet output requires the pyarrow package")
+
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.before_checkpoint = before_checkpoint
+        self.checkpoint_path = path.rstrip(os.sep) + ".checkpoint"
+        self.completed = set()
+        self.rows_written = 0
+        self._rows = []
+        self._units = []
+        self._parts = 0
+        self._file = None
+
+        offset = 0
+        if resume and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self.completed.update(entry["units"])
+                    self.rows_written = entry["rows"]
+                    offset = entry["offset"]
+        elif os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+        if self.format == "parquet":
+            os.makedirs(path, exist_ok=True)
+            self._parts = offset
+            # Parts written after the last checkpoint are incomplete runs
+            for name in os.listdir(path):
+                if name.startswith("part-") and int(name[5:10]) >= offset:
+                    os.remove(os.path.join(path, name))
+        else:
+            mode = "r+b" if offset else "wb"
+            self._file = open(path, mode)
+            self._file.truncate(offset)
+            self._file.seek(offset)
+
+        self._checkpoint = open(self.checkpoint_path, "a", encoding="utf-8")
+
+    def add(self, unit, rows):
+        """
+        Queue the rows of one work unit; it counts as completed once flushed.
+
+        Args:
+            unit (str): Work unit id.
+            rows (list): Tuples of source followed by the EXPORT_COLUMNS fields.
+        """
+        self._rows.extend(rows)
+        self._units.append(unit)
+        if len(self._rows) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered rows as one chunk and checkpoint their units.
+        """
+        if not self._units:
+            return
+
+        rows = self._rows
+        start = self._file.tell() if self._file is not None else None
+        part = os.path.join(self.path, f"part-{self._parts:05d}.parquet")
+        try:
+            with METRICS.timer("batch.write"):
+                self._write(rows, part)
+            if self.before_checkpoint is not None:
+                self.before_checkpoint()
+        except BaseException:
+            # Drop the partial chunk; the rows stay buffered for the next flush
+            if self._file is not None:
+                self._file.seek(start)
+                self._file.truncate()
+            elif os.path.exists(part):
+                os.remove(part)
+            raise
+
+        self._rows = []
+        self.rows_written += len(rows)
+        offset = self._file.tell() if self._file is not None else self._parts
+        self._checkpoint.write(json.dumps({"units": self._units, "rows": self.rows_written, "offset": offset}) + "\n")
+        self._checkpoint.flush()
+        self.completed.update(self._units)
+        self._units = []
+
+    def _write(self, rows, part):
+        """
+        Write one chunk of rows and make it durable.
+        """
+        if self.format == "csv":
+            if self._file.tell() == 0:
+                self._file.write(("Source," + ",".join(name for name, _ in EXPORT_COLUMNS) + "\n").encode("utf-8"))
+            for chunk in iter_csv(rows, self.chunk_rows, header=False):
+                self._file.write(chunk.encode("utf-8"))
+        elif self.format == "jsonl":
+            fields = ["source"] + [field for _, field in EXPORT_COLUMNS]
+            for row in rows:
+                self._file.write((json.dumps(dict(zip(fields, row)), default=str) + "\n").encode("utf-8"))
+        elif rows:
+            fields = ["source"] + [field for _, field in EXPORT_COLUMNS]
+            table = pyarrow.table({field: list(column) for field, column in zip(fields, zip(*rows))})
+            pyarrow.parquet.write_table(table, part)
+            self._parts += 1
+
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """
+        Flush the remaining rows and close the output.
+        """
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+        self._checkpoint.close()
+
+class BatchPipeline:
+    """
+    Headless batch analysis of product URLs and dataset files.
+
+    Work flows through concurrent stages joined by bounded queues:
+
+        read sources -> scrape (several threads) -> score -> write
+
+    A stage blocks when the queue after it is full, so a slow stage
+    throttles the ones before it instead of letting work pile up in
+    memory: at most queue_size units wait between two stages. URLs are
+    scraped with ReviewScraper.scrape, which fetches and parses the pages
+    of one URL concurrently, without the demo-data fallback (a URL that
+    yields nothing is an empty unit, an unsupported one an error); each
+    URL is one work unit, scored with the analyzer's analyze_reviews
+    exactly as in the app. Dataset files are read with DatasetLoader and
+    each chunk is one work unit, scored with the vectorized analyze_batch.
+    Export rows are written by a ResultWriter, which checkpoints the
+    completed units so an interrupted run can be resumed.
+
+    A dataset unit is named after its range of (valid) rows in the file,
+    "path#start-stop", so a run resumed with another chunksize still skips
+    exactly the rows already written.
+
+    With a ResultStore, every scored unit is also added to the store under
+    its product (the product_name column of dataset rows, the product key
+    of a URL) with the unit as batch id, and the store is flushed before
+    each checkpoint, so resumed runs neither lose nor repeat stored reviews.
+    """
+
+    def __init__(self, scraper=None, analyzer=None, scrape_workers=8, queue_size=16,
+                 min_count=30, max_pages=5, chunksize=50000, threshold=0.7, store=None):
+        """
+        Initialize the BatchPipeline.
+
+        Args:
+            scraper (ReviewScraper): Scraper for URL sources.
+            analyzer (ReviewAnalyzer or ParallelAnalyzer): Scorer for every unit.
+            scrape_workers (int): URLs scraped concurrently.
+            queue_size (int): Capacity of each queue between stages, in units.
+            min_count (int): Reviews to collect per URL.
+            max_pages (int): Review pages to fetch at most per URL.
+            chunksize (int): Reviews per work unit for dataset files.
+            threshold (float): Confidence threshold of the is_fake column.
+            store (ResultStore): Store to add the scored reviews to.
+        """
+        self.scraper = scraper or ReviewScraper()
+        self.analyzer = analyzer or ReviewAnalyzer()
+        self.scrape_workers = scrape_workers
+        self.queue_size = queue_size
+        self.min_count = min_count
+        self.max_pages = max_pages
+        self.chunksize = chunksize
+        self.threshold = threshold
+        self.store = store
+        self.errors = []
+
+    @staticmethod
+    def read_sources(path):
+        """
+        Sources listed in a text file, one per line; blank lines and # comments are skipped.
+        """
+        with open(path, encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+    @staticmethod
+    def is_url(source):
+        return urlparse(source).scheme in ("http", "https")
+
+    def run(self, sources, writer):
+        """
+        Analyze every source and write the results.
+
+        Units already completed according to the writer's checkpoint are
+        skipped. A unit that fails is reported in self.errors and left
+        incomplete, so resuming retries it.
+
+        Args:
+            sources (iterable): URLs and dataset file paths.
+            writer (ResultWriter): Output for the export rows.
+
+        Returns:
+            dict: units and reviews written, units skipped and errors.
+        """
+        stop = threading.Event()
+        urls = queue.Queue(self.queue_size)
+        batches = queue.Queue(self.queue_size)
+        results = queue.Queue(self.queue_size)
+        done = object()
+        summary = {"units": 0, "reviews": 0, "skipped": 0, "errors": 0}
+
+        def put(target, item):
+            # Blocks while the next stage is behind, but gives up when the run stops
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def take(source):
+            # Waits for the previous stage, but reports the end when the run stops
+            while not stop.is_set():
+                try:
+                    return source.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            return done
+
+        def read():
+            try:
+                for source in sources:
+                    if stop.is_set():
+                        break
+                    if self.is_url(source):
+                        if source in writer.completed:
+                            summary["skipped"] += 1
+                        else:
+                            put(urls, source)
+                        continue
+                    try:
+                        written = self._written_rows(source, writer.completed)
+                        offset = 0
+                        for frame in DatasetLoader(source, chunksize=self.chunksize).iter_frames():
+                            gaps = self._unwritten_ranges(offset, offset + len(frame), written)
+                            if not gaps:
+                                summary["skipped"] += 1
+                            for first, last in gaps:
+                                rows = frame.iloc[first - offset:last - offset]
+                                put(batches, (f"{source}#{first}-{last}", source, rows,
+                                              rows["product_name"].to_numpy(), rows["price"].to_numpy()))
+                            offset += len(frame)
+                    except Exception as e:
+                        self._fail(source, e)
+            finally:
+                for _ in range(self.scrape_workers):
+                    put(urls, done)
+                put(batches, done)
+
+        def scrape():
+            try:
+                while True:
+                    url = take(urls)
+                    if url is done:
+                        break
+                    try:
+                        with METRICS.timer("batch.scrape"):
+                            reviews = self.scraper.scrape(url, min_count=self.min_count, max_pages=self.max_pages,
+                                                          mock_fallback=False)
+                        put(batches, (url, url, reviews, self.scraper.product_key(url), None))
+                    except Exception as e:
+                        self._fail(url, e)
+            finally:
+                put(batches, done)
+
+        def score():
+            remaining = self.scrape_workers + 1
+            try:
+                while remaining:
+                    item = take(batches)
+                    if item is done:
+                        remaining -= 1
+                        continue
+                    unit, source, reviews, products, prices = item
+                    try:
+                        with METRICS.timer("batch.score"):
+                            if isinstance(reviews, pd.DataFrame):
+                                scored = self._score_frame(reviews)
+                            else:
+                                scored = self.analyzer.analyze_reviews(reviews, self.threshold)
+                        rows = [(source,) + row for row in scored.iter_rows()]
+                        put(results, (unit, rows, (products, scored, prices)))
+                    except Exception as e:
+                        self._fail(source, e)
+            finally:
+                put(results, done)
+
+        if self.store is not None and writer.before_checkpoint is None:
+            writer.before_checkpoint = self.store.flush
+
+        threads = [threading.Thread(target=read, name="batch-read", daemon=True)]
+        threads += [threading.Thread(target=scrape, name=f"batch-scrape-{i}", daemon=True) for i in range(self.scrape_workers)]
+        threads.append(threading.Thread(target=score, name="batch-score", daemon=True))
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = results.get()
+                if item is done:
+                    break
+                unit, rows, (products, scored, prices) = item
+                if self.store is not None:
+                    with METRICS.timer("batch.store"):
+                        self.store.add(products, scored, prices, batch_id=unit)
+                writer.add(unit, rows)
+                summary["units"] += 1
+                summary["reviews"] += len(rows)
+                METRICS.count("batch_units")
+                METRICS.count("batch_reviews", len(rows))
+            writer.flush()
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        summary["errors"] = len(self.errors)
+        return summary
+
+    def _score_frame(self, frame):
+        """
+        Score a dataset chunk with analyze_batch, as a ScoredResult.
+        """
+        scores = self.analyzer.analyze_batch(frame, self.threshold)["scores"]
+        labels = self.analyzer.flag_labels
+        present = scores["flags"].str.get_dummies(sep=", ")
+        flag_masks = np.zeros(len(frame), dtype=np.uint64)
+        for bit, label in enumerate(labels):
+            if label in present:
+                flag_masks |= present[label].to_numpy(dtype=np.uint64) << np.uint64(bit)
+        fake_scores = 1 - scores["authenticity_score"].to_numpy(dtype=float)
+        batch = ReviewBatch.from_frame(frame).with_scores(fake_scores, flag_masks, labels)
+        return ScoredResult(batch, fake_scores, self.threshold)
+
+    @staticmethod
+    def _written_rows(source, completed):
+        """
+        Sorted (start, stop) row ranges of a dataset's completed units.
+        """
+        prefix = source + "#"
+        ranges = []
+        for unit in completed:
+            if unit.startswith(prefix):
+                start, _, stop = unit[len(prefix):].partition("-")
+                if start.isdigit() and stop.isdigit():
+                    ranges.append((int(start), int(stop)))
+        return sorted(ranges)
+
+    @staticmethod
+    def _unwritten_ranges(start, stop, written):
+        """
+        Parts of the rows start:stop not covered by the written ranges.
+        """
+        gaps = []
+        # Ranges never overlap, so only the one before start's position can cover it
+        index = bisect.bisect_right(written, (start, start))
+        if index and written[index - 1][1] > start:
+            index -= 1
+        for first, last in written[index:]:
+            if first >= stop:
+                break
+            if first > start:
+                gaps.append((start, first))
+            start = max(start, last)
+        if start < stop:
+            gaps.append((start, stop))
+        return gaps
+
+    def close(self):
+        """
+        Release the analyzer's worker pool, if it has one.
+        """
+        close = getattr(self.analyzer, "close", None)
+        if close is not None:
+            close()
+
+    def _fail(self, source, error):
+        """
+        Record a failed source or unit and carry on.
+        """
+        METRICS.count("batch_errors")
+        self.errors.append((source, f"{type(error).__name__}: {error}"))
+        print(f"error: {source}: {type(error).__name__}: {error}", file=sys.stderr)
@@ -0,0 +1,249 @@
+import contextlib
+import functools
+import sys
+import threading
+import time
+from collections import Counter
+
+class Metrics:
+    """
+    Process-wide timers and counters for the analysis pipeline.
+
+    Components record into the shared METRICS instance at stage
+    granularity (one timer per scrape, page, batch or sub-stage, and
+    counters updated once per batch), so the cost is a lock and a few
+    dictionary updates per stage, not per review.
+
+    Results are available as a dictionary (snapshot), as Prometheus text
+    exposition format (to_prometheus) and, when the optional sampling
+    profiler has run, as collapsed stacks (collapsed_stacks) for flame
+    graph tools. Work done in ParallelAnalyzer worker processes is
+    recorded in those processes and is not merged back.
+    """
+
+    # Prefix of every exported Prometheus metric
+    NAMESPACE = "review_analyzer"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timers = {}
+        self._counters = {}
+        self._samples = Counter()
+        self._profiler = None
+        self._profiler_users = 0
+        self._profiler_lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        """
+        Time the enclosed block under name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        """
+        Decorator timing every call of a function under name.
+        """
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def observe(self, name, seconds):
+        """
+        Record one duration under name.
+        """
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                self._timers[name] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                timer[2] = max(timer[2], seconds)
+
+    def count(self, name, value=1, label=None):
+        """
+        Add value to a counter, optionally split by one label value.
+        """
+        key = (name, label)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def counter(self, name, label=None):
+        """
+        Current value of a counter.
+        """
+        with self._lock:
+            return self._counters.get((name, label), 0)
+
+    def snapshot(self):
+        """
+        All timers and counters as plain data.
+
+        Returns:
+            dict: timers maps a name to count, total_seconds, mean_seconds
+            and max_seconds; counters maps a name to its value, or to a
+            {label: value} dict for labelled counters; rates holds
+            reviews per second for analysis and scraping, and the score
+            cache hit rate.
+        """
+        with self._lock:
+            timers = {
+                name: {
+                    "count": count,
+                    "total_seconds": total,
+                    "mean_seconds": total / count,
+                    "max_seconds": peak,
+                }
+                for name, (count, total, peak) in sorted(self._timers.items())
+            }
+            counters = {}
+            for (name, label), value in sorted(self._counters.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+                if label is None:
+                    counters[name] = value
+                else:
+                    counters.setdefault(name, {})[label] = value
+
+        rates = {}
+        stages = (("analyze", "reviews_analyzed"), ("analyze_batch", "batch_reviews_analyzed"), ("scrape", "reviews_scraped"))
+        for stage, counter in stages:
+            seconds = timers.get(stage, {}).get("total_seconds")
+            if seconds:
+                rates[f"{stage}_reviews_per_second"] = counters.get(counter, 0) / seconds
+        hits, misses = counters.get("cache_hits", 0), counters.get("cache_misses", 0)
+        if hits + misses:
+            rates["cache_hit_rate"] = hits / (hits + misses)
+        return {"timers": timers, "counters": counters, "rates": rates}
+
+    def to_prometheus(self):
+        """
+        Timers and counters in the Prometheus text exposition format.
+
+        Timers are exported as summaries (<name>_seconds_count and _sum) plus
+        a <name>_seconds_max gauge; counters as <name>_total.
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for name, timer in snapshot["timers"].items():
+            metric = self._metric_name(name) + "_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            lines.append(f"{metric}_count {timer['count']}")
+            lines.append(f"{metric}_sum {timer['total_seconds']:.9f}")
+            lines.append(f"# TYPE {metric}_max gauge")
+            lines.append(f"{metric}_max {timer['max_seconds']:.9f}")
+        for name, value in snapshot["counters"].items():
+            metric = self._metric_name(name) + "_total"
+            lines.append(f"# TYPE {metric} counter")
+            if isinstance(value, dict):
+                for label, labelled in value.items():
+                    escaped = str(label).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+                    lines.append(f'{metric}{{label="{escaped}"}} {labelled}')
+            else:
+                lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """
+        Drop every recorded timer, counter and profile sample.
+        """
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+            self._samples.clear()
+
+    @contextlib.contextmanager
+    def profile(self, interval=0.005):
+        """
+        Sample the stacks of all threads while the block runs.
+
+        A daemon thread reads sys._current_frames() every interval seconds
+        and counts each stack; nothing is traced, so the overhead does not
+        depend on how many calls the profiled code makes.
+
+        Args:
+            interval (float): Seconds between samples.
+        """
+        self.start_profiler(interval)
+        try:
+            yield self
+        finally:
+            self.stop_profiler()
+
+    def start_profiler(self, interval=0.005):
+        """
+        Start the sampling profiler, or join the run already going.
+
+        Every call must be paired with one stop_profiler() call; the
+        profiler runs until the last caller stops it, so concurrent users
+        (e.g. app sessions) do not end each other's profiles. interval is
+        that of the first caller.
+        """
+        with self._profiler_lock:
+            self._profiler_users += 1
+            if self._profiler is not None:
+                return
+            stop = threading.Event()
+            thread = threading.Thread(target=self._sample, args=(interval, stop), daemon=True, name="metrics-profiler")
+            self._profiler = (thread, stop)
+            thread.start()
+
+    def stop_profiler(self):
+        """
+        Release one start_profiler() call; the last one stops the profiler
+        and waits for its thread.
+        """
+        with self._profiler_lock:
+            if self._profiler is None:
+                return
+            self._profiler_users -= 1
+            if self._profiler_users:
+                return
+            thread, stop = self._profiler
+            stop.set()
+            thread.join()
+            self._profiler = None
+
+    def collapsed_stacks(self, limit=None):
+        """
+        Profile samples as "outer;inner count" lines, most frequent first.
+
+        The format is read by flamegraph.pl, speedscope and similar tools.
+        """
+        with self._lock:
+            stacks = self._samples.most_common(limit)
+        return "\n".join(f"{stack} {count}" for stack, count in stacks)
+
+    def _sample(self, interval, stop):
+        """
+        Profiler thread body.
+        """
+        own = threading.get_ident()
+        while not stop.wait(interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                with self._lock:
+                    self._samples[";".join(reversed(stack))] += 1
+
+    def _metric_name(self, name):
+        """
+        Prometheus metric name for a timer or counter name.
+        """
+        cleaned = "".join(c if c.isalnum() else "_" for c in name)
+        return f"{self.NAMESPACE}_{cleaned}"
+
+# Registry shared by all components in this process
+METRICS = Metrics()
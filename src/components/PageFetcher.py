@@ -0,0 +1,165 @@
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from components.Metrics import METRICS
+
+class PageFetcher:
+    """
+    Fetches pages concurrently over a pooled keep-alive HTTP session.
+
+    Requests run on a thread pool sharing one requests.Session, driven from
+    asyncio so callers can overlap downloading with parsing and analysis.
+    Each domain has its own concurrency limit and a minimum spacing between
+    request starts; failed or throttled requests are retried with jittered
+    exponential backoff, capped at max_backoff seconds.
+
+    Fetches from any number of caller threads and event loops are run on
+    one event loop thread owned by the fetcher, so the per-domain limits
+    hold across every scrape sharing it.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, headers=None, per_domain_limit=4, min_interval=0.25, max_retries=2,
+                 backoff=0.5, timeout=10, pool_size=16, max_backoff=30):
+        """
+        Initialize the PageFetcher.
+
+        Args:
+            headers (dict): Headers sent with every request.
+            per_domain_limit (int): Maximum concurrent requests per domain.
+            min_interval (float): Average seconds between request starts per domain.
+            max_retries (int): Retries after a failed or throttled request.
+            backoff (float): Base delay in seconds for retry backoff.
+            timeout (float): Request timeout in seconds.
+            pool_size (int): Connection pool and thread pool size.
+            max_backoff (float): Longest delay before a retry, including
+                delays asked for by a Retry-After header.
+        """
+        self.per_domain_limit = per_domain_limit
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.bytes_fetched = 0
+        self.requests_made = 0
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size)
+
+        # Only touched from the fetcher's own loop thread
+        self._next_start = {}
+        self._limits = {}
+        self._loop = None
+        self._thread = None
+        self._loop_lock = threading.Lock()
+
+    async def fetch(self, url):
+        """
+        Fetch one page, honoring the domain limits.
+
+        Can be awaited from any event loop; cancelling it cancels the request.
+
+        Args:
+            url (str): Page URL.
+
+        Returns:
+            str: Page HTML, or None when the page could not be fetched.
+        """
+        future = asyncio.run_coroutine_threadsafe(self._fetch(url), self._start_loop())
+        return await asyncio.wrap_future(future)
+
+    def _start_loop(self):
+        """
+        The fetcher's event loop, started on its own thread on first use.
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="page-fetcher", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    async def _fetch(self, url):
+        """
+        Fetch one page on the fetcher's loop.
+        """
+        domain = urlparse(url).netloc
+        limit = self._limits.get(domain)
+        if limit is None:
+            limit = self._limits[domain] = asyncio.Semaphore(self.per_domain_limit)
+        loop = asyncio.get_running_loop()
+
+        async with limit:
+            for attempt in range(self.max_retries + 1):
+                await self._wait_turn(domain)
+                try:
+                    response = await loop.run_in_executor(self._executor, self._get, url)
+                except requests.RequestException:
+                    response = None
+
+                if response is not None and response.status_code not in self.RETRY_STATUSES:
+                    return response.text if response.ok else None
+
+                if attempt < self.max_retries:
+                    METRICS.count("fetch_retries")
+                    await asyncio.sleep(self._retry_delay(response, attempt))
+        return None
+
+    def close(self):
+        """
+        Release pooled connections and worker threads.
+        """
+        with self._loop_lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
+                self._loop = None
+                self._limits = {}
+        self.session.close()
+        self._executor.shutdown(wait=False)
+
+    def _get(self, url):
+        """
+        Blocking GET on the shared session, run on the thread pool.
+        """
+        with METRICS.timer("scrape.fetch"):
+            response = self.session.get(url, timeout=self.timeout)
+        self.requests_made += 1
+        self.bytes_fetched += len(response.content)
+        METRICS.count("requests")
+        METRICS.count("bytes_fetched", len(response.content))
+        return response
+
+    async def _wait_turn(self, domain):
+        """
+        Space request starts to a domain by a jittered minimum interval.
+        """
+        # No await between reading and booking the slot, so no lock is needed
+        now = time.monotonic()
+        start = max(now, self._next_start.get(domain, now))
+        self._next_start[domain] = start + self.min_interval * random.uniform(0.5, 1.5)
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def _retry_delay(self, response, attempt):
+        """
+        Delay before the next attempt, honoring a numeric Retry-After header,
+        at most max_backoff seconds.
+        """
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        return min(self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5), self.max_backoff)
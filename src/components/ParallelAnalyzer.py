@@ -0,0 +1,256 @@
+import copy
+import multiprocessing
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from components.ReviewAnalyzer import ReviewAnalyzer
+from components.ReviewBatch import ReviewBatch
+from components.ScoredResult import ScoredResult
+
+# Analyzer owned by each worker process, installed by _init_worker
+_worker_analyzer = None
+
+class ParallelAnalyzer:
+    """
+    Runs ReviewAnalyzer over a process pool.
+
+    Reviews are cut into fixed-size shards that are sent to the workers in
+    large batches to keep pickling overhead low. Results are merged back in
+    input order. Each shard seeds the random jitter from (seed, shard index),
+    and shard boundaries depend only on shard_size, so a seeded run gives
+    the same scores for any number of workers.
+
+    Near-duplicate detection and the review timeline need one index over
+    every review, so workers get an analyzer without them and the parent
+    process adds their flags (and timeline features) to the merged
+    results, in input order.
+
+    The worker pool is started on first use and reused by every later
+    call, so workers load the model and lexicons once; it is restarted
+    when the analyzer's version changes (e.g. after add_pattern_pack), so
+    workers never score with stale patterns. close() (or leaving a with
+    block) shuts it down. Workers are started with the forkserver
+    method where available, else spawn, so the pool never forks a process
+    that is running other threads (e.g. BatchPipeline's scrapers).
+    """
+
+    def __init__(self, analyzer=None, workers=None, shard_size=10000, seed=None, start_method=None):
+        """
+        Initialize the ParallelAnalyzer.
+
+        Args:
+            analyzer (ReviewAnalyzer): Analyzer copied into every worker.
+            workers (int): Number of worker processes. Defaults to the CPU count.
+            shard_size (int): Number of reviews per shard.
+            seed (int): Optional seed for the random jitter.
+            start_method (str): multiprocessing start method of the workers;
+                forkserver where supported, else spawn.
+        """
+        self.analyzer = analyzer or ReviewAnalyzer()
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self.seed = seed
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self.start_method = start_method
+        self._pool = None
+        self._pool_version = None
+
+    def close(self):
+        """
+        Shut down the worker pool; the next call starts a new one.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def analyze_reviews(self, reviews, threshold=0.7):
+        """
+        Analyze a list of reviews across the worker pool.
+
+        Args:
+            reviews (ReviewBatch or list): Reviews, as a batch or review dictionaries.
+            threshold (float): Confidence threshold for fake detection.
+
+        Returns:
+            ScoredResult: Same as ReviewAnalyzer.analyze_reviews.
+        """
+        batch = ReviewBatch.from_reviews(reviews)
+        shards = (
+            (batch.slice(start, start + self.shard_size), self._shard_seed(index))
+            for index, start in enumerate(range(0, len(batch), self.shard_size))
+        )
+
+        fake_scores = [np.empty(0)]
+        flag_masks = [np.empty(0, dtype=np.uint64)]
+        for shard_scores, shard_masks in self._map(_analyze_shard, shards):
+            fake_scores.append(shard_scores)
+            flag_masks.append(shard_masks)
+
+        fake_scores = np.concatenate(fake_scores)
+        flag_masks = np.concatenate(flag_masks) | self.analyzer._duplicate_masks(batch.columns["text"])
+        flag_masks |= self.analyzer._temporal_masks(batch)
+        scored = batch.with_scores(fake_scores, flag_masks, self.analyzer.flag_labels)
+        return ScoredResult(scored, fake_scores, threshold)
+
+    @property
+    def flag_labels(self):
+        """
+        Every flag the analyzer can raise, in bitmask order.
+        """
+        return self.analyzer.flag_labels
+
+    def analyze_batch(self, data, threshold=0.7):
+        """
+        Analyze a columnar batch across the worker pool.
+
+        The batch is cut into shard_size slices that are scored with
+        analyze_frames and joined back in input order.
+
+        Args:
+            data: Same as ReviewAnalyzer.analyze_batch.
+            threshold (float): Confidence threshold for fake detection.
+
+        Returns:
+            dict: Same as ReviewAnalyzer.analyze_batch.
+        """
+        frame = self.analyzer._to_frame(data)
+        if len(frame) <= self.shard_size:
+            shards = [frame]
+        else:
+            shards = (frame.iloc[start:start + self.shard_size] for start in range(0, len(frame), self.shard_size))
+        scores = pd.concat([result["scores"] for result in self.analyze_frames(shards, threshold)])
+
+        total = len(scores)
+        fake_percentage = round((int(scores["is_fake"].sum()) / total) * 100) if total > 0 else 0
+        return {
+            "real_percentage": 100 - fake_percentage,
+            "fake_percentage": fake_percentage,
+            "scores": scores
+        }
+
+    def analyze_frames(self, frames, threshold=0.7):
+        """
+        Score a stream of DataFrame batches, e.g. from DatasetLoader.iter_frames.
+
+        At most two batches per worker are in flight, so memory stays bounded
+        for arbitrarily long streams.
+
+        Args:
+            frames (iterable): DataFrames with the ReviewAnalyzer batch columns.
+            threshold (float): Confidence threshold for fake detection.
+
+        Yields:
+            dict: analyze_batch result for each frame, in input order.
+        """
+        pending = deque()
+
+        def jobs():
+            for index, frame in enumerate(frames):
+                pending.append(frame)
+                yield frame, threshold, self._shard_seed(index)
+
+        analyzer = self.analyzer
+        for result in self._map(_analyze_frame, jobs()):
+            frame = pending.popleft()
+            scores = result["scores"]
+            if analyzer.duplicates is not None:
+                self._append_flag(scores, analyzer.DUPLICATE_FLAG, analyzer._near_duplicates(frame["text"]))
+            if analyzer.temporal is not None:
+                temporal = analyzer.temporal_features(frame)
+                self._append_flag(scores, analyzer.BURST_FLAG, temporal["burst"].to_numpy())
+                repeat = temporal["reviewer_reviews"].to_numpy() >= analyzer.REPEAT_REVIEWER_COUNT
+                self._append_flag(scores, analyzer.REPEAT_REVIEWER_FLAG, repeat)
+                scores["burst_size"] = temporal["burst_size"].to_numpy()
+                scores["reviewer_reviews"] = temporal["reviewer_reviews"].to_numpy()
+            yield result
+
+    def _append_flag(self, scores, label, mask):
+        """
+        Add a flag label to the comma separated flags of the masked rows.
+        """
+        flags = scores["flags"].to_numpy(dtype=object)
+        joined = np.where(flags == "", label, flags + ", " + label)
+        scores["flags"] = np.where(mask, joined, flags)
+
+    def _worker_analyzer(self):
+        """
+        Copy of the analyzer for the workers, without the indexes kept by the parent.
+        """
+        analyzer = copy.copy(self.analyzer)
+        analyzer.duplicates = None
+        analyzer.temporal = None
+        return analyzer
+
+    def _map(self, function, jobs):
+        """
+        Apply function to jobs on the pool, yielding results in order.
+        """
+        if self.workers == 1:
+            _init_worker(self._worker_analyzer())
+            for job in jobs:
+                yield function(job)
+            return
+
+        version = self.analyzer.version
+        if self._pool is not None and self._pool_version != version:
+            self.close()
+        if self._pool is None:
+            self._pool_version = version
+            self._pool = ProcessPoolExecutor(
+                self.workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_init_worker,
+                initargs=(self._worker_analyzer(),),
+            )
+        pending = deque()
+        try:
+            for job in jobs:
+                pending.append(self._pool.submit(function, job))
+                if len(pending) >= 2 * self.workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _shard_seed(self, index):
+        """
+        Derive an independent jitter seed for one shard.
+        """
+        if self.seed is None:
+            return None
+        return int(np.random.SeedSequence([self.seed, index]).generate_state(1)[0])
+
+def _init_worker(analyzer):
+    """
+    Install the analyzer used by this worker process.
+    """
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+def _analyze_shard(job):
+    """
+    Score one shard of review dictionaries in a worker.
+    """
+    reviews, seed = job
+    # A generator of its own: with one worker this runs in the caller's process
+    rng = random.Random(seed) if seed is not None else None
+    return _worker_analyzer._score_reviews(reviews, rng)
+
+def _analyze_frame(job):
+    """
+    Score one DataFrame batch in a worker.
+    """
+    frame, threshold, seed = job
+    return _worker_analyzer.analyze_batch(frame, threshold=threshold, seed=seed)
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import re
+import numpy as np
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+class PatternMatcher:
+    """
+    Matches a set of suspicious-text patterns against a review in one scan.
+
+    Every pattern is reduced to the longest literal it cannot match without
+    (e.g. "in exchange for " for r'in exchange for .{0,40}review'). All
+    literals are compiled into a single trie-shaped regex, so one pass over
+    the text finds every literal occurrence at a cost that depends on the
+    text length and trie depth rather than on the number of patterns. Only
+    patterns whose literal was seen are then confirmed with their own regex;
+    patterns that are plain literals need no confirmation at all. Patterns
+    with no required literal (e.g. a top-level alternation) are always
+    checked, so packs should prefer anchored phrases.
+    """
+
+    def __init__(self, patterns=None, labels=None):
+        """
+        Initialize the PatternMatcher.
+
+        Args:
+            patterns (list): Regular expression strings, matched case-insensitively.
+            labels (list): Flag label for each pattern. Defaults to the pattern itself.
+        """
+        self.patterns = []
+        self.labels = []
+        self.compiled = []
+        self.add_patterns(patterns or [], labels)
+
+    def add_patterns(self, patterns, labels=None):
+        """
+        Add patterns to the matcher and rebuild the combined scanner.
+
+        Args:
+            patterns (list): Regular expression strings.
+            labels (list): Flag label for each pattern.
+        """
+        patterns = list(patterns)
+        labels = list(labels) if labels is not None else list(patterns)
+        if len(labels) != len(patterns):
+            raise ValueError("Each pattern needs exactly one label")
+
+        self.patterns.extend(patterns)
+        self.labels.extend(labels)
+        self.compiled.extend(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+        self._build()
+
+    def load_pack(self, path):
+        """
+        Add a pattern pack from a JSON file.
+
+        The file maps each flag label to a list of patterns, e.g.
+        {"Incentivized review": ["free product", "discount for .{0,20}review"]}.
+
+        Args:
+            path (str): Path to the JSON pattern pack.
+        """
+        with open(path, encoding="utf-8") as f:
+            pack = json.load(f)
+
+        patterns, labels = [], []
+        for label, label_patterns in pack.items():
+            for pattern in label_patterns:
+                patterns.append(pattern)
+                labels.append(label)
+        self.add_patterns(patterns, labels)
+
+    @property
+    def version(self):
+        """
+        Stable identifier of the pattern set, for cache keys.
+        """
+        digest = hashlib.sha1()
+        for pattern, label in zip(self.patterns, self.labels):
+            digest.update(pattern.encode("utf-8") + b"\0" + label.encode("utf-8") + b"\0")
+        return digest.hexdigest()[:16]
+
+    def match(self, text):
+        """
+        Find which patterns match a text.
+
+        Args:
+            text (str): Review text, any case.
+
+        Returns:
+            list: Sorted indices of the matching patterns.
+        """
+        text = text.lower()
+        candidates = set(self._unanchored)
+
+        if self._scanner is not None:
+            for found in self._scanner.findall(text):
+                candidates.update(self._literal_patterns[found])
+
+        compiled = self.compiled
+        exact = self._exact
+        return sorted(i for i in candidates if i in exact or compiled[i].search(text))
+
+    def match_matrix(self, texts):
+        """
+        Match every text and return the hits as a boolean matrix.
+
+        Args:
+            texts (iterable): Review texts.
+
+        Returns:
+            np.ndarray: Boolean matrix of shape (len(texts), len(patterns))
+        """
+        texts = list(texts)
+        hits = np.zeros((len(texts), len(self.patterns)), dtype=bool)
+        for row, text in enumerate(texts):
+            hits[row, self.match(text)] = True
+        return hits
+
+    def _build(self):
+        """
+        Rebuild the literal trie scanner from the current patterns.
+        """
+        literal_ids = {}
+        self._unanchored = []
+        self._exact = set()
+
+        for i, pattern in enumerate(self.patterns):
+            literal, exact = _required_literal(pattern)
+            if not literal:
+                self._unanchored.append(i)
+                continue
+            literal_ids.setdefault(literal, []).append(i)
+            if exact:
+                self._exact.add(i)
+
+        # The scanner reports the longest literal starting at each position,
+        # so a hit also implies every shorter literal that is its prefix
+        self._literal_patterns = {}
+        for literal in literal_ids:
+            ids = []
+            for end in range(1, len(literal) + 1):
+                ids.extend(literal_ids.get(literal[:end], []))
+            self._literal_patterns[literal] = ids
+
+        if literal_ids:
+            self._scanner = re.compile("(?=(" + _trie_pattern(literal_ids) + "))")
+        else:
+            self._scanner = None
+
+def _required_literal(pattern):
+    """
+    Find the longest literal substring every match of a pattern contains.
+
+    Args:
+        pattern (str): Regular expression string.
+
+    Returns:
+        tuple: (lowercased literal or "", whether the pattern is that literal)
+    """
+    try:
+        parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    except re.error:
+        return "", False
+
+    runs, run = [], []
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            low, high, body = av
+            if low >= 1 and len(body) == 1 and body[0][0] is sre_parse.LITERAL:
+                # "!!+" requires "!!"; anything after the required copies varies
+                run.extend(chr(body[0][1]) * low)
+                if high == low:
+                    continue
+        runs.append("".join(run))
+        run = []
+    runs.append("".join(run))
+
+    literal = max(runs, key=len).lower()
+    exact = len(runs) == 1 and literal == runs[0].lower()
+    return literal, exact
+
+def _trie_pattern(literals):
+    """
+    Build a regex source matching any of the literals, factored as a trie.
+
+    Args:
+        literals (iterable): Literal strings.
+
+    Returns:
+        str: Regex source preferring the longest literal at a position.
+    """
+    trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            body = "(?:" + body + ")?"
+        return body
+
+    return build(trie)
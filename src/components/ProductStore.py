@@ -0,0 +1,361 @@
+import contextlib
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import numpy as np
+import pandas as pd
+from components.ReviewBatch import ReviewBatch
+from components.ScoredResult import ScoredResult
+
+class ProductState:
+    """
+    What is known about one product from earlier checks.
+
+    Holds the keys of the most recently analyzed reviews, so a re-check can
+    stop paging at the first review it has already seen, and running
+    aggregates over every review analyzed so far: the sorted fake scores
+    (fake counts at any threshold are a binary search, as in ScoredResult)
+    and counts of reviews, verified purchases, ratings and flags. Updating
+    the state with a batch of new reviews touches only those reviews.
+
+    Supports `review in state` for review mappings, which is what
+    ReviewScraper.scrape expects as its seen argument.
+    """
+
+    def __init__(self, key, max_seen=5000, seen_keys=None, sorted_scores=None, counts=None, updated=None):
+        """
+        Initialize the ProductState.
+
+        Args:
+            key (str): Product key, e.g. from ReviewScraper.product_key.
+            max_seen (int): Review keys remembered for stopping the scraper.
+            seen_keys (np.ndarray): uint64 keys of analyzed reviews, oldest first.
+            sorted_scores (np.ndarray): Fake scores of all analyzed reviews, sorted.
+            counts (dict): Running counts, see update().
+            updated (float): Time of the last update, as a Unix timestamp.
+        """
+        self.key = key
+        self.max_seen = max_seen
+        self.seen_keys = np.asarray(seen_keys if seen_keys is not None else [], dtype=np.uint64)
+        self.sorted_scores = np.asarray(sorted_scores if sorted_scores is not None else [], dtype=float)
+        self.counts = counts or {"reviews": 0, "checks": 0, "verified": 0, "rating_sum": 0, "flags": {}}
+        self.updated = updated
+        self._seen = set(self.seen_keys.tolist())
+
+    @staticmethod
+    def review_key(review):
+        """
+        64-bit key identifying a review by reviewer, date and text.
+        """
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update("\x1f".join((review["reviewer"], review["date"], review["text"])).encode("utf-8", "surrogatepass"))
+        return int.from_bytes(digest.digest(), "little")
+
+    def new_reviews(self, reviews):
+        """
+        The reviews that were not analyzed before, each once.
+
+        Args:
+            reviews (ReviewBatch or list): Scraped reviews.
+
+        Returns:
+            ReviewBatch: The new reviews, in their original order.
+        """
+        batch = ReviewBatch.from_reviews(reviews)
+        keys = [self.review_key(review) for review in batch]
+        kept = set(self._seen)
+        new = []
+        for index, key in enumerate(keys):
+            if key not in kept:
+                kept.add(key)
+                new.append(index)
+        if len(new) == len(batch):
+            return batch
+        return ReviewBatch.from_reviews([batch[index] for index in new])
+
+    def update(self, scored):
+        """
+        Add newly analyzed reviews to the aggregates.
+
+        Args:
+            scored (ScoredResult): Analysis of reviews from new_reviews().
+        """
+        batch = scored.batch
+        counts = self.counts
+        counts["checks"] += 1
+        counts["last_check_reviews"] = len(batch)
+        self.updated = time.time()
+        if len(batch) == 0:
+            return
+
+        keys = np.fromiter((self.review_key(review) for review in batch), dtype=np.uint64, count=len(batch))
+        self.seen_keys = np.concatenate([self.seen_keys, keys])[-self.max_seen:]
+        self._seen = set(self.seen_keys.tolist())
+
+        scores = np.sort(scored.fake_scores)
+        self.sorted_scores = np.insert(self.sorted_scores, np.searchsorted(self.sorted_scores, scores), scores)
+
+        counts["reviews"] += len(batch)
+        counts["verified"] += int(batch.columns["verified_purchase"].sum())
+        counts["rating_sum"] += int(batch.columns["rating"].astype(np.int64).sum())
+        if batch.flag_masks is not None:
+            for bit, label in enumerate(batch.flag_labels):
+                hits = int(np.count_nonzero(batch.flag_masks & np.uint64(1 << bit)))
+                if hits:
+                    counts["flags"][label] = counts["flags"].get(label, 0) + hits
+
+    def unseen(self, scored):
+        """
+        The part of a ScoredResult whose reviews are not in this state.
+        """
+        batch = scored.batch
+        keep = [index for index, review in enumerate(batch) if review not in self]
+        if len(keep) == len(batch):
+            return scored
+        kept = ReviewBatch.from_reviews([batch[index] for index in keep]).with_scores(
+            batch.fake_scores[keep], batch.flag_masks[keep], batch.flag_labels
+        )
+        return ScoredResult(kept, kept.fake_scores, scored.threshold)
+
+    def fake_count(self, threshold):
+        """
+        Number of analyzed reviews scoring above a threshold, in O(log n).
+        """
+        return len(self.sorted_scores) - int(np.searchsorted(self.sorted_scores, threshold, side="right"))
+
+    def fake_percentage(self, threshold):
+        total = len(self.sorted_scores)
+        return round((self.fake_count(threshold) / total) * 100) if total > 0 else 0
+
+    def real_percentage(self, threshold):
+        return 100 - self.fake_percentage(threshold)
+
+    def threshold_curve(self, thresholds=None):
+        """
+        Fake rate of all analyzed reviews at many thresholds.
+
+        Returns:
+            pd.DataFrame: threshold and fake_rate (0..1) columns.
+        """
+        if thresholds is None:
+            thresholds = np.linspace(0, 1, 101)
+        thresholds = np.asarray(thresholds, dtype=float)
+
+        total = len(self.sorted_scores)
+        fake = total - np.searchsorted(self.sorted_scores, thresholds, side="right")
+        return pd.DataFrame({
+            "threshold": thresholds,
+            "fake_rate": fake / total if total else np.zeros(len(thresholds))
+        })
+
+    def __contains__(self, review):
+        return self.review_key(review) in self._seen
+
+    def __len__(self):
+        return self.counts["reviews"]
+
+class ProductStore:
+    """
+    Per-product state for incremental re-analysis.
+
+    A re-check of a product scrapes only until it reaches a review analyzed
+    before, scores only the reviews that are new, and folds them into the
+    product's running aggregates, so watching a product costs work
+    proportional to its new reviews.
+
+    States are kept in memory and, when a path is given, in a SQLite file
+    (like ScoreCache's disk tier), so they survive restarts and can be
+    shared between processes. With a file, a re-check reads the product's
+    state from it before scraping, and again in an IMMEDIATE transaction
+    before saving: if another process checked the product meanwhile, the
+    new reviews are merged into its state, skipping the reviews it already
+    added, instead of overwriting it.
+
+    Within a process, re-checks of one product are serialized by a lock
+    of that product, held across its scrape and analysis and dropped once
+    no check of the product is running; the store's own lock only guards
+    the state table, so other products are never held up.
+    """
+
+    def __init__(self, path=None, max_seen=5000):
+        """
+        Initialize the ProductStore.
+
+        Args:
+            path (str): SQLite file to persist states in. None keeps memory only.
+            max_seen (int): Review keys remembered per product.
+        """
+        self.path = path
+        self.max_seen = max_seen
+        self._states = {}
+        self._product_locks = {}
+        self._connection = None
+        self._lock = threading.RLock()
+
+    def get(self, key):
+        """
+        State of a product; a fresh one when the product was never checked.
+        """
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = self._load(key) or ProductState(key, self.max_seen)
+                self._states[key] = state
+            return state
+
+    def save(self, state):
+        """
+        Store a state, writing it through to disk when a path is set.
+
+        Replaces what is on disk; refresh() merges instead.
+        """
+        with self._lock:
+            self._states[state.key] = state
+            connection = self._connect()
+            if connection is not None:
+                self._write(connection, state)
+                connection.commit()
+
+    @staticmethod
+    def _write(connection, state):
+        connection.execute(
+            "INSERT OR REPLACE INTO products (key, seen, scores, counts, updated) VALUES (?, ?, ?, ?, ?)",
+            (state.key, state.seen_keys.tobytes(), state.sorted_scores.tobytes(),
+             json.dumps(state.counts), state.updated)
+        )
+
+    def refresh(self, url, scraper, analyzer, min_count=30, max_pages=5, site=None):
+        """
+        Re-check a product, analyzing only the reviews added since last time.
+
+        The scraper's demo-data fallback is off: a check that scrapes
+        nothing records no reviews, and unsupported sites raise ValueError.
+
+        Args:
+            url (str): Product URL.
+            scraper (ReviewScraper): Scraper used to fetch review pages.
+            analyzer (ReviewAnalyzer): Analyzer used for the new reviews.
+            min_count (int): New reviews to collect at most, as in scrape().
+            max_pages (int): Maximum number of pages to scrape.
+            site (str): Site layout, detected from the URL by default.
+
+        Returns:
+            tuple: (ProductState after the update, ScoredResult of the new reviews)
+        """
+        key = scraper.product_key(url)
+        with self._product_lock(key):
+            state = self._reload(key)
+            reviews = scraper.scrape(url, min_count=min_count, max_pages=max_pages, site=site, seen=state,
+                                     mock_fallback=False)
+            new = state.new_reviews(reviews)
+            scored = analyzer.analyze_reviews(new)
+            return self._merge(state, scored)
+
+    @contextlib.contextmanager
+    def _product_lock(self, key):
+        """
+        Hold the lock of one product, dropping it when no one else waits.
+        """
+        with self._lock:
+            entry = self._product_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._product_locks[key]
+
+    def _reload(self, key):
+        """
+        State of a product, re-read from disk when a path is set.
+        """
+        with self._lock:
+            state = self._load(key)
+            if state is None:
+                return self.get(key)
+            self._states[key] = state
+            return state
+
+    def _merge(self, state, scored):
+        """
+        Add a check's scored reviews to the product's latest state and save it.
+
+        Returns:
+            tuple: (the saved ProductState, ScoredResult of the reviews added)
+        """
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                state.update(scored)
+                self._states[state.key] = state
+                return state, scored
+
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                current = self._load(state.key)
+                if current is not None and current.counts["checks"] != state.counts["checks"]:
+                    # Another process checked the product since we read it
+                    state, scored = current, current.unseen(scored)
+                state.update(scored)
+                self._write(connection, state)
+                connection.commit()
+            except BaseException:
+                connection.rollback()
+                self._states.pop(state.key, None)
+                raise
+            self._states[state.key] = state
+            return state, scored
+
+    def clear(self):
+        """
+        Forget every product.
+        """
+        with self._lock:
+            self._states.clear()
+            connection = self._connect()
+            if connection is not None:
+                connection.execute("DELETE FROM products")
+                connection.commit()
+
+    def __len__(self):
+        return len(self._states)
+
+    def _load(self, key):
+        """
+        Read a state from disk, or None.
+        """
+        connection = self._connect()
+        if connection is None:
+            return None
+        row = connection.execute("SELECT seen, scores, counts, updated FROM products WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return ProductState(
+            key,
+            self.max_seen,
+            np.frombuffer(row[0], dtype=np.uint64).copy(),
+            np.frombuffer(row[1], dtype=float).copy(),
+            json.loads(row[2]),
+            row[3],
+        )
+
+    def _connect(self):
+        """
+        Open the SQLite file on first use.
+        """
+        if self.path is None:
+            return None
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS products (
+                    key TEXT PRIMARY KEY, seen BLOB, scores BLOB, counts TEXT, updated REAL
+                )
+            """)
+        return self._connection
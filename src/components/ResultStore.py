@@ -0,0 +1,697 @@
+import bisect
+import json
+import os
+import threading
+import numpy as np
+import pandas as pd
+from components.ReviewBatch import ReviewBatch, StringColumn
+
+# File locks between processes; fcntl on POSIX, msvcrt on Windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# Price bands of the notebook's Price_Bin analysis; upper bounds are inclusive, as with pd.cut
+PRICE_BINS = [0, 500, 1000, 2000, 5000, 10000, np.inf]
+PRICE_LABELS = ["<500", "500-1k", "1k-2k", "2k-5k", "5k-10k", "10k+"]
+
+def price_bands(prices):
+    """
+    Index into PRICE_LABELS of each price, -1 for missing or non-positive prices.
+    """
+    bands = np.searchsorted(PRICE_BINS, np.asarray(prices, dtype=float), side="left") - 1
+    bands[(bands < 0) | (bands >= len(PRICE_LABELS))] = -1
+    return bands
+
+class ResultStore:
+    """
+    On-disk columnar store of scored reviews, partitioned by product.
+
+    Each product gets a directory with two files that batches are
+    appended to: the fixed-width columns as packed records of the RECORD
+    dtype, read back as a memory-mapped structured array, and the review
+    texts as one UTF-8 buffer, each record holding the end offset of its
+    text. A product-name index maps names to partitions.
+
+    Aggregates are kept per product and per price band (PRICE_LABELS) and
+    updated with each added batch: a histogram of fake scores over 0.01
+    wide bins, rating counts, verified purchases and flag counts. Fake
+    rates at any threshold are sums over the histogram, so "fake rate of
+    product X" or "fake rate by price band" never touches the reviews.
+    Thresholds resolve to the 0.01 grid, rounding down; on the grid the
+    counts equal ScoredResult's (score > threshold).
+
+    Added batches become durable on flush(), which costs time in what
+    changed since the last flush, not in the size of the store. Product
+    names and batch ids are appended to log files, the aggregates of the
+    products that changed are saved as a delta file, and the small index
+    (the log lengths, the base aggregates generation and its deltas) is
+    replaced atomically. Once the deltas hold more rows than there are
+    products, the next flush writes a new base of all aggregates instead,
+    so rewrites stay amortized linear; once there are MAX_DELTAS deltas,
+    the next one replaces them all with the products they cover.
+    Reopening loads the base memory-
+    mapped and applies the deltas; anything written after the last flush
+    (partition rows, log lines) is ignored and later overwritten.
+
+    Batches can carry an id; a batch id that was added before is skipped,
+    so replaying work after a crash does not count reviews twice.
+
+    Several processes can share a store (the app and batch jobs). add()
+    only updates the in-memory aggregates and keeps the batch; flush()
+    writes under an exclusive lock file. If another process flushed since
+    the store was read, flush() first reloads it and replays the pending
+    batches on top, so product ids, partition rows and logs continue from
+    what is on disk and no one's batches are lost. Reads reload a store
+    with nothing pending when another process flushed, so long-lived
+    handles see batch results. Threads sharing one ResultStore are
+    serialized by an in-process lock.
+    """
+
+    # Score bins: bin b holds scores in (SCORE_EDGES[b - 1], SCORE_EDGES[b]]
+    SCORE_EDGES = np.arange(101) / 100
+    RECORD = np.dtype([
+        ("rating", np.int8),
+        ("verified_purchase", np.bool_),
+        ("helpful_votes", np.int32),
+        ("price", np.float64),
+        ("fake_score", np.float64),
+        ("flag_mask", np.uint64),
+        ("text_end", np.int64),
+    ])
+    AGGREGATES = ("product_scores", "product_ratings", "product_verified", "product_flags", "product_price", "band_scores")
+    LOGS = ("products", "batches")
+    MAX_DELTAS = 16
+    MAX_FLAGS = 64
+
+    def __init__(self, path):
+        """
+        Initialize the ResultStore.
+
+        Args:
+            path (str): Store directory; created on first flush.
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._lock_file = None
+        self._reset()
+        self._sync()
+
+    def _reset(self):
+        """
+        Empty in-memory state, with nothing read from disk.
+        """
+        self.names = []
+        self.flag_labels = []
+        self._ids = {}
+        self._batches = set()
+        self._generation = 0
+        self._base = None
+        self._deltas = []
+        self._delta_rows = 0
+        self._delta_pids = set()
+        self._log_bytes = dict.fromkeys(self.LOGS, 0)
+        self._flushed_names = 0
+        self._new_batches = []
+        self._dirty = set()
+        self._pending = []
+        self._unwritten = []
+        self._unwritten_rows = {}
+        self._sorted_names = None
+        self._count = 0
+        self._aggregates = self._empty(0)
+        self._writable = False
+        self._stamp = None
+
+    def _load(self):
+        """
+        Read the store from disk, dropping anything not flushed.
+
+        Callers hold the lock file, so no flush replaces files meanwhile.
+        """
+        self._reset()
+        self._stamp = self._index_stamp()
+        if self._stamp is not None:
+            with open(os.path.join(self.path, "index.json"), encoding="utf-8") as f:
+                index = json.load(f)
+            self.flag_labels = index["flag_labels"]
+            self._generation = index["generation"]
+            self._base = index["base"]
+            self._deltas = index["deltas"]
+            self._log_bytes = index["log_bytes"]
+            self.names = self._read_log("products")
+            self._batches = set(self._read_log("batches"))
+            self._ids = {name: pid for pid, name in enumerate(self.names)}
+            self._flushed_names = self._count = len(self.names)
+            self._aggregates = {
+                name: np.load(self._aggregate_path(name, self._base), mmap_mode="r")
+                for name in self.AGGREGATES
+            }
+            if self._deltas:
+                self._apply_deltas()
+
+    def _index_stamp(self):
+        """
+        Identity of the current index file, None when nothing was flushed.
+
+        Flushes replace the index, so a changed stamp means another flush.
+        """
+        try:
+            stat = os.stat(os.path.join(self.path, "index.json"))
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _acquire(self):
+        """
+        Take the store's lock file, shared with other processes.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        f = open(os.path.join(self.path, "lock"), "a+b")
+        try:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        except BaseException:
+            f.close()
+            raise
+        self._lock_file = f
+
+    def _release(self):
+        """
+        Give up the lock file, if held.
+        """
+        f, self._lock_file = self._lock_file, None
+        if f is not None:
+            if fcntl is None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            f.close()
+
+    def _sync(self):
+        """
+        Reload when another process flushed, unless batches are pending here.
+        """
+        with self._lock:
+            if self._pending or self._index_stamp() == self._stamp:
+                return
+            # A flush in progress may be replacing files; read them once it is done
+            self._acquire()
+            try:
+                self._load()
+            finally:
+                self._release()
+
+    def _read_log(self, name):
+        """
+        Entries of a log file up to its length at the last flush.
+        """
+        with open(os.path.join(self.path, f"{name}.log"), "rb") as f:
+            data = f.read(self._log_bytes[name])
+        return [json.loads(line) for line in data.splitlines()]
+
+    def _apply_deltas(self):
+        """
+        Bring the base aggregates up to date with the deltas flushed since.
+        """
+        base = self._aggregates
+        self._count = len(base["product_verified"])
+        self._aggregates = {name: np.array(values) for name, values in base.items()}
+        self._writable = True
+        self._grow(len(self.names) - self._count)
+        for generation in self._deltas:
+            with np.load(self._delta_path(generation)) as delta:
+                pids = delta["pids"]
+                self._delta_rows += len(pids)
+                self._delta_pids.update(pids.tolist())
+                for name in self.AGGREGATES:
+                    if name.startswith("product_"):
+                        self._aggregates[name][pids] = delta[name]
+                    else:
+                        self._aggregates[name] = np.array(delta[name])
+
+    def _empty(self, capacity):
+        bins = len(self.SCORE_EDGES)
+        return {
+            "product_scores": np.zeros((capacity, bins), dtype=np.int64),
+            "product_ratings": np.zeros((capacity, 6), dtype=np.int64),
+            "product_verified": np.zeros(capacity, dtype=np.int64),
+            "product_flags": np.zeros((capacity, self.MAX_FLAGS), dtype=np.int64),
+            "product_price": np.full(capacity, np.nan),
+            "band_scores": np.zeros((len(PRICE_LABELS), bins), dtype=np.int64),
+        }
+
+    def add(self, products, scored, prices=None, batch_id=None):
+        """
+        Append a batch of scored reviews and fold it into the aggregates.
+
+        Args:
+            products (str or array-like): Product name of each review, or one
+                name for the whole batch.
+            scored (ScoredResult or ReviewBatch): Scored reviews, with flags.
+            prices (float or array-like): Price of each review, or one price
+                for the batch; None or NaN when unknown.
+            batch_id (str): Id of the batch, to skip it when added again.
+
+        Returns:
+            bool: False when the batch id was added before.
+        """
+        batch = scored if isinstance(scored, ReviewBatch) else scored.batch
+        if batch.fake_scores is None:
+            raise ValueError("ResultStore.add needs scored reviews")
+        size = len(batch.fake_scores)
+        products = np.full(size, products, dtype=object) if isinstance(products, str) else np.asarray(products, dtype=object)
+        prices = np.broadcast_to(np.asarray(np.nan if prices is None else prices, dtype=float), (size,))
+
+        with self._lock:
+            self._sync()
+            return self._add(products, batch, prices, batch_id)
+
+    def _add(self, products, batch, prices, batch_id):
+        """
+        Fold a batch into the aggregates and keep it until the next flush.
+        """
+        if batch_id is not None and batch_id in self._batches:
+            return False
+        self._pending.append((products, batch, prices, batch_id))
+        if len(products):
+            self._add_rows(products, batch, prices)
+        if batch_id is not None:
+            self._batches.add(batch_id)
+            self._new_batches.append(batch_id)
+        return True
+
+    def _add_rows(self, products, batch, prices):
+        codes, names = pd.factorize(products)
+        pids = np.array([self._product_id(name) for name in names], dtype=np.int64)
+        self._dirty.update(pids.tolist())
+        aggregates = self._make_writable()
+        bins = np.searchsorted(self.SCORE_EDGES, batch.fake_scores, side="left")
+        width = len(self.SCORE_EDGES)
+        groups = len(names)
+
+        flag_masks = self._store_masks(batch)
+        ratings = np.clip(batch.columns["rating"].astype(np.int64), 0, 5)
+        records = np.zeros(len(codes), dtype=self.RECORD)
+        for name in ("rating", "verified_purchase", "helpful_votes"):
+            records[name] = batch.columns[name]
+        records["price"] = prices
+        records["fake_score"] = batch.fake_scores
+        records["flag_mask"] = flag_masks
+
+        # Partition rows are written by flush(), each product's in batch order
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(groups + 1))
+        for group, pid in enumerate(pids.tolist()):
+            rows = order[bounds[group]:bounds[group + 1]]
+            self._unwritten.append((pid, records[rows], [batch.columns["text"][row] for row in rows]))
+            self._unwritten_rows[pid] = self._unwritten_rows.get(pid, 0) + len(rows)
+
+        aggregates["product_scores"][pids] += np.bincount(codes * width + bins, minlength=groups * width).reshape(groups, width)
+        aggregates["product_ratings"][pids] += np.bincount(codes * 6 + ratings, minlength=groups * 6).reshape(groups, 6)
+        aggregates["product_verified"][pids] += np.bincount(codes, weights=batch.columns["verified_purchase"], minlength=groups).astype(np.int64)
+        for bit in range(len(self.flag_labels)):
+            hits = (flag_masks >> np.uint64(bit)) & np.uint64(1)
+            if hits.any():
+                aggregates["product_flags"][pids, bit] += np.bincount(codes, weights=hits, minlength=groups).astype(np.int64)
+        latest = pd.Series(prices).groupby(codes).last()
+        known = latest.notna().to_numpy()
+        aggregates["product_price"][pids[latest.index.to_numpy()[known]]] = latest.to_numpy()[known]
+
+        bands = price_bands(prices)
+        banded = bands >= 0
+        if banded.any():
+            counts = np.bincount(bands[banded] * width + bins[banded], minlength=len(PRICE_LABELS) * width)
+            aggregates["band_scores"] += counts.reshape(len(PRICE_LABELS), width)
+
+    def _product_id(self, name):
+        pid = self._ids.get(name)
+        if pid is None:
+            pid = self._ids[name] = len(self.names)
+            self.names.append(name)
+            self._sorted_names = None
+            self._grow(1)
+        return pid
+
+    def _grow(self, count):
+        """
+        Make room for count more products, doubling the aggregate arrays as needed.
+        """
+        aggregates = self._make_writable()
+        needed = self._count + count
+        capacity = len(aggregates["product_verified"])
+        if needed > capacity:
+            grown = self._empty(max(needed, 2 * capacity, 1024))
+            for name, values in aggregates.items():
+                if name.startswith("product_"):
+                    grown[name][:self._count] = values[:self._count]
+                else:
+                    grown[name] = values
+            self._aggregates = aggregates = grown
+        self._count = needed
+
+    def _make_writable(self):
+        """
+        In-memory copies of the aggregates, replacing the read-only maps on first write.
+        """
+        if not self._writable:
+            self._aggregates = {name: np.array(values) for name, values in self._aggregates.items()}
+            self._writable = True
+        return self._aggregates
+
+    def _store_masks(self, batch):
+        """
+        The batch's flag masks over the store's flag labels, adding new labels.
+        """
+        if batch.flag_masks is None:
+            return np.zeros(len(batch.fake_scores), dtype=np.uint64)
+        for label in batch.flag_labels:
+            if label not in self.flag_labels:
+                if len(self.flag_labels) == self.MAX_FLAGS:
+                    raise ValueError(f"ResultStore holds at most {self.MAX_FLAGS} flag labels")
+                self.flag_labels.append(label)
+        bits = [self.flag_labels.index(label) for label in batch.flag_labels]
+        if bits == list(range(len(bits))):
+            return np.asarray(batch.flag_masks, dtype=np.uint64)
+        masks = np.zeros(len(batch.flag_masks), dtype=np.uint64)
+        for bit, store_bit in enumerate(bits):
+            masks |= ((batch.flag_masks >> np.uint64(bit)) & np.uint64(1)) << np.uint64(store_bit)
+        return masks
+
+    def _partition(self, pid):
+        return os.path.join(self.path, "products", f"{pid:06d}")
+
+    def _write_partitions(self):
+        """
+        Append the rows added since the last flush to their partitions.
+        """
+        scores = self._aggregates["product_scores"]
+        written = {pid: int(scores[pid].sum()) - rows for pid, rows in self._unwritten_rows.items()}
+        for pid, records, texts in self._unwritten:
+            self._append(pid, written[pid], records, texts)
+            written[pid] += len(records)
+
+    def _append(self, pid, rows, records, texts):
+        """
+        Append records and their texts to a product's partition, first
+        cutting off what was written after the last flush.
+        """
+        partition = self._partition(pid)
+        if not rows:
+            os.makedirs(partition, exist_ok=True)
+        size = self.RECORD.itemsize
+        with open(os.path.join(partition, "records.bin"), "a+b") as f:
+            f.truncate(rows * size)
+            start = 0
+            if rows:
+                f.seek((rows - 1) * size)
+                start = int(np.frombuffer(f.read(size), dtype=self.RECORD)["text_end"][0])
+            encoded = [text.encode("utf-8", "surrogatepass") for text in texts]
+            records["text_end"] = start + np.cumsum([len(text) for text in encoded], dtype=np.int64)
+            # Texts first, so a record never points past the end of the text buffer
+            with open(os.path.join(partition, "text.bin"), "ab") as text:
+                text.truncate(start)
+                text.write(b"".join(encoded))
+            f.write(records.tobytes())
+
+    def flush(self):
+        """
+        Make the batches added since the last flush durable.
+
+        Holds the store's lock file while writing. When another process
+        flushed since this store was read, it is reloaded first and the
+        pending batches are added again; batch ids flushed meanwhile by
+        the other process are skipped.
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            self._acquire()
+            try:
+                if self._index_stamp() != self._stamp:
+                    pending = self._pending
+                    self._load()
+                    for entry in pending:
+                        self._add(*entry)
+                self._write_partitions()
+                self._write_index()
+            finally:
+                self._release()
+
+    def _write_index(self):
+        """
+        Write the logs, aggregates and index of a flush; needs the lock file.
+        """
+        if not self._dirty and not self._new_batches:
+            # Every pending batch was flushed by another process already
+            self._pending = []
+            return
+        os.makedirs(self.path, exist_ok=True)
+        generation = self._generation + 1
+        delta_pids = self._delta_pids | self._dirty
+        compact = self._base is None or self._delta_rows + len(self._dirty) > max(self._count, 1024)
+        merge = not compact and len(self._deltas) >= self.MAX_DELTAS
+        if compact:
+            for name, values in self._aggregates.items():
+                values = values[:self._count] if name.startswith("product_") else values
+                self._save(self._aggregate_path(name, generation), np.save, values)
+            base, deltas, delta_rows, delta_pids = generation, [], 0, set()
+        else:
+            pids = np.array(sorted(delta_pids if merge else self._dirty), dtype=np.int64)
+            rows = {
+                name: values[pids] if name.startswith("product_") else values
+                for name, values in self._aggregates.items()
+            }
+            self._save(self._delta_path(generation), np.savez, pids=pids, **rows)
+            if merge:
+                base, deltas, delta_rows = self._base, [generation], len(pids)
+            else:
+                base, deltas, delta_rows = self._base, self._deltas + [generation], self._delta_rows + len(pids)
+
+        log_bytes = {
+            "products": self._append_log("products", self.names[self._flushed_names:]),
+            "batches": self._append_log("batches", self._new_batches),
+        }
+
+        index_path = os.path.join(self.path, "index.json")
+        with open(index_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({
+                "generation": generation,
+                "base": base,
+                "deltas": deltas,
+                "log_bytes": log_bytes,
+                "flag_labels": self.flag_labels,
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(index_path + ".tmp", index_path)
+        self._stamp = self._index_stamp()
+
+        if compact or merge:
+            for old in self._deltas:
+                os.remove(self._delta_path(old))
+        if compact:
+            if self._base is not None:
+                for name in self.AGGREGATES:
+                    os.remove(self._aggregate_path(name, self._base))
+        self._generation, self._base, self._deltas = generation, base, deltas
+        self._delta_rows, self._delta_pids = delta_rows, delta_pids
+        self._log_bytes = log_bytes
+        self._flushed_names = len(self.names)
+        self._new_batches = []
+        self._dirty.clear()
+        self._pending = []
+        self._unwritten = []
+        self._unwritten_rows = {}
+
+    def close(self):
+        self.flush()
+
+    @staticmethod
+    def _save(path, save, *args, **kwargs):
+        """
+        Write a .npy or .npz file and make it durable.
+        """
+        with open(path, "wb") as f:
+            save(f, *args, **kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _append_log(self, name, entries):
+        """
+        Append entries to a log after its last flushed line; returns its new length.
+        """
+        size = self._log_bytes[name]
+        if not entries:
+            return size
+        with open(os.path.join(self.path, f"{name}.log"), "ab") as f:
+            f.truncate(size)
+            f.write("".join(json.dumps(entry) + "\n" for entry in entries).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
+
+    def _aggregate_path(self, name, generation):
+        return os.path.join(self.path, f"{name}.{generation}.npy")
+
+    def _delta_path(self, generation):
+        return os.path.join(self.path, f"delta.{generation}.npz")
+
+    def _fake_counts(self, scores, threshold):
+        """
+        Rows of score histograms above a threshold, resolved down to the 0.01 grid.
+        """
+        step = int(np.clip(np.searchsorted(self.SCORE_EDGES, threshold, side="right") - 1, 0, len(self.SCORE_EDGES) - 1))
+        return scores[..., step + 1:].sum(axis=-1)
+
+    def products(self, prefix=""):
+        """
+        Stored product names starting with prefix, sorted.
+        """
+        self._sync()
+        with self._lock:
+            if self._sorted_names is None:
+                self._sorted_names = sorted(self.names)
+            names = self._sorted_names
+        start = bisect.bisect_left(names, prefix)
+        stop = bisect.bisect_left(names, prefix + "\U0010ffff") if prefix else len(names)
+        return names[start:stop]
+
+    def product(self, name, threshold=0.7):
+        """
+        Aggregates of one product, or None when it was never stored.
+
+        Returns:
+            dict: reviews, fake, fake_rate (0..1), avg_rating, verified, price,
+                price_band and flags (count per flag label).
+        """
+        self._sync()
+        pid = self._ids.get(name)
+        if pid is None:
+            return None
+        aggregates = self._aggregates
+        scores = aggregates["product_scores"][pid]
+        ratings = aggregates["product_ratings"][pid]
+        reviews = int(scores.sum())
+        fake = int(self._fake_counts(scores, threshold))
+        rated = int(ratings[1:].sum())
+        price = float(aggregates["product_price"][pid])
+        band = int(price_bands([price])[0])
+        flags = aggregates["product_flags"][pid]
+        return {
+            "reviews": reviews,
+            "fake": fake,
+            "fake_rate": fake / reviews if reviews else 0.0,
+            "avg_rating": float(ratings @ np.arange(6)) / rated if rated else None,
+            "verified": int(aggregates["product_verified"][pid]),
+            "price": None if np.isnan(price) else price,
+            "price_band": PRICE_LABELS[band] if band >= 0 else None,
+            "flags": {label: int(flags[bit]) for bit, label in enumerate(self.flag_labels) if flags[bit]},
+        }
+
+    def fake_rate(self, name, threshold=0.7):
+        """
+        Share (0..1) of a product's stored reviews scoring above threshold, or None.
+        """
+        product = self.product(name, threshold)
+        return None if product is None else product["fake_rate"]
+
+    def product_table(self, threshold=0.7):
+        """
+        Aggregates of every product.
+
+        Returns:
+            pd.DataFrame: reviews, fake, fake_rate, avg_rating, verified, price
+                and price_band, indexed by product name.
+        """
+        self._sync()
+        with self._lock:
+            count = self._count
+            aggregates = {name: values[:count] for name, values in self._aggregates.items() if name.startswith("product_")}
+            names = list(self.names)
+        reviews = aggregates["product_scores"].sum(axis=1)
+        fake = self._fake_counts(aggregates["product_scores"], threshold)
+        ratings = aggregates["product_ratings"]
+        rated = ratings[:, 1:].sum(axis=1)
+        bands = price_bands(aggregates["product_price"])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            table = pd.DataFrame({
+                "reviews": reviews,
+                "fake": fake,
+                "fake_rate": np.where(reviews > 0, fake / reviews, 0.0),
+                "avg_rating": np.where(rated > 0, ratings @ np.arange(6) / rated, np.nan),
+                "verified": aggregates["product_verified"],
+                "price": aggregates["product_price"],
+                "price_band": pd.Categorical.from_codes(bands, PRICE_LABELS),
+            }, index=pd.Index(names, name="product_name"))
+        return table
+
+    def price_band_rates(self, threshold=0.7):
+        """
+        Fake rate of the stored reviews in each price band, as in the notebook's Price_Bin chart.
+
+        Returns:
+            pd.DataFrame: reviews, fake and fake_rate, indexed by price_band.
+        """
+        self._sync()
+        scores = np.array(self._aggregates["band_scores"])
+        reviews = scores.sum(axis=1)
+        fake = self._fake_counts(scores, threshold)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return pd.DataFrame({
+                "reviews": reviews,
+                "fake": fake,
+                "fake_rate": np.where(reviews > 0, fake / reviews, 0.0),
+            }, index=pd.CategoricalIndex(PRICE_LABELS, categories=PRICE_LABELS, ordered=True, name="price_band"))
+
+    def reviews(self, name):
+        """
+        A product's stored reviews, read from its memory-mapped partition.
+
+        Returns:
+            pd.DataFrame: text, the RECORD fields but text_end and flags
+                (labels joined by ", "), in the order they were added; None
+                for unknown products.
+        """
+        self._sync()
+        with self._lock:
+            pid = self._ids.get(name)
+            if pid is None:
+                return None
+            rows = int(self._aggregates["product_scores"][pid].sum()) - self._unwritten_rows.get(pid, 0)
+        partition = self._partition(pid)
+        records = np.empty(0, dtype=self.RECORD)
+        data = b""
+        if rows:
+            records = np.memmap(os.path.join(partition, "records.bin"), dtype=self.RECORD, mode="r", shape=(rows,))
+            with open(os.path.join(partition, "text.bin"), "rb") as f:
+                data = f.read(int(records["text_end"][-1]))
+        frame = {"text": list(StringColumn(data, np.concatenate([[0], records["text_end"]])))}
+        for column in self.RECORD.names[:-1]:
+            frame[column] = records[column]
+        labels = self.flag_labels
+        frame["flags"] = [
+            ", ".join(label for bit, label in enumerate(labels) if mask >> bit & 1)
+            for mask in frame["flag_mask"].tolist()
+        ]
+        return pd.DataFrame(frame)
+
+    @property
+    def batches(self):
+        """
+        Ids of the batches added so far.
+        """
+        self._sync()
+        return frozenset(self._batches)
+
+    def __contains__(self, name):
+        self._sync()
+        return name in self._ids
+
+    def __len__(self):
+        self._sync()
+        return len(self.names)
@@ -1,24 +1,74 @@
 import pandas as pd
 import numpy as np
-import re
-from io import StringIO
 import random
-import string
+from collections import Counter
+from components.Metrics import METRICS
+from components.PatternMatcher import PatternMatcher
+from components.ReviewBatch import ReviewBatch
+from components.ReviewModel import ReviewModel, weak_labels
+from components.SentimentScorer import SentimentScorer
+from components.ScoredResult import ScoredResult, iter_csv
 
 class ReviewAnalyzer:
     """
     A class for analyzing product reviews to determine authenticity.
     
-    In a real implementation, this would use NLP models like BERT or
-    other machine learning algorithms trained on labeled fake/real reviews.
+    Scores come from a trained ReviewModel when one is given, and from
+    pattern and metadata heuristics otherwise. Flags always come from the
+    heuristics, so they explain a score whichever backend produced it.
     """
     
-    def __init__(self):
+    # Flag label reported for each entry of fake_patterns, by index
+    PATTERN_FLAGS = [
+        "Excessive punctuation",
+        "Hyperbolic language",
+        "Unrealistic praise",
+        "Exaggerated impact",
+        "Incentivized review",
+        "Incentivized review",
+    ]
+    
+    # Flags raised from review metadata rather than text patterns
+    METADATA_FLAGS = ["Unverified purchase", "New reviewer", "No helpful votes", "Very short review"]
+    
+    # Flag raised for reviews in a near-duplicate cluster of at least this size
+    DUPLICATE_FLAG = "Near-duplicate text"
+    DUPLICATE_CLUSTER_SIZE = 3
+    
+    # Flags raised from the product's review timeline when a TemporalIndex is set
+    BURST_FLAG = "Review burst"
+    REPEAT_REVIEWER_FLAG = "Repeat reviewer"
+    REPEAT_REVIEWER_COUNT = 3
+    
+    # Bump when the scoring heuristics change so cached scores are not reused
+    SCORER_VERSION = "1"
+    
+    # Columns expected by analyze_batch (one row per review)
+    BATCH_COLUMNS = ["text", "rating", "verified_purchase", "helpful_votes", "total_reviews"]
+    
+    def __init__(self, cache=None, model=None, duplicates=None, temporal=None):
         """
         Initialize the ReviewAnalyzer.
         
-        In a real implementation, this would load ML models and NLP resources.
+        Args:
+            cache (ScoreCache): Optional cache consulted before scoring a review.
+            model (ReviewModel or str): Optional trained model, or the path of
+                a saved one, loaded on first use.
+            duplicates (DuplicateIndex): Optional index that every analyzed
+                review is added to; reviews in a large enough near-duplicate
+                cluster get the DUPLICATE_FLAG. Scores are not affected.
+            temporal (TemporalIndex): Optional index of the product's review
+                dates, ratings and reviewers that every analyzed review is
+                added to; reviews in a burst get the BURST_FLAG and reviewers
+                with REPEAT_REVIEWER_COUNT reviews the REPEAT_REVIEWER_FLAG.
+                Scores are not affected.
         """
+        self.cache = cache
+        self._model = model
+        self.duplicates = duplicates
+        self.temporal = temporal
+        self._sentiment = None
+        
         # Placeholder for demonstration - in a real implementation these would be ML models
         self.fake_patterns = [
             r'!!+',  # Multiple exclamation marks
@@ -28,64 +78,452 @@ class ReviewAnalyzer:
             r'in exchange for .{0,40}review',  # Incentivized review disclosure
             r'received .{0,20}free',  # Free product
         ]
-        self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.fake_patterns]
+        # All patterns are matched in a single scan shared by scoring and flags
+        self.matcher = PatternMatcher(self.fake_patterns, self.PATTERN_FLAGS)
+        self.compiled_patterns = self.matcher.compiled
+    
+    def add_pattern_pack(self, patterns, label):
+        """
+        Add user-supplied suspicious patterns that share one flag label.
+        
+        Args:
+            patterns (list): Regular expression strings.
+            label (str): Flag reported when any of the patterns matches.
+        """
+        patterns = list(patterns)
+        self.fake_patterns.extend(patterns)
+        self.matcher.add_patterns(patterns, [label] * len(patterns))
+    
+    @property
+    def model(self):
+        """
+        The trained ReviewModel, or None when scoring with heuristics.
+        """
+        if isinstance(self._model, str):
+            self._model = ReviewModel.load(self._model)
+        return self._model
+    
+    @property
+    def sentiment(self):
+        """
+        The SentimentScorer, or None when the VADER lexicon is not installed.
+        """
+        if self._sentiment is None:
+            try:
+                self._sentiment = SentimentScorer()
+            except LookupError:
+                self._sentiment = False
+        return self._sentiment or None
+    
+    @property
+    def version(self):
+        """
+        Identifier of the scoring backend and pattern set, for cache keys.
+        """
+        scorer = self.model.version if self.model is not None else self.SCORER_VERSION
+        return f"{scorer}:{self.matcher.version}"
+    
+    @property
+    def flag_labels(self):
+        """
+        Every flag this analyzer can raise, in bitmask order.
+        """
+        labels = []
+        extra = [self.DUPLICATE_FLAG] if self.duplicates is not None else []
+        if self.temporal is not None:
+            extra += [self.BURST_FLAG, self.REPEAT_REVIEWER_FLAG]
+        for label in self.matcher.labels + self.METADATA_FLAGS + extra:
+            if label not in labels:
+                labels.append(label)
+        if len(labels) > 64:
+            raise ValueError("At most 64 distinct flag labels fit in a flag bitmask")
+        return labels
     
     def analyze_reviews(self, reviews, threshold=0.7):
         """
         Analyze a list of reviews to determine authenticity.
         
         Args:
-            reviews (list): List of review dictionaries.
+            reviews (ReviewBatch or list): Reviews, as a batch or review dictionaries.
             threshold (float): Confidence threshold for fake detection.
             
         Returns:
-            dict: Results of the analysis including:
+            ScoredResult: Results of the analysis, indexable by:
                 - real_percentage: Percentage of reviews considered authentic
                 - fake_percentage: Percentage of reviews considered fake
                 - reviews: Detailed information on each review
                 - export_csv: CSV string of detailed results
+            Use with_threshold() on it to re-slice without rescoring.
+        """
+        with METRICS.timer("analyze"):
+            with METRICS.timer("analyze.prepare"):
+                batch = ReviewBatch.from_reviews(reviews)
+            with METRICS.timer("analyze.score"):
+                fake_scores, flag_masks = self._score_reviews(batch)
+            with METRICS.timer("analyze.duplicates"):
+                flag_masks |= self._duplicate_masks(batch.columns["text"])
+            with METRICS.timer("analyze.temporal"):
+                flag_masks |= self._temporal_masks(batch)
+            with METRICS.timer("analyze.result"):
+                scored = batch.with_scores(fake_scores, flag_masks, self.flag_labels)
+                result = ScoredResult(scored, fake_scores, threshold)
+        
+        METRICS.count("reviews_analyzed", len(batch))
+        return result
+    
+    def _score_reviews(self, reviews, rng=None):
+        """
+        Score and flag each review.
+        
+        Args:
+            reviews (ReviewBatch or list): Reviews to score.
+            rng (random.Random): Source of the heuristics' random jitter;
+                the random module's global generator by default.
+            
+        Returns:
+            tuple: (fake probabilities, uint64 flag bitmasks over flag_labels)
         """
-        # In a real implementation, this would use ML models for prediction
-        analyzed_reviews = []
-        fake_count = 0
-        
-        for review in reviews:
-            # Calculate a fake probability score in a real implementation
-            # This would be done with NLP models
-            fake_score = self._calculate_fake_probability(review)
-            is_fake = fake_score > threshold
-            
-            if is_fake:
-                fake_count += 1
-                
-            analyzed_reviews.append({
-                "text": review["text"],
-                "rating": review["rating"],
-                "date": review["date"],
-                "verified_purchase": review["verified_purchase"],
-                "helpful_votes": review["helpful_votes"],
-                "reviewer": review["reviewer"],
-                "authenticity_score": 1 - fake_score,
-                "is_fake": is_fake,
-                "flags": self._get_flags(review, fake_score)
-            })
-        
-        # Calculate percentages
-        total = len(reviews)
-        fake_percentage = round((fake_count / total) * 100) if total > 0 else 0
-        real_percentage = 100 - fake_percentage
-        
-        # Create CSV for export
-        csv_data = self._create_export_csv(analyzed_reviews)
+        fake_scores = np.empty(len(reviews))
+        flag_masks = np.zeros(len(reviews), dtype=np.uint64)
+        bits = {label: 1 << bit for bit, label in enumerate(self.flag_labels)}
+        cache = self.cache
+        version = self.version
+        
+        # The model scores the whole batch in one pass; cache hits still skip
+        # the per-review pattern scan
+        model_scores = None
+        if self.model is not None:
+            with METRICS.timer("analyze.model"):
+                model_scores = self.model.predict_proba(ReviewBatch.from_reviews(reviews).to_frame())
+        
+        # Tallied locally and recorded once per batch
+        pattern_hits = Counter()
+        cache_hits = 0
+        
+        for index, review in enumerate(reviews):
+            cached = None
+            if cache is not None:
+                key = cache.key(review, version)
+                cached = cache.get(key)
+            
+            if cached is not None:
+                fake_score, flags = cached
+                cache_hits += 1
+            else:
+                matches = self.matcher.match(review["text"])
+                if matches:
+                    pattern_hits.update(matches)
+                if model_scores is not None:
+                    fake_score = float(model_scores[index])
+                else:
+                    fake_score = self._calculate_fake_probability(review, matches, rng)
+                flags = self._get_flags(review, fake_score, matches)
+                if cache is not None:
+                    cache.put(key, fake_score, flags)
+            
+            fake_scores[index] = fake_score
+            mask = 0
+            for flag in flags:
+                mask |= bits[flag]
+            flag_masks[index] = mask
+        
+        if cache is not None:
+            cache.flush()
+            METRICS.count("cache_hits", cache_hits)
+            METRICS.count("cache_misses", len(reviews) - cache_hits)
+        self._count_pattern_hits(pattern_hits.items())
+        
+        return fake_scores, flag_masks
+    
+    def analyze_batch(self, data, threshold=0.7, seed=None):
+        """
+        Analyze a columnar batch of reviews with array operations.
+        
+        Each pattern is evaluated once per review into a boolean hit matrix
+        that is shared by scoring and flag generation, and all metadata
+        adjustments are computed over whole columns. With a model, scores
+        come from one sparse batch prediction and no jitter is added. The
+        sentiment stage adds the EDA notebook's sentiment and rule label.
+        
+        The ScoreCache is not consulted: hashing every row into a cache
+        key would cost about as much as scoring it here. Use
+        analyze_reviews when repeated reviews should reuse cached scores.
+        
+        Args:
+            data: pandas DataFrame, ReviewBatch, Arrow table or mapping of
+                column name to array-like holding the BATCH_COLUMNS.
+            threshold (float): Confidence threshold for fake detection.
+            seed (int): Optional seed for the random jitter of the heuristics.
+            
+        Returns:
+            dict: Results of the analysis including:
+                - real_percentage: Percentage of reviews considered authentic
+                - fake_percentage: Percentage of reviews considered fake
+                - scores: DataFrame with authenticity_score, is_fake,
+                  flags (comma separated), sentiment and rule_fake
+                  aligned with the input rows, plus burst_size and
+                  reviewer_reviews when a TemporalIndex is set
+        """
+        timer = METRICS.timer
+        with timer("analyze_batch"):
+            frame = self._to_frame(data)
+            with timer("analyze_batch.patterns"):
+                text = frame["text"].fillna("").astype(str).str.lower().to_numpy()
+                hits = self._pattern_matrix(text)
+            
+            with timer("analyze_batch.score"):
+                if self.model is not None:
+                    fake_scores = self.model.predict_proba(frame)
+                else:
+                    fake_scores = self._score_batch(frame, text, hits, np.random.default_rng(seed))
+            with timer("analyze_batch.temporal"):
+                temporal = self.temporal_features(frame) if self.temporal is not None else None
+            with timer("analyze_batch.flags"):
+                flags = self._flag_batch(frame, text, hits, temporal)
+            with timer("analyze_batch.sentiment"):
+                features = self.sentiment_features(frame)
+        
+        METRICS.count("batch_reviews_analyzed", len(frame))
+        self._count_pattern_hits(enumerate(hits.sum(axis=0).tolist()))
+        is_fake = fake_scores > threshold
+        
+        total = len(frame)
+        fake_percentage = round((int(is_fake.sum()) / total) * 100) if total > 0 else 0
+        
+        scores = pd.DataFrame({
+            "authenticity_score": 1 - fake_scores,
+            "is_fake": is_fake,
+            "flags": flags
+        }, index=frame.index)
+        scores["sentiment"] = features["sentiment"]
+        scores["rule_fake"] = features["rule_fake"]
+        if temporal is not None:
+            scores["burst_size"] = temporal["burst_size"].to_numpy()
+            scores["reviewer_reviews"] = temporal["reviewer_reviews"].to_numpy()
         
         return {
-            "real_percentage": real_percentage,
+            "real_percentage": 100 - fake_percentage,
             "fake_percentage": fake_percentage,
-            "reviews": analyzed_reviews,
-            "export_csv": csv_data
+            "scores": scores
         }
     
-    def _calculate_fake_probability(self, review):
+    def _count_pattern_hits(self, counts):
+        """
+        Record pattern hits per flag label from (pattern index, hits) pairs.
+        """
+        per_label = Counter()
+        for index, hits in counts:
+            per_label[self.matcher.labels[index]] += hits
+        for label, hits in per_label.items():
+            if hits:
+                METRICS.count("pattern_hits", hits, label=label)
+    
+    def sentiment_features(self, data):
+        """
+        Sentiment and word-count features of a batch, from the EDA notebook.
+        
+        Replaces the notebook's row-by-row polarity_scores and
+        classify_review with whole-column operations; sentiment is cached
+        per distinct review text.
+        
+        Args:
+            data: Batch input accepted by analyze_batch.
+            
+        Returns:
+            pd.DataFrame: Aligned with the input rows:
+                - sentiment: VADER compound score, NaN without the lexicon
+                - word_count: Words in the cleaned text
+                - rule_fake: The notebook's classify_review label
+        """
+        frame = self._to_frame(data)
+        texts = frame["text"]
+        if self.sentiment is not None:
+            sentiment = self.sentiment.score(texts)
+        else:
+            sentiment = np.full(len(frame), np.nan)
+        
+        return pd.DataFrame({
+            "sentiment": sentiment,
+            "word_count": SentimentScorer.clean(texts).str.split().str.len().to_numpy(),
+            "rule_fake": weak_labels(frame, None if self.sentiment is None else sentiment)
+        }, index=frame.index)
+    
+    def temporal_features(self, data):
+        """
+        Add a batch to the TemporalIndex and read its timeline features.
+        
+        The batch is indexed first, so its own reviews count toward bursts
+        and reviewer totals. Batches without date or reviewer columns are
+        treated as having unknown dates and reviewers.
+        
+        Args:
+            data: Batch input accepted by analyze_batch.
+            
+        Returns:
+            pd.DataFrame: Aligned with the input rows:
+                - burst_size: Reviews with the same rating within the
+                  index's window, 0 when the date is unknown
+                - burst: Whether the review is part of a burst
+                - reviewer_reviews: Reviews by the same reviewer so far
+        """
+        frame = self._to_frame(data)
+        blank = np.full(len(frame), "", dtype=object)
+        dates = frame["date"].to_numpy(dtype=object) if "date" in frame.columns else blank
+        reviewers = frame["reviewer"].fillna("").to_numpy(dtype=object) if "reviewer" in frame.columns else blank
+        return pd.DataFrame(self._timeline(dates, frame["rating"].to_numpy(), reviewers), index=frame.index)
+    
+    def _timeline(self, dates, ratings, reviewers):
+        """
+        Index reviews in the TemporalIndex and return their features as arrays.
+        """
+        days = self.temporal.add(dates, ratings, reviewers)
+        return {
+            "burst_size": self.temporal.burst_sizes(days, ratings),
+            "burst": self.temporal.bursts(days, ratings),
+            "reviewer_reviews": self.temporal.reviewer_counts(reviewers),
+        }
+    
+    def _temporal_masks(self, batch):
+        """
+        BURST_FLAG and REPEAT_REVIEWER_FLAG bits of each review, zero when no index is set.
+        """
+        if self.temporal is None:
+            return np.zeros(len(batch), dtype=np.uint64)
+        columns = batch.columns
+        reviewers = list(columns["reviewer"])
+        features = self._timeline(list(columns["date"]), columns["rating"], reviewers)
+        labels = self.flag_labels
+        burst = np.uint64(1 << labels.index(self.BURST_FLAG))
+        repeat = np.uint64(1 << labels.index(self.REPEAT_REVIEWER_FLAG))
+        masks = np.where(features["burst"], burst, np.uint64(0))
+        return masks | np.where(features["reviewer_reviews"] >= self.REPEAT_REVIEWER_COUNT, repeat, np.uint64(0))
+    
+    def _to_frame(self, data):
+        """
+        Normalize batch input to a DataFrame holding the BATCH_COLUMNS.
+        
+        Args:
+            data: DataFrame, Arrow table or mapping of column arrays
+            
+        Returns:
+            pd.DataFrame: Batch data
+        """
+        if isinstance(data, pd.DataFrame):
+            frame = data
+        elif isinstance(data, ReviewBatch):
+            frame = data.to_frame()
+        elif hasattr(data, "to_pandas"):
+            frame = data.to_pandas()
+        else:
+            frame = pd.DataFrame({column: np.asarray(data[column]) for column in self.BATCH_COLUMNS})
+        
+        missing = [column for column in self.BATCH_COLUMNS if column not in frame.columns]
+        if missing:
+            raise ValueError(f"Batch is missing columns: {', '.join(missing)}")
+        return frame
+    
+    def _pattern_matrix(self, texts):
+        """
+        Match every text against all suspicious patterns in one scan each.
+        
+        Args:
+            texts (np.ndarray): Lowercased review texts
+            
+        Returns:
+            np.ndarray: Boolean matrix of shape (len(texts), len(patterns))
+        """
+        return self.matcher.match_matrix(texts)
+    
+    def _score_batch(self, frame, texts, hits, rng):
+        """
+        Vectorized equivalent of _calculate_fake_probability.
+        
+        Args:
+            frame (pd.DataFrame): Batch data
+            texts (np.ndarray): Lowercased review texts
+            hits (np.ndarray): Pattern hit matrix
+            rng (np.random.Generator): Source of the random jitter
+            
+        Returns:
+            np.ndarray: Fake probabilities between 0.05 and 0.95
+        """
+        pattern_score = np.minimum(0.7, hits.sum(axis=1) * 0.15)
+        
+        adjustments = np.zeros(len(frame))
+        adjustments += 0.05 * (frame["helpful_votes"].to_numpy() == 0)
+        adjustments += 0.15 * ~frame["verified_purchase"].to_numpy(dtype=bool)
+        adjustments += 0.1 * (frame["total_reviews"].to_numpy() <= 2)
+        adjustments += 0.05 * (frame["rating"].to_numpy() == 5)
+        adjustments += 0.1 * (self._text_lengths(texts) < 20)
+        
+        random_factor = rng.uniform(-0.1, 0.1, len(frame))
+        
+        return np.clip(pattern_score + adjustments + random_factor, 0.05, 0.95)
+    
+    def _flag_batch(self, frame, texts, hits, temporal=None):
+        """
+        Vectorized equivalent of _get_flags.
+        
+        Args:
+            frame (pd.DataFrame): Batch data
+            texts (np.ndarray): Lowercased review texts
+            hits (np.ndarray): Pattern hit matrix
+            temporal (pd.DataFrame): temporal_features of the batch, if any
+            
+        Returns:
+            np.ndarray: Comma separated flag strings, one per review
+        """
+        # Several patterns can share a label; report each label once
+        masks = {}
+        for i, label in enumerate(self.matcher.labels):
+            masks[label] = masks.get(label, False) | hits[:, i]
+        masks["Unverified purchase"] = ~frame["verified_purchase"].to_numpy(dtype=bool)
+        masks["New reviewer"] = frame["total_reviews"].to_numpy() <= 2
+        masks["No helpful votes"] = frame["helpful_votes"].to_numpy() == 0
+        masks["Very short review"] = self._text_lengths(texts) < 20
+        if self.duplicates is not None:
+            masks[self.DUPLICATE_FLAG] = self._near_duplicates(frame["text"])
+        if temporal is not None:
+            masks[self.BURST_FLAG] = temporal["burst"].to_numpy()
+            masks[self.REPEAT_REVIEWER_FLAG] = temporal["reviewer_reviews"].to_numpy() >= self.REPEAT_REVIEWER_COUNT
+        
+        flags = np.full(len(frame), "", dtype=object)
+        for label, mask in masks.items():
+            flags = flags + np.where(mask, label + ", ", "")
+        return np.array([flag[:-2] for flag in flags], dtype=object)
+    
+    def _near_duplicates(self, texts):
+        """
+        Add texts to the duplicate index and mark those in large clusters.
+        
+        Clusters only grow, so a review flagged once stays flagged; reviews
+        scored before their cluster grew are not revisited.
+        
+        Args:
+            texts (iterable): Review texts, in batch order.
+            
+        Returns:
+            np.ndarray: Boolean mask of near-duplicate reviews.
+        """
+        ids = self.duplicates.add(texts)
+        return self.duplicates.cluster_sizes(ids) >= self.DUPLICATE_CLUSTER_SIZE
+    
+    def _duplicate_masks(self, texts):
+        """
+        DUPLICATE_FLAG bit of each review, zero when no index is set.
+        """
+        if self.duplicates is None:
+            return np.zeros(len(texts), dtype=np.uint64)
+        bit = np.uint64(1 << self.flag_labels.index(self.DUPLICATE_FLAG))
+        return np.where(self._near_duplicates(texts), bit, np.uint64(0))
+    
+    def _text_lengths(self, texts):
+        """
+        Length of each text in an array of strings.
+        """
+        return np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    
+    def _calculate_fake_probability(self, review, matches=None, rng=None):
         """
         Calculate probability that a review is fake.
         
@@ -94,13 +532,18 @@ class ReviewAnalyzer:
         
         Args:
             review (dict): Review data
+            matches (list): Indices of matching patterns, if already known
+            rng (random.Random): Source of the random jitter, if not the
+                random module
             
         Returns:
             float: Probability between 0 and 1 that the review is fake
         """
         # Check for suspicious patterns in text
         text = review["text"].lower()
-        pattern_matches = sum(1 for pattern in self.compiled_patterns if pattern.search(text))
+        if matches is None:
+            matches = self.matcher.match(text)
+        pattern_matches = len(matches)
         
         # Calculate base score from suspicious patterns
         pattern_score = min(0.7, pattern_matches * 0.15)
@@ -129,40 +572,35 @@ class ReviewAnalyzer:
             adjustments += 0.1
             
         # Add randomness for demonstration purposes
-        random_factor = random.uniform(-0.1, 0.1)
+        random_factor = (rng or random).uniform(-0.1, 0.1)
         
         # Combine factors
         final_score = min(0.95, max(0.05, pattern_score + adjustments + random_factor))
         
         return final_score
     
-    def _get_flags(self, review, fake_score):
+    def _get_flags(self, review, fake_score, matches=None):
         """
         Generate flags explaining why a review might be fake.
         
         Args:
             review (dict): Review data
             fake_score (float): Calculated fake probability
+            matches (list): Indices of matching patterns, if already known
             
         Returns:
             list: List of flag strings
         """
         flags = []
         text = review["text"].lower()
+        if matches is None:
+            matches = self.matcher.match(text)
         
-        # Check patterns
-        for i, pattern in enumerate(self.compiled_patterns):
-            if pattern.search(text):
-                if i == 0:
-                    flags.append("Excessive punctuation")
-                elif i == 1:
-                    flags.append("Hyperbolic language")
-                elif i == 2:
-                    flags.append("Unrealistic praise")
-                elif i == 3:
-                    flags.append("Exaggerated impact")
-                elif i == 4 or i == 5:
-                    flags.append("Incentivized review")
+        # Check patterns, reporting each label once
+        for i in matches:
+            label = self.matcher.labels[i]
+            if label not in flags:
+                flags.append(label)
         
         # Check other factors
         if not review["verified_purchase"]:
@@ -189,21 +627,8 @@ class ReviewAnalyzer:
         Returns:
             str: CSV data as string
         """
-        output = StringIO()
-        
-        # Create pandas DataFrame
-        df = pd.DataFrame([{
-            "Review Text": r["text"],
-            "Rating": r["rating"],
-            "Date": r["date"],
-            "Verified Purchase": r["verified_purchase"],
-            "Helpful Votes": r["helpful_votes"],
-            "Reviewer": r["reviewer"],
-            "Authenticity Score": f"{r['authenticity_score']:.2f}",
-            "Is Fake": r["is_fake"],
-            "Flags": ", ".join(r["flags"])
-        } for r in analyzed_reviews])
-        
-        # Write to CSV
-        df.to_csv(output, index=False)
-        return output.getvalue()
\ No newline at end of file
+        rows = ((
+            r["text"], r["rating"], r["date"], r["verified_purchase"], r["helpful_votes"],
+            r["reviewer"], r["authenticity_score"], r["is_fake"], r["flags"]
+        ) for r in analyzed_reviews)
+        return "".join(iter_csv(rows))
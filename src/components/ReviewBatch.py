@@ -0,0 +1,300 @@
+import hashlib
+from collections.abc import Mapping
+import numpy as np
+import pandas as pd
+
+class StringColumn:
+    """
+    Strings stored as one UTF-8 buffer plus an int64 offsets array.
+
+    String i is data[offsets[i]:offsets[i + 1]], so a column costs its
+    encoded size plus 8 bytes per row instead of one Python str per row.
+    """
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, strings):
+        """
+        Build a column from an iterable of strings.
+        """
+        encoded = [str(value).encode("utf-8", "surrogatepass") for value in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return cls(b"".join(encoded), offsets)
+
+    @classmethod
+    def concat(cls, columns):
+        """
+        Join several columns end to end.
+        """
+        offsets = [np.zeros(1, dtype=np.int64)]
+        base = 0
+        for column in columns:
+            offsets.append(column.offsets[1:] - column.offsets[0] + base)
+            base += int(column.offsets[-1] - column.offsets[0])
+        data = b"".join(column.data[column.offsets[0]:column.offsets[-1]] for column in columns)
+        return cls(data, np.concatenate(offsets))
+
+    def slice(self, start, stop):
+        """
+        Column of rows start..stop sharing this column's buffer.
+        """
+        return StringColumn(self.data, self.offsets[start:stop + 1])
+
+    @property
+    def nbytes(self):
+        return int(self.offsets[-1] - self.offsets[0]) + self.offsets.nbytes
+
+    def __reduce__(self):
+        # Pickle only this column's window of a shared buffer (e.g. a shard)
+        start, stop = self.offsets[0], self.offsets[-1]
+        return (StringColumn, (self.data[start:stop], self.offsets - start))
+
+    def __getitem__(self, index):
+        return self.data[self.offsets[index]:self.offsets[index + 1]].decode("utf-8", "surrogatepass")
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+class ReviewBatch:
+    """
+    A compact columnar container of reviews.
+
+    Text fields live in StringColumns and numeric fields in typed NumPy
+    arrays. Once scored, the batch also holds the fake probability of each
+    review and its flags as a uint64 bitmask over flag_labels; labels are
+    only materialized when a review is displayed.
+
+    Indexing and iteration yield ReviewView objects, read-only mappings
+    with the keys of the review dictionaries used elsewhere, so existing
+    callers that index reviews by key keep working.
+    """
+
+    STRING_COLUMNS = ("text", "date", "reviewer")
+    NUMERIC_COLUMNS = {
+        "rating": np.int8,
+        "verified_purchase": np.bool_,
+        "helpful_votes": np.int32,
+        "total_reviews": np.int32,
+        "avg_rating": np.float64,
+        "verified_purchases": np.int32,
+    }
+    HISTORY_COLUMNS = ("total_reviews", "avg_rating", "verified_purchases")
+
+    def __init__(self, columns, fake_scores=None, flag_masks=None, flag_labels=None):
+        """
+        Initialize the ReviewBatch.
+
+        Args:
+            columns (dict): StringColumn for each of STRING_COLUMNS and a
+                typed array for each of NUMERIC_COLUMNS.
+            fake_scores (np.ndarray): Fake probability of each review, once scored.
+            flag_masks (np.ndarray): uint64 flag bitmask of each review, once scored.
+            flag_labels (list): Label of each flag bit.
+        """
+        self.columns = columns
+        self.fake_scores = fake_scores
+        self.flag_masks = flag_masks
+        self.flag_labels = list(flag_labels or [])
+
+    @classmethod
+    def from_reviews(cls, reviews):
+        """
+        Build a batch from review dictionaries.
+
+        Args:
+            reviews (iterable): Review dictionaries in the ReviewScraper format.
+
+        Returns:
+            ReviewBatch: Columnar copy of the reviews.
+        """
+        if isinstance(reviews, ReviewBatch):
+            return reviews
+        reviews = list(reviews)
+
+        columns = {name: StringColumn.from_strings(review[name] for review in reviews) for name in cls.STRING_COLUMNS}
+        for name, dtype in cls.NUMERIC_COLUMNS.items():
+            if name in cls.HISTORY_COLUMNS:
+                values = [review["reviewer_history"][name] for review in reviews]
+            else:
+                values = [review[name] for review in reviews]
+            columns[name] = np.array(values, dtype=dtype)
+        return cls(columns)
+
+    @classmethod
+    def from_frame(cls, frame):
+        """
+        Build a batch from a DataFrame with one column per field.
+
+        Args:
+            frame (pd.DataFrame): e.g. a DatasetLoader batch.
+
+        Returns:
+            ReviewBatch: Columnar copy of the frame.
+        """
+        columns = {name: StringColumn.from_strings(frame[name].fillna("")) for name in cls.STRING_COLUMNS}
+        for name, dtype in cls.NUMERIC_COLUMNS.items():
+            columns[name] = frame[name].to_numpy(dtype=dtype)
+        return cls(columns)
+
+    @classmethod
+    def concat(cls, batches):
+        """
+        Join batches end to end. Scores are kept only when every batch has them.
+        """
+        batches = list(batches)
+        columns = {name: StringColumn.concat([batch.columns[name] for batch in batches]) for name in cls.STRING_COLUMNS}
+        for name in cls.NUMERIC_COLUMNS:
+            columns[name] = np.concatenate([batch.columns[name] for batch in batches])
+
+        if batches and all(batch.fake_scores is not None for batch in batches):
+            labels = batches[0].flag_labels
+            if any(batch.flag_labels != labels for batch in batches):
+                raise ValueError("Cannot concatenate batches scored with different flag labels")
+            return cls(
+                columns,
+                np.concatenate([batch.fake_scores for batch in batches]),
+                np.concatenate([batch.flag_masks for batch in batches]),
+                labels,
+            )
+        return cls(columns)
+
+    def with_scores(self, fake_scores, flag_masks, flag_labels):
+        """
+        Scored copy of this batch sharing its columns.
+
+        Args:
+            fake_scores (array-like): Fake probability of each review.
+            flag_masks (array-like): uint64 flag bitmask of each review.
+            flag_labels (list): Label of each flag bit.
+
+        Returns:
+            ReviewBatch: Batch with authenticity_score and flags available.
+        """
+        return ReviewBatch(
+            self.columns,
+            np.asarray(fake_scores, dtype=float),
+            np.asarray(flag_masks, dtype=np.uint64),
+            flag_labels,
+        )
+
+    def slice(self, start, stop):
+        """
+        Rows start..stop as a batch sharing this batch's buffers.
+        """
+        stop = min(stop, len(self))
+        columns = {}
+        for name, column in self.columns.items():
+            columns[name] = column.slice(start, stop) if isinstance(column, StringColumn) else column[start:stop]
+
+        if self.fake_scores is None:
+            return ReviewBatch(columns)
+        return ReviewBatch(columns, self.fake_scores[start:stop], self.flag_masks[start:stop], self.flag_labels)
+
+    def flags(self, index):
+        """
+        Flag labels of one scored review.
+        """
+        mask = int(self.flag_masks[index])
+        return [label for bit, label in enumerate(self.flag_labels) if mask >> bit & 1]
+
+    def to_frame(self):
+        """
+        DataFrame with one column per field, e.g. for ReviewAnalyzer.analyze_batch.
+        """
+        frame = pd.DataFrame({name: list(self.columns[name]) for name in self.STRING_COLUMNS})
+        for name in self.NUMERIC_COLUMNS:
+            frame[name] = self.columns[name]
+        return frame
+
+    def to_reviews(self):
+        """
+        Plain review dictionaries, for callers that need mutable dicts.
+        """
+        return [dict(view) for view in self]
+
+    def fingerprint(self):
+        """
+        Stable hash of the review contents, for cache keys.
+        """
+        digest = hashlib.sha1()
+        for name in self.STRING_COLUMNS:
+            column = self.columns[name]
+            digest.update((column.offsets - column.offsets[0]).tobytes())
+            digest.update(column.data[column.offsets[0]:column.offsets[-1]])
+        for name in self.NUMERIC_COLUMNS:
+            digest.update(np.ascontiguousarray(self.columns[name]).tobytes())
+        return digest.hexdigest()
+
+    @property
+    def nbytes(self):
+        """
+        Approximate memory held by the batch's buffers.
+        """
+        total = sum(column.nbytes for column in self.columns.values())
+        if self.fake_scores is not None:
+            total += self.fake_scores.nbytes + self.flag_masks.nbytes
+        return int(total)
+
+    def __len__(self):
+        return len(self.columns["rating"])
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return ReviewView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield ReviewView(self, index)
+
+class ReviewView(Mapping):
+    """
+    Read-only, dictionary-compatible view of one review in a ReviewBatch.
+    """
+
+    __slots__ = ("batch", "index")
+
+    FIELDS = ("text", "rating", "date", "verified_purchase", "helpful_votes", "reviewer", "reviewer_history")
+    SCORED_FIELDS = ("authenticity_score", "flags")
+
+    def __init__(self, batch, index):
+        self.batch = batch
+        self.index = index
+
+    def __getitem__(self, key):
+        batch = self.batch
+        index = self.index
+
+        if key in ReviewBatch.STRING_COLUMNS:
+            return batch.columns[key][index]
+        if key == "reviewer_history":
+            return {name: batch.columns[name][index].item() for name in ReviewBatch.HISTORY_COLUMNS}
+        if key in ReviewBatch.NUMERIC_COLUMNS and key not in ReviewBatch.HISTORY_COLUMNS:
+            return batch.columns[key][index].item()
+        if batch.fake_scores is not None:
+            if key == "authenticity_score":
+                return 1 - float(batch.fake_scores[index])
+            if key == "flags":
+                return batch.flags(index)
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield from self.FIELDS
+        if self.batch.fake_scores is not None:
+            yield from self.SCORED_FIELDS
+
+    def __len__(self):
+        return len(self.FIELDS) + (len(self.SCORED_FIELDS) if self.batch.fake_scores is not None else 0)
+
+    def __repr__(self):
+        return f"ReviewView({dict(self)!r})"
@@ -0,0 +1,204 @@
+import re
+from bs4 import BeautifulSoup
+
+# Optional fast parsers; bs4 is always available as the fallback
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+try:
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    CSSSelector = None
+
+BACKENDS = [name for name, available in (
+    ("selectolax", HTMLParser is not None),
+    ("lxml", CSSSelector is not None),
+    ("bs4", True),
+) if available]
+
+FIELDS = ("text", "rating", "date", "verified", "helpful", "reviewer")
+
+# Name of the element whose opening tag starts at the match position
+_TAG_NAME = re.compile(r"<([A-Za-z][\w-]*)")
+
+class ReviewExtractor:
+    """
+    Extracts raw review fields from one site's review pages.
+
+    Selectors are compiled once per extractor. Before parsing, the page is
+    cut down to the review container (found with a plain regex on the raw
+    HTML), so the header, navigation and product details never become DOM
+    nodes. The fastest installed backend is used: selectolax, then lxml,
+    then BeautifulSoup.
+    """
+
+    # Review container, one review, and the selector of each field
+    SITES = {
+        "amazon": {
+            "container": r'id=["\']cm_cr-review_list["\']',
+            "review": "div[data-hook=review]",
+            "text": "span[data-hook=review-body]",
+            "rating": "i[data-hook=review-star-rating], i[data-hook=cmps-review-star-rating]",
+            "date": "span[data-hook=review-date]",
+            "verified": "span[data-hook=avp-badge]",
+            "helpful": "span[data-hook=helpful-vote-statement]",
+            "reviewer": "span.a-profile-name",
+        },
+        "bestbuy": {
+            "container": r'class=["\'][^"\']*\breviews-list\b',
+            "review": "li.review-item",
+            "text": "div.ugc-review-body",
+            "rating": "div.c-ratings-reviews p.visually-hidden",
+            "date": "time.submission-date",
+            "verified": "div.ugc-verified-purchase, span.ugc-verified-purchase",
+            "helpful": "button.feedback-display-helpful span",
+            "reviewer": "div.ugc-author strong",
+        },
+        "walmart": {
+            "container": r'data-testid=["\']reviews-section["\']',
+            "review": "[itemprop=review]",
+            "text": "[itemprop=reviewBody]",
+            "rating": "[itemprop=ratingValue]",
+            "date": "[itemprop=datePublished]",
+            "verified": "[data-testid=verified-purchase]",
+            "helpful": "[data-testid=helpful-count]",
+            "reviewer": "[itemprop=author]",
+        },
+    }
+
+    def __init__(self, site, backend=None):
+        """
+        Initialize the ReviewExtractor.
+
+        Args:
+            site (str): Site layout key in SITES.
+            backend (str): "selectolax", "lxml" or "bs4". Defaults to the
+                fastest installed backend.
+        """
+        if backend is None:
+            backend = BACKENDS[0]
+        if backend not in BACKENDS:
+            raise ValueError(f"Parser backend '{backend}' is not installed")
+
+        self.site = site
+        self.backend = backend
+        self.selectors = self.SITES[site]
+        self._container = re.compile(self.selectors["container"])
+
+        if backend == "lxml":
+            self._compiled = {key: CSSSelector(self.selectors[key]) for key in ("review",) + FIELDS}
+
+    def extract(self, html):
+        """
+        Extract the raw fields of every review on a page.
+
+        Args:
+            html (str): Page HTML.
+
+        Returns:
+            list: One dict per review mapping each of FIELDS to its text.
+        """
+        html = self._review_subtree(html)
+        if not html:
+            return []
+        if self.backend == "selectolax":
+            return self._extract_selectolax(html)
+        if self.backend == "lxml":
+            return self._extract_lxml(html)
+        return self._extract_bs4(html)
+
+    def _review_subtree(self, html):
+        """
+        Cut the page down to the review container element.
+
+        The container runs from its opening tag to the end tag that closes
+        it, counting nested tags of the same name. Falls back to the whole
+        page when the container is not found, and to the rest of the page
+        when it is never closed (e.g. a truncated response).
+        """
+        match = self._container.search(html)
+        if match is None:
+            return html
+        start = html.rfind("<", 0, match.start())
+        if start < 0:
+            return html
+        tag = _TAG_NAME.match(html, start)
+        if tag is None:
+            return html[start:]
+        depth = 0
+        for element in re.compile(rf"<(/?){tag.group(1)}\b[^>]*>", re.IGNORECASE).finditer(html, start):
+            if element.group(1):
+                depth -= 1
+                if depth == 0:
+                    return html[start:element.end()]
+            else:
+                depth += 1
+        return html[start:]
+
+    def _extract_selectolax(self, html):
+        """
+        Extract reviews with selectolax (lexbor CSS engine).
+        """
+        tree = HTMLParser(html)
+        reviews = []
+        for node in tree.css(self.selectors["review"]):
+            fields = {}
+            for field in FIELDS:
+                match = node.css_first(self.selectors[field])
+                if match is None:
+                    fields[field] = ""
+                else:
+                    attributes = match.attributes
+                    fields[field] = attributes.get("content") or attributes.get("datetime") or _clean(match.text(separator=" "))
+            reviews.append(fields)
+        return reviews
+
+    def _extract_lxml(self, html):
+        """
+        Extract reviews with lxml and the precompiled XPath selectors.
+        """
+        root = lxml.html.fromstring(html)
+        compiled = self._compiled
+        reviews = []
+        for node in compiled["review"](root):
+            fields = {}
+            for field in FIELDS:
+                matches = compiled[field](node)
+                if not matches:
+                    fields[field] = ""
+                else:
+                    match = matches[0]
+                    fields[field] = match.get("content") or match.get("datetime") or _clean(" ".join(match.itertext()))
+            reviews.append(fields)
+        return reviews
+
+    def _extract_bs4(self, html):
+        """
+        Extract reviews with BeautifulSoup.
+        """
+        parser = "lxml" if lxml is not None else "html.parser"
+        soup = BeautifulSoup(html, parser)
+        reviews = []
+        for node in soup.select(self.selectors["review"]):
+            fields = {}
+            for field in FIELDS:
+                match = node.select_one(self.selectors[field])
+                if match is None:
+                    fields[field] = ""
+                else:
+                    fields[field] = match.get("content") or match.get("datetime") or _clean(match.get_text(" "))
+            reviews.append(fields)
+        return reviews
+
+def _clean(text):
+    """
+    Collapse whitespace so every backend returns identical strings.
+    """
+    return " ".join(text.split())
@@ -0,0 +1,304 @@
+import os
+import numpy as np
+import pandas as pd
+from components.ReviewBatch import ReviewBatch, StringColumn
+
+# Optional dependency, only needed for Parquet output
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+class ReviewGenerator:
+    """
+    Seeded, vectorized generator of synthetic reviews for load tests.
+
+    A whole chunk of reviews is drawn with array operations: review
+    classes, ratings, reviewer history and dates are NumPy draws, and texts
+    are assembled from templates and phrase fragments with elementwise
+    string concatenation. Chunk i is drawn from SeedSequence([seed, i]),
+    so a corpus depends only on the seed and the chunk size. Streaming a
+    10M-row corpus to disk therefore yields the same file every time, and
+    the cost is dominated by writing it.
+
+    Each review belongs to one of CLASSES. A share of the texts
+    (template_rate) are the mock templates with a random "[1234]" suffix,
+    as in ReviewScraper._get_mock_reviews; the rest are composed from
+    FRAGMENTS. A share of all reviews (duplicate_rate) then copies the text
+    of another review in the chunk verbatim. Suspicious reviews are
+    partly dated inside a few short bursts, as in review campaigns.
+    """
+
+    CLASSES = ["positive", "negative", "suspicious"]
+
+    # Whole review texts, shared with ReviewScraper._get_mock_reviews
+    TEMPLATES = {
+        "positive": [
+            "This product exceeded my expectations! The quality is outstanding and it works exactly as described.",
+            "I've been using this for a month now and I'm very satisfied with my purchase. Highly recommended!",
+            "Great value for the price. This product does everything I need it to do and more.",
+            "I bought this as a gift for my husband and he absolutely loves it. Works perfectly!",
+            "The customer service was excellent and the product arrived earlier than expected. Very happy!"
+        ],
+        "negative": [
+            "Don't waste your money on this product. It broke after just a week of light use.",
+            "The quality is much lower than advertised. I'm very disappointed with this purchase.",
+            "This product doesn't work as described. I've tried everything but can't get it to function properly.",
+            "I received a defective item and the company wouldn't refund me. Terrible experience!",
+            "Save your money and look elsewhere. This product is cheaply made and not worth the price."
+        ],
+        "suspicious": [
+            "Best product ever!!!! Changed my life!!!! Will buy again and again!!!! Five stars!!!!!",
+            "I received this product for free in exchange for my honest review. It's amazing and perfect in every way!",
+            "Just received this amazing product today and it's already the best purchase I've ever made!!",
+            "WOW!!! This is INCREDIBLE!!! Cannot believe how PERFECT this is!!!! BUY IT NOW!!!!",
+            "This product cured all my problems! It's the most incredible invention of the century! Life-changing!!!"
+        ],
+    }
+
+    # Opening, middle and closing phrases combined into composed texts
+    FRAGMENTS = {
+        "positive": [
+            ["Solid purchase.", "Really pleased with this.", "Works well.", "Good quality overall.", "Happy with it."],
+            ["Setup took a few minutes", "It feels sturdy", "Battery life is better than I hoped",
+             "It does what the listing says", "My family uses it every day"],
+            ["and I would buy it again.", "for the price.", "so far.", "after two weeks of use.", "without any issues."],
+        ],
+        "negative": [
+            ["Not impressed.", "Disappointing.", "Would not recommend.", "Poor quality.", "Returned it."],
+            ["It stopped working", "The material feels cheap", "It arrived scratched",
+             "Support never answered", "The size is wrong"],
+            ["after a few days.", "right out of the box.", "despite careful use.", "twice in a month.", "and the refund took weeks."],
+        ],
+        "suspicious": [
+            ["AMAZING!!!", "Best ever!!", "Perfect product!!!", "Life-changing!!", "WOW!!!"],
+            ["Everyone must buy this", "I received it free and it is perfect", "Nothing else comes close",
+             "Five stars is not enough", "Changed my life completely"],
+            ["BUY NOW!!!", "!!!!!", "highly highly recommend!!!", "you won't regret it!!!", "best purchase ever!!"],
+        ],
+    }
+
+    # Reviewer behaviour per class: mean reviews written, share of verified
+    # purchases, mean helpful votes and the mean and spread of their ratings
+    HISTORY = {
+        "positive": {"total_reviews": 12.0, "verified_rate": 0.85, "helpful_votes": 4.0, "avg_rating": (4.2, 0.5)},
+        "negative": {"total_reviews": 12.0, "verified_rate": 0.85, "helpful_votes": 6.0, "avg_rating": (2.8, 0.8)},
+        "suspicious": {"total_reviews": 1.5, "verified_rate": 0.3, "helpful_votes": 0.3, "avg_rating": (4.9, 0.1)},
+    }
+
+    # Rating range (inclusive) per class
+    RATINGS = {"positive": (4, 5), "negative": (1, 2), "suspicious": (5, 5)}
+
+    FORMATS = ("csv", "jsonl", "parquet")
+
+    def __init__(self, seed=None, class_mix=(0.4, 0.4, 0.2), template_rate=0.5, duplicate_rate=0.05,
+                 history=None, start="2023-01-01", end="2023-12-31", bursts=3, burst_rate=0.5, burst_days=3):
+        """
+        Initialize the ReviewGenerator.
+
+        Args:
+            seed (int): Seed of the corpus. Drawn at random when omitted;
+                the value used is kept in self.seed.
+            class_mix (tuple): Probability of each of CLASSES.
+            template_rate (float): Share of texts taken from TEMPLATES.
+            duplicate_rate (float): Share of reviews copying another
+                review's text verbatim.
+            history (dict): Per-class overrides of HISTORY entries.
+            start (str): First review date (ISO).
+            end (str): Last review date (ISO).
+            bursts (int): Number of burst windows for suspicious reviews.
+            burst_rate (float): Share of suspicious reviews dated in a burst.
+            burst_days (int): Length of each burst window in days.
+        """
+        class_mix = np.asarray(class_mix, dtype=float)
+        if len(class_mix) != len(self.CLASSES) or class_mix.min() < 0 or class_mix.sum() <= 0:
+            raise ValueError(f"class_mix needs one non-negative weight per class: {self.CLASSES}")
+
+        self.seed = int(np.random.SeedSequence(seed).entropy)
+        self.class_mix = class_mix / class_mix.sum()
+        self.template_rate = template_rate
+        self.duplicate_rate = duplicate_rate
+        self.history = {name: dict(values, **(history or {}).get(name, {})) for name, values in self.HISTORY.items()}
+        self.start = np.datetime64(start, "D")
+        self.days = int((np.datetime64(end, "D") - self.start).astype(int)) + 1
+        self.burst_rate = burst_rate
+        self.burst_days = burst_days
+
+        # Burst windows are fixed for the whole corpus, not per chunk
+        rng = np.random.default_rng(np.random.SeedSequence([self.seed, 2 ** 32]))
+        self.burst_starts = rng.integers(0, max(1, self.days - burst_days + 1), bursts)
+
+        # Every date and template suffix as a string, indexed by the draws
+        self._date_strings = np.datetime_as_string(self.start + np.arange(self.days), unit="D").astype(object)
+        self._suffixes = (" [" + np.arange(1000, 10000).astype(str).astype(object) + "]")
+        self._templates = [np.array(self.TEMPLATES[name], dtype=object) for name in self.CLASSES]
+        self._fragments = [[np.array(part, dtype=object) for part in self.FRAGMENTS[name]] for name in self.CLASSES]
+
+    def arrays(self, size, index=0):
+        """
+        Draw one chunk of reviews as column arrays.
+
+        Args:
+            size (int): Number of reviews.
+            index (int): Chunk number; chunks with different numbers are
+                independent.
+
+        Returns:
+            dict: An array per ReviewBatch field (text, date and reviewer as
+            object arrays of str), plus label (class name) and is_fake.
+        """
+        rng = np.random.default_rng(np.random.SeedSequence([self.seed, index]))
+        classes = rng.choice(len(self.CLASSES), size, p=self.class_mix).astype(np.int8)
+
+        columns = {
+            "text": self._texts(rng, classes),
+            "rating": np.empty(size, dtype=np.int8),
+            "date": self._dates(rng, classes),
+            "verified_purchase": np.empty(size, dtype=bool),
+            "helpful_votes": np.empty(size, dtype=np.int32),
+            "reviewer": "User" + rng.integers(1000, 10 ** 7, size).astype(str).astype(object),
+            "total_reviews": np.empty(size, dtype=np.int32),
+            "avg_rating": np.empty(size, dtype=np.float64),
+            "verified_purchases": np.empty(size, dtype=np.int32),
+        }
+
+        for code, name in enumerate(self.CLASSES):
+            rows = np.flatnonzero(classes == code)
+            count = len(rows)
+            history = self.history[name]
+            low, high = self.RATINGS[name]
+            mean, spread = history["avg_rating"]
+
+            total = 1 + rng.poisson(max(history["total_reviews"] - 1, 0), count)
+            columns["rating"][rows] = rng.integers(low, high + 1, count)
+            columns["verified_purchase"][rows] = rng.random(count) < history["verified_rate"]
+            columns["helpful_votes"][rows] = rng.poisson(history["helpful_votes"], count)
+            columns["total_reviews"][rows] = total
+            columns["avg_rating"][rows] = np.round(np.clip(rng.normal(mean, spread, count), 1, 5), 1)
+            columns["verified_purchases"][rows] = rng.binomial(total, history["verified_rate"])
+
+        columns["label"] = np.array(self.CLASSES, dtype=object)[classes]
+        columns["is_fake"] = classes == self.CLASSES.index("suspicious")
+        return columns
+
+    def batch(self, size, index=0):
+        """
+        Draw one chunk of reviews as a ReviewBatch.
+
+        Args:
+            size (int): Number of reviews.
+            index (int): Chunk number.
+
+        Returns:
+            ReviewBatch: The reviews; labels are available from arrays().
+        """
+        return self._to_batch(self.arrays(size, index))
+
+    def iter_arrays(self, total, chunk_size=100000):
+        """
+        Stream a corpus of total reviews as column arrays, chunk by chunk.
+
+        Yields:
+            dict: Column arrays of up to chunk_size reviews.
+        """
+        for index, start in enumerate(range(0, total, chunk_size)):
+            yield self.arrays(min(chunk_size, total - start), index)
+
+    def iter_batches(self, total, chunk_size=100000):
+        """
+        Stream a corpus of total reviews as ReviewBatch chunks.
+
+        Yields:
+            ReviewBatch: Up to chunk_size reviews.
+        """
+        for columns in self.iter_arrays(total, chunk_size):
+            yield self._to_batch(columns)
+
+    def write(self, path, total, chunk_size=100000, format=None):
+        """
+        Stream a corpus to a file, one chunk in memory at a time.
+
+        The file has one column per ReviewBatch field plus label and
+        is_fake, so ReviewBatch.from_frame can read it back.
+
+        Args:
+            path (str): Output file.
+            total (int): Number of reviews.
+            chunk_size (int): Reviews generated and written per chunk.
+            format (str): "csv", "jsonl" or "parquet"; taken from the file
+                extension by default.
+
+        Returns:
+            int: Number of reviews written.
+        """
+        format = format or os.path.splitext(path)[1].lstrip(".").lower()
+        if format not in self.FORMATS:
+            raise ValueError(f"Unsupported format {format!r}; use one of {', '.join(self.FORMATS)}")
+        if format == "parquet" and pyarrow is None:
+            raise ImportError("Parquet output requires the pyarrow package")
+
+        written = 0
+        writer = None
+        with open(path, "wb") as f:
+            for columns in self.iter_arrays(total, chunk_size):
+                frame = pd.DataFrame(columns)
+                if format == "csv":
+                    f.write(frame.to_csv(index=False, header=written == 0).encode("utf-8"))
+                elif format == "jsonl":
+                    f.write(frame.to_json(orient="records", lines=True, force_ascii=False).encode("utf-8"))
+                else:
+                    table = pyarrow.Table.from_pandas(frame, preserve_index=False)
+                    if writer is None:
+                        writer = pyarrow.parquet.ParquetWriter(f, table.schema)
+                    writer.write_table(table)
+                written += len(frame)
+            if writer is not None:
+                writer.close()
+        return written
+
+    def _texts(self, rng, classes):
+        """
+        Review texts for a chunk: templates, composed texts and copies.
+        """
+        size = len(classes)
+        texts = np.empty(size, dtype=object)
+        from_template = rng.random(size) < self.template_rate
+
+        for code in range(len(self.CLASSES)):
+            rows = np.flatnonzero((classes == code) & from_template)
+            templates = self._templates[code]
+            suffixes = self._suffixes[rng.integers(0, len(self._suffixes), len(rows))]
+            texts[rows] = templates[rng.integers(0, len(templates), len(rows))] + suffixes
+
+            rows = np.flatnonzero((classes == code) & ~from_template)
+            parts = [part[rng.integers(0, len(part), len(rows))] for part in self._fragments[code]]
+            texts[rows] = parts[0] + " " + parts[1] + " " + parts[2]
+
+        copies = np.flatnonzero(rng.random(size) < self.duplicate_rate)
+        texts[copies] = texts[rng.integers(0, size, len(copies))]
+        return texts
+
+    def _dates(self, rng, classes):
+        """
+        ISO review dates for a chunk, with suspicious reviews partly in bursts.
+        """
+        size = len(classes)
+        days = rng.integers(0, self.days, size)
+
+        if len(self.burst_starts):
+            in_burst = (classes == self.CLASSES.index("suspicious")) & (rng.random(size) < self.burst_rate)
+            count = int(in_burst.sum())
+            starts = self.burst_starts[rng.integers(0, len(self.burst_starts), count)]
+            days[in_burst] = np.minimum(starts + rng.integers(0, self.burst_days, count), self.days - 1)
+
+        return self._date_strings[days]
+
+    def _to_batch(self, columns):
+        """
+        Wrap generated columns in a ReviewBatch.
+        """
+        batch_columns = {name: StringColumn.from_strings(columns[name]) for name in ReviewBatch.STRING_COLUMNS}
+        for name, dtype in ReviewBatch.NUMERIC_COLUMNS.items():
+            batch_columns[name] = columns[name].astype(dtype, copy=False)
+        return ReviewBatch(batch_columns)
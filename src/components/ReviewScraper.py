@@ -1,23 +1,53 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import queue
 import re
-import time
+import threading
 import random
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlencode, parse_qsl
+from components.Metrics import METRICS
+from components.PageFetcher import PageFetcher
+from components.ReviewExtractor import ReviewExtractor
+from components.ReviewBatch import ReviewBatch
+from components.ReviewGenerator import ReviewGenerator
 
 class ReviewScraper:
     """
     A class for scraping product reviews from e-commerce websites.
     Currently supports Amazon, Best Buy, and Walmart.
+    
+    Review pages are downloaded concurrently through a PageFetcher and
+    parsed in page order, so callers can start analyzing early pages while
+    later ones are still downloading.
     """
     
-    def __init__(self):
+    # Query parameter holding the review page number on each site
+    PAGE_PARAMS = {
+        "amazon": "pageNumber",
+        "bestbuy": "page",
+        "walmart": "page",
+    }
+    
+    # Query parameters that list reviews newest first, which re-checks rely
+    # on to stop at the first review seen before (the default is "top reviews")
+    SORT_PARAMS = {
+        "amazon": {"sortBy": "recent"},
+        "bestbuy": {"sort": "MOST_RECENT"},
+        "walmart": {"sort": "submission-desc"},
+    }
+    
+    # Review pages do not expose reviewer history; these neutral values keep
+    # the reviewer-history heuristics from firing on data we never saw
+    UNKNOWN_HISTORY = {"total_reviews": 3, "avg_rating": 0.0, "verified_purchases": 0}
+    
+    def __init__(self, fetcher=None, parser_backend=None):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept-Language': 'en-US,en;q=0.9',
         }
+        self.fetcher = fetcher or PageFetcher(headers=self.headers)
+        self.extractors = {site: ReviewExtractor(site, parser_backend) for site in self.PAGE_PARAMS}
     
-    def scrape(self, url, min_count=30, max_pages=5):
+    def scrape(self, url, min_count=30, max_pages=5, site=None, seen=None, mock_fallback=None):
         """
         Scrape reviews from the given product URL.
         
@@ -25,46 +55,250 @@ class ReviewScraper:
             url (str): The product URL to scrape reviews from.
             min_count (int): Minimum number of reviews to collect.
             max_pages (int): Maximum number of pages to scrape.
+            site (str): Site layout to use ("amazon", "bestbuy" or "walmart").
+                Detected from the URL by default; set it to scrape a mirror.
+            seen (container): Reviews analyzed before, e.g. a ProductState.
+                Review pages are requested newest first (SORT_PARAMS), so
+                paging stops at the first review found in it.
+            mock_fallback (bool): Return demo reviews when the site is not
+                supported or no page yields reviews. Defaults to True
+                unless seen is given; callers that persist the results
+                should pass False.
+            
+        Returns:
+            ReviewBatch: The reviews in compact columnar form. Iterating or
+            indexing it yields dict-like views of each review.
+        """
+        reviews = []
+        with METRICS.timer("scrape"):
+            for page in self.iter_review_pages(url, min_count, max_pages, site, seen, mock_fallback):
+                reviews.extend(page)
+            batch = ReviewBatch.from_reviews(reviews)
+        METRICS.count("reviews_scraped", len(batch))
+        return batch
+    
+    def iter_review_pages(self, url, min_count=30, max_pages=5, site=None, seen=None, mock_fallback=None):
+        """
+        Scrape reviews page by page while later pages keep downloading.
+        
+        Args:
+            url (str): The product URL to scrape reviews from.
+            min_count (int): Stop once this many reviews have been collected.
+            max_pages (int): Maximum number of pages to scrape.
+            site (str): Site layout to use, detected from the URL by default.
+            seen (container): Reviews analyzed before; paging stops at the
+                first one.
+            mock_fallback (bool): Yield demo reviews when nothing could be
+                scraped, as in scrape().
+            
+        Yields:
+            list: Review dictionaries parsed from one page, in page order.
+            The last page is cut before the first seen review and may be
+            empty.
+        """
+        if mock_fallback is None:
+            # A re-check that found nothing new must not record demo data
+            mock_fallback = seen is None
+        site = site or self._detect_site(url)
+        if site is None:
+            if not mock_fallback:
+                raise ValueError(f"Unsupported site: {url}")
+            # For demo purposes, unsupported sites get mock data
+            METRICS.count("mock_fallbacks")
+            yield self._get_mock_reviews(min_count)
+            return
+        
+        pages = queue.Queue()
+        finished = object()
+        
+        def run():
+            async def pump():
+                async for page in self.astream(url, site, min_count, max_pages, seen):
+                    pages.put(page)
+            try:
+                asyncio.run(pump())
+            except Exception as e:
+                pages.put(e)
+            finally:
+                pages.put(finished)
+        
+        threading.Thread(target=run, daemon=True).start()
+        
+        received = 0
+        while True:
+            page = pages.get()
+            if page is finished:
+                break
+            if isinstance(page, Exception):
+                raise page
+            received += 1
+            yield page
+        
+        if received == 0 and mock_fallback:
+            # Sites often block scrapers; fall back to demo data like the stubs did
+            METRICS.count("mock_fallbacks")
+            yield self._get_mock_reviews(min_count)
+    
+    async def astream(self, url, site, min_count=30, max_pages=5, seen=None):
+        """
+        Asynchronously yield parsed review pages in page order.
+        
+        All pages are requested up front (subject to the fetcher's per-domain
+        limits); outstanding requests are cancelled as soon as min_count
+        reviews were collected, a page comes back empty or a seen review
+        is reached.
+        
+        Args:
+            url (str): The product URL to scrape reviews from.
+            site (str): Site key in PAGE_PARAMS.
+            min_count (int): Stop once this many reviews have been collected.
+            max_pages (int): Maximum number of pages to scrape.
+            seen (container): Reviews analyzed before; paging stops at the
+                first one.
+            
+        Yields:
+            list: Review dictionaries parsed from one page.
+        """
+        tasks = [
+            asyncio.ensure_future(self.fetcher.fetch(self._page_url(url, site, page)))
+            for page in range(1, max_pages + 1)
+        ]
+        collected = 0
+        try:
+            for task in tasks:
+                html = await task
+                reviews = self._parse_page(html, site) if html else []
+                if not reviews:
+                    break
+                if seen is not None:
+                    stop = next((i for i, review in enumerate(reviews) if review in seen), None)
+                    if stop is not None:
+                        METRICS.count("seen_review_stops")
+                        yield reviews[:stop]
+                        break
+                collected += len(reviews)
+                yield reviews
+                if collected >= min_count:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def product_key(self, url):
+        """
+        Stable key of the product behind a URL, for per-product state.
+        
+        Amazon URLs are keyed by ASIN, so product, review and tracking links
+        of one product agree; other URLs by host and path.
+        
+        Args:
+            url (str): The product URL.
             
         Returns:
-            list: A list of dictionaries containing review data.
+            str: Product key.
+        """
+        parsed = urlparse(url)
+        host = re.sub(r'^www\.', '', parsed.netloc.lower())
+        if self._detect_site(url) == "amazon":
+            asin = re.search(r'/(?:dp|gp/product|product-reviews)/([A-Z0-9]{10})', parsed.path)
+            if asin:
+                return f"amazon:{asin.group(1)}"
+        return host + parsed.path.rstrip("/")
+    
+    def _detect_site(self, url):
+        """
+        Map a product URL to a key in PAGE_PARAMS, or None when unsupported.
         """
         domain = urlparse(url).netloc
         
         if 'amazon' in domain:
-            return self._scrape_amazon(url, min_count, max_pages)
+            return "amazon"
         elif 'bestbuy' in domain:
-            return self._scrape_bestbuy(url, min_count, max_pages)
+            return "bestbuy"
         elif 'walmart' in domain:
-            return self._scrape_walmart(url, min_count, max_pages)
-        else:
-            # In a real implementation, we'd raise an exception here
-            # For demo purposes, we'll return mock data
-            return self._get_mock_reviews(min_count)
+            return "walmart"
+        return None
     
-    def _scrape_amazon(self, url, min_count, max_pages):
+    def _page_url(self, url, site, page):
         """
-        Scrape reviews from Amazon product page.
+        Build the URL of one review page, sorted newest first.
+        
+        Args:
+            url (str): The product URL.
+            site (str): Site key in PAGE_PARAMS.
+            page (int): 1-based page number.
+            
+        Returns:
+            str: URL of the review page.
         """
-        # In a real implementation, this would contain actual Amazon scraping logic
-        # For demonstration purposes, we'll return mock data
-        return self._get_mock_reviews(min_count)
+        parsed = urlparse(url)
+        path = parsed.path
+        
+        if site == "amazon":
+            # Product pages (/dp/ASIN) keep their reviews under /product-reviews/ASIN
+            asin = re.search(r'/(?:dp|gp/product|product-reviews)/([A-Z0-9]{10})', path)
+            if asin:
+                path = f"/product-reviews/{asin.group(1)}/"
+        
+        query = dict(parse_qsl(parsed.query))
+        query.update(self.SORT_PARAMS[site])
+        query[self.PAGE_PARAMS[site]] = str(page)
+        return parsed._replace(path=path, query=urlencode(query)).geturl()
     
-    def _scrape_bestbuy(self, url, min_count, max_pages):
+    def _parse_page(self, html, site):
         """
-        Scrape reviews from Best Buy product page.
+        Extract reviews from one page of HTML.
+        
+        Args:
+            html (str): Page HTML.
+            site (str): Site key in PAGE_PARAMS.
+            
+        Returns:
+            list: Review dictionaries found on the page.
         """
-        # In a real implementation, this would contain actual Best Buy scraping logic
-        # For demonstration purposes, we'll return mock data
-        return self._get_mock_reviews(min_count)
+        reviews = []
+        with METRICS.timer("scrape.parse"):
+            for fields in self.extractors[site].extract(html):
+                review = self._build_review(fields)
+                if review is not None:
+                    reviews.append(review)
+        METRICS.count("pages_parsed")
+        return reviews
     
-    def _scrape_walmart(self, url, min_count, max_pages):
+    def _build_review(self, fields):
         """
-        Scrape reviews from Walmart product page.
+        Convert extracted field strings into a review dictionary.
+        
+        Args:
+            fields (dict): Raw text of text, rating, date, verified, helpful and reviewer.
+            
+        Returns:
+            dict: Review data, or None when the review has no text.
         """
-        # In a real implementation, this would contain actual Walmart scraping logic
-        # For demonstration purposes, we'll return mock data
-        return self._get_mock_reviews(min_count)
+        text = fields["text"].strip()
+        if not text:
+            return None
+        
+        rating = re.search(r'\d+(?:\.\d+)?', fields["rating"])
+        
+        helpful = fields["helpful"].replace(",", "")
+        votes = re.search(r'\d+', helpful)
+        if votes:
+            helpful_votes = int(votes.group())
+        else:
+            # Amazon spells out "One person found this helpful"
+            helpful_votes = 1 if helpful.lower().startswith("one") else 0
+        
+        return {
+            "text": text,
+            "rating": round(float(rating.group())) if rating else 0,
+            "date": fields["date"],
+            "verified_purchase": bool(fields["verified"]),
+            "helpful_votes": helpful_votes,
+            "reviewer": fields["reviewer"],
+            "reviewer_history": dict(self.UNKNOWN_HISTORY)
+        }
     
     def _get_mock_reviews(self, count):
         """
@@ -76,29 +310,9 @@ class ReviewScraper:
         Returns:
             list: A list of dictionaries containing mock review data.
         """
-        positive_reviews = [
-            "This product exceeded my expectations! The quality is outstanding and it works exactly as described.",
-            "I've been using this for a month now and I'm very satisfied with my purchase. Highly recommended!",
-            "Great value for the price. This product does everything I need it to do and more.",
-            "I bought this as a gift for my husband and he absolutely loves it. Works perfectly!",
-            "The customer service was excellent and the product arrived earlier than expected. Very happy!"
-        ]
-        
-        negative_reviews = [
-            "Don't waste your money on this product. It broke after just a week of light use.",
-            "The quality is much lower than advertised. I'm very disappointed with this purchase.",
-            "This product doesn't work as described. I've tried everything but can't get it to function properly.",
-            "I received a defective item and the company wouldn't refund me. Terrible experience!",
-            "Save your money and look elsewhere. This product is cheaply made and not worth the price."
-        ]
-        
-        suspicious_reviews = [
-            "Best product ever!!!! Changed my life!!!! Will buy again and again!!!! Five stars!!!!!",
-            "I received this product for free in exchange for my honest review. It's amazing and perfect in every way!",
-            "Just received this amazing product today and it's already the best purchase I've ever made!!",
-            "WOW!!! This is INCREDIBLE!!! Cannot believe how PERFECT this is!!!! BUY IT NOW!!!!",
-            "This product cured all my problems! It's the most incredible invention of the century! Life-changing!!!"
-        ]
+        positive_reviews = ReviewGenerator.TEMPLATES["positive"]
+        negative_reviews = ReviewGenerator.TEMPLATES["negative"]
+        suspicious_reviews = ReviewGenerator.TEMPLATES["suspicious"]
         
         reviews = []
         for i in range(count):
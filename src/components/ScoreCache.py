@@ -0,0 +1,214 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+class ScoreCache:
+    """
+    A content-addressed cache of review scores.
+
+    Entries are keyed on a hash of the lowercased review text (the exact
+    string the scorer sees), the metadata the scorer reads and the analyzer
+    version, so identical reviews are scored once. A bounded in-memory LRU
+    tier sits in front of an optional SQLite tier whose total size is kept
+    under max_disk_bytes by evicting the least recently used rows.
+
+    ReviewAnalyzer.analyze_reviews consults the cache review by review;
+    the columnar analyze_batch path does not use it. One cache may be
+    shared by several threads (e.g. the app's sessions): every operation
+    holds a lock, and the SQLite connection is opened for use from any
+    thread.
+    """
+
+    SEPARATOR = "\x1f"
+
+    def __init__(self, max_items=100000, path=None, max_disk_bytes=256 * 1024 * 1024):
+        """
+        Initialize the ScoreCache.
+
+        Args:
+            max_items (int): Capacity of the in-memory tier.
+            path (str): SQLite file for the on-disk tier. None keeps memory only.
+            max_disk_bytes (int): Approximate size limit of the on-disk tier.
+        """
+        self.max_items = max_items
+        self.path = path
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        self._disk_bytes = None
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def key(self, review, version):
+        """
+        Build the cache key for a review.
+
+        Args:
+            review (dict): Review data.
+            version (str): Analyzer and pattern version.
+
+        Returns:
+            str: Hex digest identifying the scoring input.
+        """
+        features = "|".join(str(value) for value in (
+            version,
+            review["rating"],
+            bool(review["verified_purchase"]),
+            review["helpful_votes"],
+            review["reviewer_history"]["total_reviews"],
+        ))
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(features.encode("utf-8") + b"\0")
+        digest.update(review["text"].lower().encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Look up a score.
+
+        Args:
+            key (str): Key from ScoreCache.key.
+
+        Returns:
+            tuple: (fake_score, flags) or None on a miss.
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[0], list(entry[1])
+
+            connection = self._connect()
+            if connection is not None:
+                row = connection.execute("SELECT score, flags FROM scores WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    connection.execute("UPDATE scores SET used = ? WHERE key = ?", (time.time(), key))
+                    flags = row[1].split(self.SEPARATOR) if row[1] else []
+                    self._remember(key, row[0], flags)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0], list(flags)
+
+            self.misses += 1
+            return None
+
+    def put(self, key, fake_score, flags):
+        """
+        Store a score.
+
+        Args:
+            key (str): Key from ScoreCache.key.
+            fake_score (float): Calculated fake probability.
+            flags (list): Flag strings for the review.
+        """
+        with self._lock:
+            self._remember(key, fake_score, list(flags))
+
+            connection = self._connect()
+            if connection is not None:
+                encoded = self.SEPARATOR.join(flags)
+                size = len(key) + len(encoded) + 32
+                # A replaced row gives its size back
+                old = connection.execute("SELECT size FROM scores WHERE key = ?", (key,)).fetchone()
+                connection.execute(
+                    "INSERT OR REPLACE INTO scores (key, score, flags, size, used) VALUES (?, ?, ?, ?, ?)",
+                    (key, fake_score, encoded, size, time.time())
+                )
+                self._disk_bytes += size - (old[0] if old is not None else 0)
+
+    def flush(self):
+        """
+        Commit pending disk writes and enforce the disk size limit.
+        """
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return
+
+            if self._disk_bytes > self.max_disk_bytes:
+                # Evict least recently used rows until a quarter of the limit is free
+                target = int(self.max_disk_bytes * 0.75)
+                connection.execute("""
+                    DELETE FROM scores WHERE key IN (
+                        SELECT key FROM (
+                            SELECT key, SUM(size) OVER (ORDER BY used DESC) AS kept FROM scores
+                        ) WHERE kept > ?
+                    )
+                """, (target,))
+                self._disk_bytes = connection.execute("SELECT COALESCE(SUM(size), 0) FROM scores").fetchone()[0]
+            connection.commit()
+
+    def stats(self):
+        """
+        Report cache effectiveness.
+
+        Returns:
+            dict: hits, misses, disk_hits, hit_rate, memory_items and disk_bytes.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "disk_bytes": self._disk_bytes or 0,
+            }
+
+    def clear(self):
+        """
+        Drop all entries from both tiers.
+        """
+        with self._lock:
+            self._memory.clear()
+            connection = self._connect()
+            if connection is not None:
+                connection.execute("DELETE FROM scores")
+                connection.commit()
+                self._disk_bytes = 0
+
+    def _remember(self, key, fake_score, flags):
+        """
+        Insert into the memory tier, evicting the least recently used entry.
+        The caller holds the lock.
+        """
+        self._memory[key] = (fake_score, tuple(flags))
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _connect(self):
+        """
+        Open the disk tier on first use; the caller holds the lock.
+        """
+        if self.path is None:
+            return None
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS scores (
+                    key TEXT PRIMARY KEY, score REAL, flags TEXT, size INTEGER, used REAL
+                )
+            """)
+            self._disk_bytes = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM scores").fetchone()[0]
+        return self._connection
+
+    def __getstate__(self):
+        # Worker processes open their own connection and start with an empty memory tier
+        state = self.__dict__.copy()
+        state["_memory"] = OrderedDict()
+        state["_connection"] = None
+        state["_disk_bytes"] = None
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,291 @@
+import csv
+import itertools
+import json
+from io import StringIO
+import numpy as np
+import pandas as pd
+from components.ReviewBatch import ReviewBatch
+
+# Optional dependency, only needed for Parquet export
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Header of the CSV export and the review field behind each column
+EXPORT_COLUMNS = [
+    ("Review Text", "text"),
+    ("Rating", "rating"),
+    ("Date", "date"),
+    ("Verified Purchase", "verified_purchase"),
+    ("Helpful Votes", "helpful_votes"),
+    ("Reviewer", "reviewer"),
+    ("Authenticity Score", "authenticity_score"),
+    ("Is Fake", "is_fake"),
+    ("Flags", "flags"),
+]
+
+class ScoredResult:
+    """
+    Scored reviews that can be re-sliced at any confidence threshold.
+
+    The raw fake probabilities are kept alongside a sorted copy, so the
+    fake count for a threshold is a binary search and the fake reviews are
+    a slice of the sort order; changing the threshold never rescores.
+
+    Indexing with the keys of the original result dictionary
+    ("real_percentage", "fake_percentage", "reviews", "export_csv") is
+    supported for existing callers.
+
+    Exports are produced lazily: rows are generated from the stored reviews
+    and scores in chunks only when an export is requested, without an
+    intermediate DataFrame or a full in-memory copy when writing to a file.
+    """
+
+    KEYS = ("real_percentage", "fake_percentage", "reviews", "export_csv")
+
+    def __init__(self, reviews, fake_scores, threshold=0.7, _order=None):
+        """
+        Initialize the ScoredResult.
+
+        Args:
+            reviews (ReviewBatch or list): Scored reviews, in input order.
+            fake_scores (array-like): Fake probability of each review.
+            threshold (float): Confidence threshold for fake detection.
+        """
+        self._reviews = reviews
+        self.fake_scores = np.asarray(fake_scores, dtype=float)
+        self.threshold = threshold
+
+        if _order is None:
+            _order = np.argsort(self.fake_scores, kind="stable")
+        self._order = _order
+        self.sorted_scores = self.fake_scores[_order]
+
+    def with_threshold(self, threshold):
+        """
+        View of the same scores at another threshold, without rescoring.
+
+        Args:
+            threshold (float): Confidence threshold for fake detection.
+
+        Returns:
+            ScoredResult: Result sharing this result's arrays.
+        """
+        return ScoredResult(self._reviews, self.fake_scores, threshold, _order=self._order)
+
+    def fake_count(self, threshold=None):
+        """
+        Number of reviews scoring above a threshold, in O(log n).
+        """
+        if threshold is None:
+            threshold = self.threshold
+        return len(self.sorted_scores) - int(np.searchsorted(self.sorted_scores, threshold, side="right"))
+
+    @property
+    def fake_percentage(self):
+        total = len(self.fake_scores)
+        return round((self.fake_count() / total) * 100) if total > 0 else 0
+
+    @property
+    def real_percentage(self):
+        return 100 - self.fake_percentage
+
+    @property
+    def is_fake(self):
+        """
+        Boolean array marking the fake reviews at the current threshold.
+        """
+        return self.fake_scores > self.threshold
+
+    def fake_indices(self):
+        """
+        Indices of the fake reviews, least suspicious first, as a slice.
+        """
+        return self._order[len(self._order) - self.fake_count():]
+
+    def review(self, index):
+        """
+        One analyzed review with is_fake for the current threshold.
+        """
+        return dict(self._reviews[index], is_fake=bool(self.fake_scores[index] > self.threshold))
+
+    def head(self, n=10):
+        """
+        The first n analyzed reviews with is_fake for the current threshold.
+        """
+        return [self.review(index) for index in range(min(n, len(self._reviews)))]
+
+    @property
+    def batch(self):
+        """
+        The scored reviews as a ReviewBatch, with their flags.
+        """
+        return ReviewBatch.from_reviews(self._reviews)
+
+    @property
+    def reviews(self):
+        """
+        All analyzed reviews with is_fake for the current threshold.
+        """
+        return [self.review(index) for index in range(len(self._reviews))]
+
+    @property
+    def export_csv(self):
+        """
+        CSV string of the detailed results at the current threshold.
+        
+        Built on access; prefer iter_csv() or write_csv() for large results.
+        """
+        return "".join(self.iter_csv())
+
+    def threshold_curve(self, thresholds=None):
+        """
+        Fake rate at many thresholds in one vectorized search.
+
+        Args:
+            thresholds (array-like): Thresholds to evaluate. Defaults to 0..1 in steps of 0.01.
+
+        Returns:
+            pd.DataFrame: threshold and fake_rate (0..1) columns.
+        """
+        if thresholds is None:
+            thresholds = np.linspace(0, 1, 101)
+        thresholds = np.asarray(thresholds, dtype=float)
+
+        total = len(self.sorted_scores)
+        fake = total - np.searchsorted(self.sorted_scores, thresholds, side="right")
+        return pd.DataFrame({
+            "threshold": thresholds,
+            "fake_rate": fake / total if total else np.zeros(len(thresholds))
+        })
+
+    def iter_rows(self):
+        """
+        Yield export rows (tuples in EXPORT_COLUMNS order) one at a time.
+        """
+        fields = [field for _, field in EXPORT_COLUMNS[:-3]]
+        is_fake = self.is_fake
+        for index, review in enumerate(self._reviews):
+            yield tuple(review[field] for field in fields) + (
+                review["authenticity_score"],
+                bool(is_fake[index]),
+                review["flags"],
+            )
+
+    def iter_csv(self, chunk_rows=10000):
+        """
+        Stream the CSV export in chunks of text.
+
+        Args:
+            chunk_rows (int): Rows per yielded chunk.
+
+        Yields:
+            str: CSV text, starting with the header.
+        """
+        yield from iter_csv(self.iter_rows(), chunk_rows)
+
+    def iter_jsonl(self, chunk_rows=10000):
+        """
+        Stream the export as JSON lines in chunks of text.
+
+        Args:
+            chunk_rows (int): Rows per yielded chunk.
+
+        Yields:
+            str: One JSON object per line.
+        """
+        fields = [field for _, field in EXPORT_COLUMNS]
+        lines = []
+        for row in self.iter_rows():
+            lines.append(json.dumps(dict(zip(fields, row)), default=str))
+            if len(lines) >= chunk_rows:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    def write_csv(self, path, chunk_rows=10000):
+        """
+        Write the CSV export to a file, chunk by chunk.
+        """
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            for chunk in self.iter_csv(chunk_rows):
+                f.write(chunk)
+
+    def write_jsonl(self, path, chunk_rows=10000):
+        """
+        Write the JSON lines export to a file, chunk by chunk.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            for chunk in self.iter_jsonl(chunk_rows):
+                f.write(chunk)
+
+    def write_parquet(self, path, chunk_rows=100000):
+        """
+        Write the export to a Parquet file, one row group per chunk.
+
+        Requires the optional pyarrow package.
+        """
+        if pyarrow is None:
+            raise ImportError("Parquet export requires the pyarrow package")
+
+        fields = [field for _, field in EXPORT_COLUMNS]
+        rows = self.iter_rows()
+        writer = None
+        try:
+            while True:
+                chunk = list(itertools.islice(rows, chunk_rows))
+                if not chunk:
+                    break
+                table = pyarrow.table({field: list(column) for field, column in zip(fields, zip(*chunk))})
+                if writer is None:
+                    writer = pyarrow.parquet.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def __len__(self):
+        return len(self.fake_scores)
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+def iter_csv(rows, chunk_rows=10000, header=True):
+    """
+    Format export rows as CSV text, chunk by chunk.
+
+    Matches the former DataFrame.to_csv output: scores with two decimals
+    and flags joined with ", ".
+
+    Args:
+        rows (iterable): Tuples ending with the EXPORT_COLUMNS fields.
+        chunk_rows (int): Rows per yielded chunk.
+        header (bool): Start with the EXPORT_COLUMNS header line.
+
+    Yields:
+        str: CSV text.
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow([name for name, _ in EXPORT_COLUMNS])
+
+    count = 0
+    for row in rows:
+        writer.writerow(row[:-3] + (f"{row[-3]:.2f}", row[-2], ", ".join(row[-1])))
+        count += 1
+        if count % chunk_rows == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
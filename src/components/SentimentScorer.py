@@ -0,0 +1,144 @@
+import re
+import numpy as np
+import pandas as pd
+
+class SentimentScorer:
+    """
+    VADER compound sentiment for whole columns of review text.
+
+    Text is cleaned the way the EDA notebook does (lowercase, letters and
+    whitespace only), which rules out VADER's capitalization and punctuation
+    emphasis. A text whose tokens include none of VADER's context words
+    (negations, boosters, "but", "least", idioms, ...) then scores exactly
+    normalize(sum of token valences), so those texts are scored with one
+    vectorized lexicon lookup over all their tokens. Texts with context
+    words run VADER's per-word rules on their token list directly, skipping
+    the punctuation handling that polarity_scores rebuilds for every call.
+    Both paths give the same compound score as the notebook.
+
+    Scores are cached per distinct cleaned text across calls.
+    """
+
+    # Words that make a token's valence depend on its neighbours in VADER
+    CONTEXT_WORDS = {"but", "least", "kind", "never"}
+
+    # Words that only amplify a lexicon word right after them
+    AMPLIFIERS = ["so", "this"]
+
+    def __init__(self, max_cache_items=500000):
+        """
+        Initialize the SentimentScorer.
+
+        NLTK is imported here rather than with the module. Raises
+        LookupError when the vader_lexicon data is not installed
+        (nltk.download("vader_lexicon")).
+
+        Args:
+            max_cache_items (int): Distinct texts kept in the score cache.
+        """
+        from nltk.sentiment.vader import SentimentIntensityAnalyzer, VaderConstants
+
+        self.analyzer = SentimentIntensityAnalyzer()
+        self.valences = pd.Series(self.analyzer.lexicon, dtype=float)
+        self.max_cache_items = max_cache_items
+        self.cache = {}
+
+        constants = VaderConstants()
+        phrases = [phrase for phrase in list(constants.BOOSTER_DICT) + list(constants.SPECIAL_CASE_IDIOMS) if " " in phrase]
+        self.context_words = set(self.CONTEXT_WORDS) | set(constants.NEGATE) | set(constants.BOOSTER_DICT)
+        self.context_phrases = "|".join(re.escape(phrase) for phrase in phrases)
+
+    @staticmethod
+    def clean(texts):
+        """
+        Lowercase and keep letters and whitespace, as in the EDA notebook.
+
+        Args:
+            texts (pd.Series): Raw review texts.
+
+        Returns:
+            pd.Series: Cleaned texts.
+        """
+        return texts.fillna("").astype(str).str.lower().str.replace(r"[^a-z\s]", "", regex=True)
+
+    def score(self, texts):
+        """
+        Compound sentiment of each text.
+
+        Args:
+            texts (pd.Series): Raw review texts.
+
+        Returns:
+            np.ndarray: Compound scores between -1 and 1, rounded to 4
+            decimals like polarity_scores.
+        """
+        codes, uniques = pd.factorize(self.clean(pd.Series(texts)))
+        known = np.array([self.cache.get(text, np.nan) for text in uniques], dtype=float)
+
+        missing = np.isnan(known)
+        if missing.any():
+            new = uniques[missing]
+            known[missing] = self._score_unique(new)
+            if len(self.cache) + len(new) > self.max_cache_items:
+                self.cache.clear()
+            self.cache.update(zip(new, known[missing]))
+
+        return known[codes]
+
+    def _score_unique(self, texts):
+        """
+        Score distinct cleaned texts, vectorized where VADER allows.
+        """
+        tokens = pd.Series(texts).str.split().explode()
+        tokens = tokens[tokens.str.len() > 1]
+
+        valence = tokens.map(self.valences).fillna(0.0).groupby(level=0).sum()
+        valence = valence.reindex(range(len(texts)), fill_value=0.0).to_numpy()
+
+        in_lexicon = tokens.isin(self.valences.index)
+        next_in_lexicon = in_lexicon.groupby(level=0).shift(-1, fill_value=False)
+        context = tokens.isin(self.context_words) | (tokens.isin(self.AMPLIFIERS) & next_in_lexicon)
+        context = context.groupby(level=0).any().reindex(range(len(texts)), fill_value=False)
+        context |= pd.Series(texts).str.contains(self.context_phrases).to_numpy()
+        context = context.index[context.to_numpy()]
+        for index, text in zip(context, texts[context]):
+            valence[index] = self._context_valence([word for word in text.split() if len(word) > 1])
+        return np.round(valence / np.sqrt(valence * valence + 15), 4)
+
+    def _context_valence(self, words):
+        """
+        Summed VADER valence of one token list, with the neighbour rules.
+
+        Mirrors SentimentIntensityAnalyzer.polarity_scores for cleaned text.
+        """
+        analyzer = self.analyzer
+        lexicon = analyzer.lexicon
+        boosters = analyzer.constants.BOOSTER_DICT
+        text = _CleanText(words)
+        first_index = {}
+        for index, word in enumerate(words):
+            first_index.setdefault(word, index)
+
+        sentiments = []
+        for word in words:
+            index = first_index[word]
+            # Words outside the lexicon carry no valence of their own
+            if word not in lexicon or word in boosters \
+                    or (word == "kind" and index < len(words) - 1 and words[index + 1] == "of"):
+                sentiments.append(0)
+                continue
+            sentiments = analyzer.sentiment_valence(0, text, word, index, sentiments)
+
+        return float(sum(analyzer._but_check(words, sentiments)))
+
+class _CleanText:
+    """
+    The parts of VADER's SentiText used by sentiment_valence, for
+    lowercase text without punctuation.
+    """
+
+    __slots__ = ("words_and_emoticons", "is_cap_diff")
+
+    def __init__(self, words):
+        self.words_and_emoticons = words
+        self.is_cap_diff = False
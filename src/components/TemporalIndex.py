@@ -0,0 +1,234 @@
+import re
+import numpy as np
+import pandas as pd
+
+# Site prefixes in front of review dates ("Reviewed in the United States on March 3, 2024")
+DATE_PREFIX = re.compile(r"^.*\bon\s+(?=\w)")
+
+class TemporalIndex:
+    """
+    Incremental index of one product's review dates, ratings and reviewers.
+
+    Review dates are parsed to day numbers and kept, per star rating, in
+    a few sorted int32 chunks, each at least twice as long as the next
+    one. A batch becomes a new chunk, and the smallest chunks are merged
+    whenever that order breaks, so every day is copied O(log n) times in
+    all instead of the whole array once per batch. Counting the reviews
+    of a rating in a window of days is one binary search per chunk. A
+    review's burst size is the number of reviews with its rating posted
+    within window_days of it; a burst is a burst size of at least
+    burst_min that is also burst_ratio times what the product's average
+    daily volume for that rating would predict. Queries cost O(log^2 n)
+    per review whatever the window.
+
+    Reviewer aggregates (review count, rating sum, first and last day per
+    reviewer name) are updated with one group-by per added batch. Names
+    that sites give to anonymous buyers ("Amazon Customer") or that are
+    shorter than MIN_REVIEWER_LENGTH belong to many people, so they are
+    not tracked and never count as repeat reviewers.
+
+    Dates that do not parse (e.g. "2 months ago") are left out of the
+    date arrays; those reviews never count as part of a burst.
+    """
+
+    RATINGS = range(1, 6)
+
+    # Placeholder reviewer names, compared case-insensitively
+    GENERIC_REVIEWERS = frozenset({
+        "amazon customer", "kindle customer", "a customer", "customer", "flipkart customer",
+        "certified buyer", "verified buyer", "verified purchaser", "verified purchase",
+        "walmart customer", "best buy customer", "anonymous", "anonymous customer", "guest", "user",
+    })
+    MIN_REVIEWER_LENGTH = 3
+
+    def __init__(self, window_days=1, burst_min=10, burst_ratio=5.0):
+        """
+        Initialize the TemporalIndex.
+
+        Args:
+            window_days (int): Reviews less than this many days apart share a
+                window; 1 compares reviews of the same day.
+            burst_min (int): Smallest burst size that is flagged.
+            burst_ratio (float): How many times the expected volume a
+                window must hold to be a burst.
+        """
+        self.window_days = window_days
+        self.burst_min = burst_min
+        self.burst_ratio = burst_ratio
+        self._days = {rating: [] for rating in self.RATINGS}
+        self._reviewers = {}
+        self._first_day = None
+        self._last_day = None
+
+    @staticmethod
+    def parse_dates(dates):
+        """
+        Day numbers (days since 1970-01-01) of date strings, -1 where unparseable.
+
+        Each distinct string is parsed once.
+        """
+        codes, uniques = pd.factorize(pd.Series(dates, dtype=object).fillna("").astype(str))
+        cleaned = pd.Series(uniques).str.replace(DATE_PREFIX, "", regex=True)
+        parsed = pd.to_datetime(cleaned, errors="coerce", format="mixed")
+        days = (parsed.to_numpy(dtype="datetime64[D]").astype(np.int64))
+        days[parsed.isna().to_numpy()] = -1
+        return np.append(days, -1)[codes].astype(np.int32)
+
+    def add(self, dates, ratings, reviewers):
+        """
+        Add a batch of reviews.
+
+        Args:
+            dates (array-like): Review date strings.
+            ratings (array-like): Star ratings; values outside 1..5 are ignored.
+            reviewers (array-like): Reviewer names; empty and generic names
+                (see is_generic) are ignored.
+
+        Returns:
+            np.ndarray: Day number of each review, -1 when its date did not parse.
+        """
+        days = self.parse_dates(dates)
+        ratings = np.asarray(ratings, dtype=np.int64)
+        known = days >= 0
+
+        for rating in self.RATINGS:
+            new = np.sort(days[known & (ratings == rating)])
+            if len(new):
+                chunks = self._days[rating]
+                chunks.append(new)
+                while len(chunks) > 1 and len(chunks[-2]) < 2 * len(chunks[-1]):
+                    merged = np.concatenate((chunks[-2], chunks.pop()))
+                    # Two sorted runs: the stable sort merges them in linear time
+                    merged.sort(kind="stable")
+                    chunks[-1] = merged
+        if known.any():
+            first, last = int(days[known].min()), int(days[known].max())
+            self._first_day = first if self._first_day is None else min(self._first_day, first)
+            self._last_day = last if self._last_day is None else max(self._last_day, last)
+
+        frame = pd.DataFrame({"reviewer": np.asarray(reviewers, dtype=object), "rating": ratings, "day": days})
+        frame = frame[~self.is_generic(frame["reviewer"])]
+        if len(frame):
+            # Unknown days must not win the first/last day aggregates
+            frame["first"] = frame["day"].where(frame["day"] >= 0, np.iinfo(np.int32).max)
+            frame["last"] = frame["day"]
+            groups = frame.groupby("reviewer", sort=False).agg(
+                count=("rating", "size"), rating_sum=("rating", "sum"), first=("first", "min"), last=("last", "max")
+            )
+            reviewers = self._reviewers
+            for name, count, rating_sum, first, last in groups.itertuples():
+                entry = reviewers.get(name)
+                if entry is None:
+                    reviewers[name] = [count, rating_sum, first, last]
+                else:
+                    entry[0] += count
+                    entry[1] += rating_sum
+                    entry[2] = min(entry[2], first)
+                    entry[3] = max(entry[3], last)
+        return days
+
+    def window_histogram(self, start, stop):
+        """
+        Reviews per star rating posted from day start to day stop inclusive.
+
+        Returns:
+            np.ndarray: Five counts, for ratings 1 to 5.
+        """
+        return np.array([self._count(rating, start, stop) for rating in self.RATINGS])
+
+    def burst_sizes(self, days, ratings):
+        """
+        Reviews with the same rating within window_days of each review.
+
+        Args:
+            days (np.ndarray): Day numbers from add() or parse_dates().
+            ratings (array-like): Star ratings.
+
+        Returns:
+            np.ndarray: Burst size of each review, 0 when its date is unknown.
+        """
+        ratings = np.asarray(ratings, dtype=np.int64)
+        sizes = np.zeros(len(days), dtype=np.int64)
+        reach = self.window_days - 1
+        for rating in self.RATINGS:
+            rows = np.flatnonzero((ratings == rating) & (days >= 0))
+            if len(rows):
+                sizes[rows] = self._count(rating, days[rows] - reach, days[rows] + reach)
+        return sizes
+
+    def _count(self, rating, start, stop):
+        """
+        Reviews of one rating posted from day start to day stop inclusive;
+        start and stop may be arrays.
+        """
+        count = 0
+        for chunk in self._days[rating]:
+            count = count + np.searchsorted(chunk, stop, side="right") - np.searchsorted(chunk, start, side="left")
+        return count
+
+    def bursts(self, days, ratings):
+        """
+        Whether each review falls in a burst of its rating.
+        """
+        ratings = np.asarray(ratings, dtype=np.int64)
+        sizes = self.burst_sizes(days, ratings)
+        if self._first_day is None:
+            return np.zeros(len(days), dtype=bool)
+
+        # Reviews per rating a window would hold if reviews arrived evenly
+        span = self._last_day - self._first_day + 1
+        width = min(2 * self.window_days - 1, span)
+        totals = np.array([0] + [sum(len(chunk) for chunk in self._days[rating]) for rating in self.RATINGS])
+        expected = totals[np.clip(ratings, 0, 5)] * width / span
+        return (sizes >= self.burst_min) & (sizes >= self.burst_ratio * expected)
+
+    @classmethod
+    def is_generic(cls, reviewers):
+        """
+        Whether each reviewer name is empty, too short or a placeholder
+        shared by many buyers.
+
+        Returns:
+            np.ndarray: Boolean mask aligned with reviewers.
+        """
+        names = pd.Series(reviewers, dtype=object).fillna("").astype(str).str.strip().str.lower()
+        return (names.str.len() < cls.MIN_REVIEWER_LENGTH).to_numpy() | names.isin(cls.GENERIC_REVIEWERS).to_numpy()
+
+    def reviewer_counts(self, reviewers):
+        """
+        Reviews indexed for each reviewer name, 0 for empty, generic or unknown names.
+        """
+        table = self._reviewers
+        return np.fromiter(
+            (table[name][0] if name and name in table else 0 for name in reviewers),
+            dtype=np.int64, count=len(reviewers),
+        )
+
+    def reviewer_stats(self, name):
+        """
+        Aggregates of one reviewer, or None when they were never indexed.
+
+        Returns:
+            dict: reviews, avg_rating and first_day/last_day (-1 when no date parsed).
+        """
+        entry = self._reviewers.get(name)
+        if entry is None:
+            return None
+        count, rating_sum, first, last = entry
+        return {
+            "reviews": int(count),
+            "avg_rating": rating_sum / count,
+            "first_day": int(first) if first != np.iinfo(np.int32).max else -1,
+            "last_day": int(last),
+        }
+
+    @property
+    def nbytes(self):
+        """
+        Approximate memory held by the index: 4 bytes per dated review plus
+        about 200 bytes per distinct reviewer.
+        """
+        return sum(chunk.nbytes for chunks in self._days.values() for chunk in chunks) + 200 * len(self._reviewers)
+
+    def __len__(self):
+        return sum(len(chunk) for chunks in self._days.values() for chunk in chunks)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Components are imported as in the app: from components.X import X
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
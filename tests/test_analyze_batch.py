@@ -0,0 +1,54 @@
+"""
+analyze_batch against analyze_reviews, row for row (user-001).
+"""
+import numpy as np
+import pytest
+from components.ReviewAnalyzer import ReviewAnalyzer
+from components.ReviewGenerator import ReviewGenerator
+from components.ReviewModel import ReviewModel
+
+class NoJitter:
+    """
+    Stands in for the random generator of the heuristics.
+    """
+
+    def uniform(self, low, high, size=None):
+        return 0.0 if size is None else np.zeros(size)
+
+class UnjitteredAnalyzer(ReviewAnalyzer):
+    def _score_batch(self, frame, texts, hits, rng):
+        return super()._score_batch(frame, texts, hits, NoJitter())
+
+@pytest.fixture
+def reviews():
+    # Batch views plus plain dictionaries, the two shapes callers pass
+    return list(ReviewGenerator(seed=0).batch(2000)) + ReviewGenerator(seed=2).batch(200).to_reviews()
+
+def compare(analyzer, reviews, threshold=0.5):
+    result = analyzer.analyze_reviews(reviews, threshold)
+    batch = analyzer.analyze_batch(result.batch, threshold)
+    scores = batch["scores"]
+
+    assert len(scores) == len(reviews)
+    assert np.allclose(scores["authenticity_score"].to_numpy(), 1 - result.fake_scores)
+    assert np.array_equal(scores["is_fake"].to_numpy(), result.is_fake)
+    for index, flags in enumerate(scores["flags"]):
+        assert set(flags.split(", ") if flags else []) == set(result.review(index)["flags"])
+    assert batch["fake_percentage"] == result["fake_percentage"]
+
+def test_heuristic_scores_and_flags_match(reviews, monkeypatch):
+    # Both paths add the same +-0.1 jitter, from different generators
+    monkeypatch.setattr("components.ReviewAnalyzer.random.uniform", NoJitter().uniform)
+    compare(UnjitteredAnalyzer(), reviews)
+
+def test_model_scores_and_flags_match(reviews):
+    frames = [ReviewGenerator(seed=1).batch(5000).to_frame()]
+    model = ReviewModel.train(lambda: frames, lambda frame: frame["rating"].to_numpy() == 5, n_features=2 ** 12, epochs=1)
+    compare(ReviewAnalyzer(model=model), reviews)
+
+def test_seeded_batches_are_reproducible(reviews):
+    analyzer = ReviewAnalyzer()
+    batch = analyzer.analyze_reviews(reviews).batch
+    first = analyzer.analyze_batch(batch, seed=3)["scores"]
+    second = analyzer.analyze_batch(batch, seed=3)["scores"]
+    assert first["authenticity_score"].equals(second["authenticity_score"])
@@ -0,0 +1,119 @@
+"""
+Resuming an interrupted BatchPipeline run (user-020).
+"""
+import pandas as pd
+import pytest
+from components.BatchPipeline import BatchPipeline, ResultWriter
+from components.DatasetLoader import DatasetLoader
+from components.ResultStore import ResultStore
+from components.ReviewAnalyzer import ReviewAnalyzer
+
+CHUNK = 40
+
+class FailingAnalyzer(ReviewAnalyzer):
+    """
+    Fails on the units whose first review text is in fail_on.
+    """
+
+    def __init__(self, fail_on=()):
+        super().__init__()
+        self.fail_on = set(fail_on)
+        self.units = 0
+
+    def analyze_batch(self, data, threshold=0.7, seed=None):
+        if data["text"].iloc[0] in self.fail_on:
+            raise RuntimeError("scoring failed")
+        self.units += 1
+        return super().analyze_batch(data, threshold, seed)
+
+@pytest.fixture
+def dataset(tmp_path):
+    rows = 5 * CHUNK
+    path = tmp_path / "reviews.csv"
+    pd.DataFrame({
+        "ProductName": [f"product-{index % 7}" for index in range(rows)],
+        "Price": [f"?{100 + index % 7},999" for index in range(rows)],
+        "Rate": [str(1 + index % 5) for index in range(rows)],
+        "Review": ["Title"] * rows,
+        "Summary": [f"review number {index}" for index in range(rows)],
+    }).to_csv(path, index=False)
+    return str(path)
+
+def run(analyzer, dataset, output, resume, store=None, chunksize=CHUNK):
+    pipeline = BatchPipeline(analyzer=analyzer, scrape_workers=2, queue_size=2, chunksize=chunksize, store=store)
+    writer = ResultWriter(str(output), chunk_rows=CHUNK, resume=resume)
+    try:
+        return pipeline.run([dataset], writer), pipeline
+    finally:
+        writer.close()
+        pipeline.close()
+
+def test_resume_retries_failed_units_without_duplicates(dataset, tmp_path):
+    output = tmp_path / "out.csv"
+    summary, pipeline = run(FailingAnalyzer({"review number 80"}), dataset, output, resume=False)
+    assert summary["units"] == 4 and summary["errors"] == 1
+
+    analyzer = FailingAnalyzer()
+    summary, _ = run(analyzer, dataset, output, resume=True)
+    assert summary == {"units": 1, "reviews": CHUNK, "skipped": 4, "errors": 0}
+    assert analyzer.units == 1
+
+    texts = pd.read_csv(output)["Review Text"]
+    assert len(texts) == 5 * CHUNK
+    assert sorted(texts) == sorted(f"review number {index}" for index in range(5 * CHUNK))
+
+def test_crash_before_checkpoint_drops_the_chunk(dataset, tmp_path):
+    output = tmp_path / "out.csv"
+    writer = ResultWriter(str(output), chunk_rows=CHUNK)
+    calls = []
+
+    def crash():
+        calls.append(1)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+
+    writer.before_checkpoint = crash
+    pipeline = BatchPipeline(analyzer=ReviewAnalyzer(), scrape_workers=1, chunksize=CHUNK)
+    with pytest.raises(KeyboardInterrupt):
+        pipeline.run([dataset], writer)
+    writer._file.close()
+    writer._checkpoint.close()
+
+    assert ResultWriter(str(output), resume=True).rows_written == 2 * CHUNK
+    summary, _ = run(ReviewAnalyzer(), dataset, output, resume=True)
+    assert summary["skipped"] == 2 and summary["units"] == 3
+    assert len(pd.read_csv(output)) == 5 * CHUNK
+
+def test_resume_with_store_adds_each_review_once(dataset, tmp_path):
+    output = tmp_path / "out.csv"
+    path = str(tmp_path / "store")
+    run(FailingAnalyzer({"review number 0", "review number 160"}), dataset, output, False, ResultStore(path))
+    run(FailingAnalyzer(), dataset, output, True, ResultStore(path))
+
+    store = ResultStore(path)
+    assert len(pd.read_csv(output)) == 5 * CHUNK
+    assert store.batches == {f"{dataset}#{start}-{start + CHUNK}" for start in range(0, 5 * CHUNK, CHUNK)}
+    expected = pd.read_csv(dataset).groupby("ProductName").size()
+    assert store.product_table(0.7)["reviews"].sort_index().equals(expected.rename("reviews").rename_axis(None))
+
+def test_resume_with_another_chunksize_writes_each_row_once(dataset, tmp_path):
+    output = tmp_path / "out.csv"
+    summary, _ = run(FailingAnalyzer({"review number 80", "review number 160"}), dataset, output, resume=False)
+    assert summary["units"] == 3
+
+    analyzer = FailingAnalyzer()
+    summary, _ = run(analyzer, dataset, output, resume=True, chunksize=3 * CHUNK // 2)
+    # Chunk 0-60 is written; rows 80-120 and 160-200 are left, in the chunks 60-120, 120-180 and 180-200
+    assert summary == {"units": 3, "reviews": 2 * CHUNK, "skipped": 1, "errors": 0}
+
+    texts = pd.read_csv(output)["Review Text"]
+    assert sorted(texts) == sorted(f"review number {index}" for index in range(5 * CHUNK))
+
+def test_dataset_units_flag_like_analyze_reviews(dataset, tmp_path):
+    output = tmp_path / "out.csv"
+    run(ReviewAnalyzer(), dataset, output, resume=False)
+    written = pd.read_csv(output, keep_default_na=False)
+
+    reviews = DatasetLoader(dataset).to_reviews(next(DatasetLoader(dataset).iter_frames()))
+    expected = ReviewAnalyzer().analyze_reviews(reviews)
+    assert list(written["Flags"]) == [", ".join(review["flags"]) for review in expected.reviews]
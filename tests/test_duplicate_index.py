@@ -0,0 +1,53 @@
+"""
+Near-duplicate clustering with the MinHash-LSH DuplicateIndex (user-014).
+"""
+from components.DuplicateIndex import DuplicateIndex
+from components.ReviewAnalyzer import ReviewAnalyzer
+from components.ReviewBatch import ReviewBatch
+
+TEMPLATE = "This product is absolutely amazing and changed my life, without a doubt I would recommend it to {}"
+
+UNRELATED = [
+    "The battery drains within two hours and the charger gets very hot while plugged in",
+    "Arrived a week late but the packaging was intact and the fabric feels sturdy enough",
+    "Sound quality is fine for calls though music lacks bass compared to my older headphones",
+    "The screws in the box did not fit the frame so I had to buy a separate set",
+]
+
+def test_template_variants_cluster_together():
+    index = DuplicateIndex()
+    variants = [TEMPLATE.format(who) for who in ("everyone", "anyone", "friends", "everyone!!")]
+    ids = index.add(variants + UNRELATED)
+
+    clusters = index.clusters(ids)
+    assert len(set(clusters[:4].tolist())) == 1
+    assert len(set(clusters[4:].tolist()) | {clusters[0]}) == len(UNRELATED) + 1
+    assert index.cluster_sizes(ids).tolist() == [4] * 4 + [1] * len(UNRELATED)
+
+def test_short_texts_are_not_indexed():
+    index = DuplicateIndex(min_words=5)
+    ids = index.add(["Good product", "Nice", "", "good product good product"])
+    assert ids.tolist() == [-1, -1, -1, -1]
+    assert index.cluster_sizes(ids).tolist() == [1, 1, 1, 1]
+    assert len(index) == 0
+
+def test_clusters_grow_across_batches():
+    index = DuplicateIndex()
+    first = index.add([TEMPLATE.format("everyone"), UNRELATED[0]])
+    second = index.add([TEMPLATE.format("anyone"), TEMPLATE.format("family")])
+    assert index.cluster_sizes(first).tolist() == [3, 1]
+    assert index.clusters(second).tolist() == [index.clusters(first)[0]] * 2
+    assert len(index) == 4
+
+def test_analyzer_flags_clusters_of_three():
+    analyzer = ReviewAnalyzer(duplicates=DuplicateIndex())
+    reviews = [dict(text=text, rating=5, date="", verified_purchase=True, helpful_votes=1, reviewer="",
+                    reviewer_history={"total_reviews": 5, "avg_rating": 4.0, "verified_purchases": 3})
+               for text in [TEMPLATE.format("everyone"), TEMPLATE.format("friends")] + UNRELATED[:2]]
+    first = analyzer.analyze_reviews(reviews)
+    assert not any(ReviewAnalyzer.DUPLICATE_FLAG in review["flags"] for review in first.reviews)
+
+    second = analyzer.analyze_reviews(reviews[:1])
+    assert ReviewAnalyzer.DUPLICATE_FLAG in second.review(0)["flags"]
+    flags = analyzer.analyze_batch(ReviewBatch.from_reviews(reviews[1:2]))["scores"]["flags"]
+    assert ReviewAnalyzer.DUPLICATE_FLAG in flags.iloc[0]
@@ -0,0 +1,40 @@
+"""
+Sharing the Metrics sampling profiler between callers (user-016).
+"""
+import threading
+import time
+from components.Metrics import Metrics
+
+def test_profiler_runs_until_the_last_user_stops():
+    metrics = Metrics()
+    metrics.start_profiler(0.001)
+    metrics.start_profiler(0.001)
+    thread, _ = metrics._profiler
+
+    metrics.stop_profiler()
+    assert metrics._profiler is not None and thread.is_alive()
+    metrics.stop_profiler()
+    assert metrics._profiler is None and not thread.is_alive()
+    # Unpaired stops are ignored
+    metrics.stop_profiler()
+    assert metrics._profiler_users == 0
+
+def test_concurrent_sessions_keep_their_profiles():
+    metrics = Metrics()
+    running = []
+
+    def session():
+        with metrics.profile(0.001):
+            for _ in range(20):
+                running.append(metrics._profiler is not None)
+                time.sleep(0.001)
+
+    threads = [threading.Thread(target=session) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(running)
+    assert metrics._profiler is None and metrics._profiler_users == 0
+    assert metrics.collapsed_stacks()
@@ -0,0 +1,115 @@
+"""
+PageFetcher limits, retries and backoff against a local HTTP server (user-006).
+"""
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from components.PageFetcher import PageFetcher
+
+class FixtureServer:
+    """
+    Local server that records how many requests it is serving at once.
+
+    /slow/* answers after a short delay; /flaky/<n> answers 429 with a huge
+    Retry-After to its first n requests; /down always answers 503.
+    """
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.hits = {}
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._lock:
+                    server.active += 1
+                    server.peak = max(server.peak, server.active)
+                    server.hits[self.path] = hits = server.hits.get(self.path, 0) + 1
+                try:
+                    if self.path.startswith("/slow/"):
+                        time.sleep(0.05)
+                        self._answer(200)
+                    elif self.path.startswith("/flaky/") and hits <= int(self.path.split("/")[2]):
+                        self._answer(429, {"Retry-After": "3600"})
+                    elif self.path.startswith("/down"):
+                        self._answer(503)
+                    else:
+                        self._answer(200)
+                finally:
+                    with server._lock:
+                        server.active -= 1
+
+            def _answer(self, status, headers=None):
+                body = f"<html>{self.path}</html>".encode("utf-8")
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+@pytest.fixture
+def server():
+    server = FixtureServer()
+    yield server
+    server.close()
+
+def test_domain_limit_holds_across_concurrent_scrapes(server):
+    # Like the app: one shared fetcher, each scrape on its own thread and event loop
+    fetcher = PageFetcher(per_domain_limit=2, min_interval=0, pool_size=16)
+    results = []
+
+    def scrape(index):
+        async def pages():
+            return await asyncio.gather(*(fetcher.fetch(f"{server.url}/slow/{index}/{page}") for page in range(5)))
+        results.extend(asyncio.run(pages()))
+
+    threads = [threading.Thread(target=scrape, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    fetcher.close()
+
+    assert len(results) == 40 and all(html and "/slow/" in html for html in results)
+    assert server.peak == 2
+
+def test_retry_after_is_honored_up_to_max_backoff(server):
+    fetcher = PageFetcher(min_interval=0, max_retries=2, max_backoff=0.05)
+    start = time.monotonic()
+    html = asyncio.run(fetcher.fetch(f"{server.url}/flaky/2"))
+    seconds = time.monotonic() - start
+    fetcher.close()
+
+    assert html == "<html>/flaky/2</html>"
+    assert server.hits["/flaky/2"] == 3
+    assert 0.1 <= seconds < 2
+
+def test_gives_up_after_max_retries(server):
+    fetcher = PageFetcher(min_interval=0, max_retries=2, backoff=0.01)
+    assert asyncio.run(fetcher.fetch(f"{server.url}/down")) is None
+    fetcher.close()
+    assert server.hits["/down"] == 3
+
+def test_backoff_grows_and_is_capped():
+    fetcher = PageFetcher(backoff=1, max_backoff=5)
+    delays = [fetcher._retry_delay(None, attempt) for attempt in range(6)]
+    fetcher.close()
+    assert 0.5 <= delays[0] <= 1.5
+    assert 2 <= delays[2] <= 5
+    assert delays[5] == 5
@@ -0,0 +1,38 @@
+"""
+ParallelAnalyzer seeding and worker pool refresh (user-004).
+"""
+import random
+from components.ParallelAnalyzer import ParallelAnalyzer
+from components.ReviewAnalyzer import ReviewAnalyzer
+from components.ReviewGenerator import ReviewGenerator
+
+REVIEWS = ReviewGenerator(seed=0).batch(4).to_reviews()
+REVIEWS[2]["text"] = "Zorblax pays off, zorblax forever!"
+
+def test_seeded_run_leaves_global_random_alone():
+    parallel = ParallelAnalyzer(workers=1, seed=3)
+    random.seed(42)
+    expected = [random.random() for _ in range(3)]
+
+    random.seed(42)
+    first = parallel.analyze_reviews(REVIEWS).fake_scores
+    assert [random.random() for _ in range(3)] == expected
+    assert list(parallel.analyze_reviews(REVIEWS).fake_scores) == list(first)
+
+def test_pool_picks_up_patterns_added_after_first_use():
+    analyzer = ReviewAnalyzer()
+    with ParallelAnalyzer(analyzer, workers=2, shard_size=1) as parallel:
+        before = parallel.analyze_reviews(REVIEWS).reviews
+        assert all("Zorblax" not in review["flags"] for review in before)
+
+        analyzer.add_pattern_pack([r"\bzorblax\b"], "Zorblax")
+        flagged = [review["text"] for review in parallel.analyze_reviews(REVIEWS).reviews if "Zorblax" in review["flags"]]
+        assert flagged == [REVIEWS[2]["text"]]
+
+def test_analyze_batch_joins_shards_in_order():
+    frame = ReviewGenerator(seed=1).batch(25).to_frame()
+    expected = ReviewAnalyzer().analyze_batch(frame)["scores"]
+    result = ParallelAnalyzer(workers=1, shard_size=10, seed=5).analyze_batch(frame)
+    assert result["scores"]["flags"].tolist() == expected["flags"].tolist()
+    assert result["scores"].index.equals(frame.index)
+    assert result["fake_percentage"] == round(100 * result["scores"]["is_fake"].mean())
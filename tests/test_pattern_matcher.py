@@ -0,0 +1,64 @@
+"""
+PatternMatcher against a plain scan of every regex (user-002).
+"""
+import json
+import re
+import numpy as np
+import pytest
+from components.PatternMatcher import PatternMatcher, _required_literal
+from components.ReviewAnalyzer import ReviewAnalyzer
+from components.ReviewGenerator import ReviewGenerator
+
+PACK = {
+    "Incentivized review": ["free product", r"discount for .{0,20}review", r"got (this|it) free"],
+    "Hyperbolic language": ["best", "best purchase", r"10/10", r"(?:must|have to) buy", r"wow+!"],
+    "Shouting": [r"\b[A-Z]{5,}\b", r"!!!+"],
+}
+
+TEXTS = [
+    "",
+    "Best purchase ever!!! Got it free in exchange for an honest review",
+    "BEST EVER, life-changing. amazing and perfect",
+    "I received this free. Discount for my review. 10/10 must buy wowww!",
+    "best best best purchase",
+    "Received it, free shipping was nice",
+    "Lifechanging! AMAZING really perfect!!",
+    "in exchange for a five star review",
+    "okay product",
+]
+
+@pytest.fixture
+def matcher(tmp_path):
+    analyzer = ReviewAnalyzer()
+    path = tmp_path / "pack.json"
+    path.write_text(json.dumps(PACK), encoding="utf-8")
+    analyzer.matcher.load_pack(str(path))
+    return analyzer.matcher
+
+def scan(matcher, text):
+    return [index for index, pattern in enumerate(matcher.compiled) if pattern.search(text.lower())]
+
+def test_matches_equal_regex_scan(matcher):
+    texts = TEXTS + list(ReviewGenerator(seed=0).batch(3000).columns["text"])
+    for text in texts:
+        assert matcher.match(text) == scan(matcher, text), text
+
+def test_match_matrix_agrees_with_match(matcher):
+    hits = matcher.match_matrix(TEXTS)
+    assert hits.shape == (len(TEXTS), len(matcher.patterns))
+    for row, text in enumerate(TEXTS):
+        assert np.flatnonzero(hits[row]).tolist() == matcher.match(text)
+
+def test_required_literals():
+    assert _required_literal(r"in exchange for .{0,40}review") == ("in exchange for ", False)
+    assert _required_literal(r"!!+") == ("!!", False)
+    assert _required_literal(r"free product") == ("free product", True)
+    assert _required_literal(r"(?:must|have to) buy") == (" buy", False)
+    assert _required_literal(r"a|b")[0] == ""
+
+def test_version_tracks_patterns_and_labels():
+    first = PatternMatcher(["best"], ["Hyperbolic language"])
+    assert first.version == PatternMatcher(["best"], ["Hyperbolic language"]).version
+    assert first.version != PatternMatcher(["best"], ["Other"]).version
+    with pytest.raises(ValueError):
+        PatternMatcher(["best", "worst"], ["One label"])
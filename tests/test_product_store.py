@@ -0,0 +1,96 @@
+"""
+Per-product locking of ProductStore.refresh (user-019).
+"""
+import threading
+import time
+import pytest
+from components.ProductStore import ProductStore
+from components.ReviewAnalyzer import ReviewAnalyzer
+from components.ReviewBatch import ReviewBatch
+from components.ReviewGenerator import ReviewGenerator
+from components.ReviewScraper import ReviewScraper
+
+class SlowScraper(ReviewScraper):
+    """
+    Mock reviews after a delay, recording how many scrapes overlap.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def scrape(self, url, min_count=30, max_pages=5, site=None, seen=None, mock_fallback=None):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.2)
+        with self._lock:
+            self.active -= 1
+        return ReviewBatch.from_reviews(self._get_mock_reviews(min_count))
+
+def refresh_all(urls):
+    store, scraper, analyzer = ProductStore(), SlowScraper(), ReviewAnalyzer()
+    threads = [threading.Thread(target=store.refresh, args=(url, scraper, analyzer, 10)) for url in urls]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return store, scraper
+
+def test_refreshes_of_different_products_overlap():
+    store, scraper = refresh_all([f"https://shop.example.com/product/{index}" for index in range(4)])
+    assert scraper.peak == 4
+    assert len(store) == 4
+
+def test_refreshes_of_one_product_are_serialized():
+    url = "https://shop.example.com/product/1"
+    store, scraper = refresh_all([url, url, url])
+    assert scraper.peak == 1
+    assert store.get(ReviewScraper().product_key(url)).counts["checks"] == 3
+
+def test_refresh_records_no_demo_reviews(monkeypatch):
+    store, scraper = ProductStore(), ReviewScraper()
+
+    async def blocked(url):
+        return None
+
+    monkeypatch.setattr(scraper.fetcher, "fetch", blocked)
+    state, scored = store.refresh("https://www.amazon.com/dp/B000000001", scraper, ReviewAnalyzer())
+    assert len(scored) == 0 and len(state) == 0 and state.counts["checks"] == 1
+    with pytest.raises(ValueError):
+        store.refresh("https://shop.example.com/product/1", scraper, ReviewAnalyzer())
+
+class FixedScraper(ReviewScraper):
+    """
+    Returns given reviews, running a callback during the scrape.
+    """
+
+    def __init__(self, reviews, during=None):
+        super().__init__()
+        self.reviews = reviews
+        self.during = during
+
+    def scrape(self, url, min_count=30, max_pages=5, site=None, seen=None, mock_fallback=None):
+        if self.during is not None:
+            self.during()
+        return self.reviews
+
+def test_checks_from_two_processes_are_merged(tmp_path):
+    path, url = str(tmp_path / "products.sqlite"), "https://shop.example.com/product/1"
+    reviews = ReviewGenerator(seed=0).batch(30)
+    other = ProductStore(path)
+
+    # The other process checks the product while this one is scraping it
+    during = lambda: other.refresh(url, FixedScraper(reviews.slice(0, 20)), ReviewAnalyzer())
+    state, scored = ProductStore(path).refresh(url, FixedScraper(reviews, during), ReviewAnalyzer())
+
+    assert len(scored) == 10
+    assert state.counts["checks"] == 2 and len(state) == 30
+    stored = ProductStore(path).get(ReviewScraper().product_key(url))
+    assert stored.counts["checks"] == 2 and len(stored) == len(stored.sorted_scores) == 30
+
+def test_product_locks_are_dropped_after_use():
+    store, _ = refresh_all([f"https://shop.example.com/product/{index}" for index in range(3)] * 2)
+    assert store._product_locks == {}
@@ -0,0 +1,168 @@
+"""
+ResultStore aggregates, partitions and flushes (user-022).
+"""
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+from components.ResultStore import PRICE_BINS, PRICE_LABELS, ResultStore
+from components.ReviewGenerator import ReviewGenerator
+
+PRODUCTS = np.array([f"product-{index:03d}" for index in range(40)], dtype=object)
+PRICES = np.random.default_rng(1).choice([199.0, 650.0, 1500.0, 4000.0, 8000.0, 25000.0, np.nan], len(PRODUCTS))
+LABELS = ["Short", "Hyperbolic", "Burst"]
+
+def scored_batches(count, size=500):
+    """
+    (products, scored batch, prices) with random scores and flags.
+    """
+    rng = np.random.default_rng(0)
+    for index, batch in enumerate(ReviewGenerator(seed=0).iter_batches(count * size, size)):
+        products = rng.integers(0, len(PRODUCTS) // (2 if index % 2 else 1), len(batch))
+        labels = LABELS[:2] if index % 2 else LABELS[::-1]
+        masks = rng.integers(0, 2 ** len(labels), len(batch)).astype(np.uint64)
+        scored = batch.with_scores(rng.random(len(batch)), masks, labels)
+        yield PRODUCTS[products], scored, PRICES[products]
+
+def frame_of(products, scored, prices):
+    return pd.DataFrame({
+        "product": products,
+        "price": prices,
+        "score": scored.fake_scores,
+        "text": list(scored.columns["text"]),
+        "flags": [", ".join(sorted(scored.flags(index))) for index in range(len(products))],
+    })
+
+def check(store, frame):
+    frame = frame.assign(band=pd.cut(frame["price"], PRICE_BINS, labels=PRICE_LABELS))
+    for threshold in (0.1, 0.35, 0.7, 0.93):
+        table = store.product_table(threshold)
+        expected = frame.groupby("product")["score"].agg(reviews="size", fake=lambda scores: (scores > threshold).sum())
+        assert table.loc[expected.index, ["reviews", "fake"]].equals(expected)
+        assert len(table) == len(expected)
+
+        bands = store.price_band_rates(threshold)
+        expected = frame.groupby("band", observed=False)["score"].apply(lambda scores: (scores > threshold).sum())
+        assert bands["fake"].tolist() == expected.tolist()
+
+    for name in store.products()[::7]:
+        rows = frame[frame["product"] == name]
+        stored = store.reviews(name)
+        assert np.array_equal(stored["fake_score"].to_numpy(), rows["score"].to_numpy())
+        assert stored["text"].tolist() == rows["text"].tolist()
+        assert [", ".join(sorted(flags.split(", "))) if flags else "" for flags in stored["flags"]] == rows["flags"].tolist()
+
+def test_aggregates_match_groupby_across_flushes_and_reopens(tmp_path):
+    store = ResultStore(str(tmp_path))
+    frames = []
+    for index, (products, scored, prices) in enumerate(scored_batches(12)):
+        assert store.add(products, scored, prices, batch_id=str(index))
+        frames.append(frame_of(products, scored, prices))
+        if index % 3 == 2:
+            store.flush()
+            store = ResultStore(str(tmp_path))
+    store.flush()
+    check(ResultStore(str(tmp_path)), pd.concat(frames, ignore_index=True))
+
+def test_deltas_are_merged_and_compacted(tmp_path, monkeypatch):
+    monkeypatch.setattr(ResultStore, "MAX_DELTAS", 3)
+    store = ResultStore(str(tmp_path))
+    frames = []
+    for index, (products, scored, prices) in enumerate(scored_batches(10, size=20)):
+        store.add(products[:5], scored.slice(0, 5), prices[:5], batch_id=str(index))
+        frames.append(frame_of(products[:5], scored.slice(0, 5), prices[:5]))
+        store.flush()
+        assert len(store._deltas) <= 3
+    assert store._deltas
+    check(ResultStore(str(tmp_path)), pd.concat(frames, ignore_index=True))
+
+def test_unflushed_batches_are_dropped_and_replays_skipped(tmp_path):
+    batches = list(scored_batches(3))
+    store = ResultStore(str(tmp_path))
+    store.add(*batches[0], batch_id="0")
+    store.flush()
+    store.add(*batches[1], batch_id="1")
+
+    # Reopening without a flush loses batch 1, which can then be added again
+    store = ResultStore(str(tmp_path))
+    assert store.batches == {"0"}
+    assert not store.add(*batches[0], batch_id="0")
+    assert store.add(*batches[2], batch_id="2")
+    assert store.add(*batches[1], batch_id="1")
+    store.flush()
+
+    frame = pd.concat([frame_of(*batches[index]) for index in (0, 2, 1)], ignore_index=True)
+    check(ResultStore(str(tmp_path)), frame)
+
+def test_product_lookup(tmp_path):
+    store = ResultStore(str(tmp_path))
+    products, scored, prices = next(scored_batches(1))
+    store.add(products, scored, prices)
+    name = products[0]
+    rows = scored.fake_scores[products == name]
+
+    product = store.product(name, 0.5)
+    assert product["reviews"] == len(rows)
+    assert product["fake"] == int((rows > 0.5).sum())
+    assert store.fake_rate(name, 0.5) == pytest.approx((rows > 0.5).mean())
+    assert store.product("unknown") is None
+    assert store.products("product-00") == sorted(set(products) & {f"product-00{index}" for index in range(10)})
+
+def test_interleaved_writers_keep_each_others_batches(tmp_path):
+    # The batch job and the app, each with its own handle on one directory
+    path = str(tmp_path)
+    batches = list(scored_batches(3, size=50))
+    job = ResultStore(path)
+    job.add("P1", batches[0][1], 100.0, batch_id="b1")
+    job.flush()
+    app = ResultStore(path)
+    job.add("P2", batches[1][1], 200.0, batch_id="b2")
+    job.flush()
+    assert app.add("amazon:X", batches[2][1], batch_id="c1")
+    app.flush()
+
+    store = ResultStore(path)
+    assert store.products() == ["P1", "P2", "amazon:X"]
+    assert store.batches == {"b1", "b2", "c1"}
+    for name, (_, scored, _) in zip(["P1", "P2", "amazon:X"], batches):
+        assert np.array_equal(store.reviews(name)["fake_score"].to_numpy(), scored.fake_scores)
+    # A long-lived handle picks up flushes made through other handles
+    assert job.products() == ["P1", "P2", "amazon:X"]
+
+def test_replayed_batch_ids_flushed_elsewhere_are_skipped(tmp_path):
+    path = str(tmp_path)
+    products, scored, prices = next(scored_batches(1, size=50))
+    first, second = ResultStore(path), ResultStore(path)
+    first.add(products, scored, prices, batch_id="same")
+    second.add(products, scored, prices, batch_id="same")
+    first.flush()
+    second.flush()
+    store = ResultStore(path)
+    check(store, frame_of(products, scored, prices))
+
+def test_concurrent_writers(tmp_path):
+    path = str(tmp_path)
+    batches = list(scored_batches(16, size=50))
+    frames = [frame_of(*batch) for batch in batches]
+
+    def write(offset):
+        store = ResultStore(path)
+        for index in range(offset, len(batches), 4):
+            store.add(*batches[index], batch_id=str(index))
+            if index % 3:
+                store.flush()
+        store.flush()
+
+    threads = [threading.Thread(target=write, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    store = ResultStore(path)
+    assert store.batches == {str(index) for index in range(len(batches))}
+    table = store.product_table(0.5)
+    expected = pd.concat(frames).groupby("product")["score"].agg(reviews="size", fake=lambda scores: (scores > 0.5).sum())
+    assert table.loc[expected.index, ["reviews", "fake"]].equals(expected)
+    for name in store.products()[::5]:
+        assert len(store.reviews(name)) == expected.loc[name, "reviews"]
@@ -0,0 +1,64 @@
+"""
+ReviewBatch concatenation, slicing and pickling (user-011).
+"""
+import pickle
+import numpy as np
+import pytest
+from components.ReviewBatch import ReviewBatch, StringColumn
+from components.ReviewGenerator import ReviewGenerator
+
+@pytest.fixture
+def batch():
+    return ReviewGenerator(seed=0).batch(500)
+
+def same(left, right):
+    assert len(left) == len(right)
+    assert left.to_reviews() == right.to_reviews()
+
+def test_from_reviews_round_trip():
+    reviews = ReviewGenerator(seed=1).batch(50).to_reviews()
+    reviews[0]["text"] = "Ünïcödé ✓ and \ud800 surrogate"
+    batch = ReviewBatch.from_reviews(reviews)
+    assert [{key: review[key] for key in reviews[0]} for review in batch.to_reviews()] == reviews
+
+def test_slice_shares_buffers(batch):
+    part = batch.slice(100, 250)
+    assert part.columns["text"].data is batch.columns["text"].data
+    assert part.to_reviews() == batch.to_reviews()[100:250]
+    assert part.slice(10, 20).to_reviews() == batch.to_reviews()[110:120]
+    assert len(batch.slice(490, 1000)) == 10
+
+def test_concat_of_slices(batch):
+    parts = [batch.slice(start, start + 150) for start in range(0, len(batch), 150)]
+    same(ReviewBatch.concat(parts), batch)
+    same(ReviewBatch.concat([parts[2], parts[0]]), ReviewBatch.concat([batch.slice(300, 450), batch.slice(0, 150)]))
+
+def test_concat_keeps_scores_only_when_all_are_scored(batch):
+    labels = ["Short", "Burst"]
+    scored = batch.with_scores(np.linspace(0, 1, len(batch)), np.arange(len(batch)) % 4, labels)
+    joined = ReviewBatch.concat([scored.slice(0, 200), scored.slice(200, 500)])
+    assert np.array_equal(joined.fake_scores, scored.fake_scores)
+    assert [joined.flags(index) for index in range(4)] == [[], ["Short"], ["Burst"], ["Short", "Burst"]]
+
+    assert ReviewBatch.concat([scored.slice(0, 10), batch.slice(10, 20)]).fake_scores is None
+    with pytest.raises(ValueError):
+        ReviewBatch.concat([scored, batch.with_scores(scored.fake_scores, scored.flag_masks, labels[::-1])])
+
+def test_pickle_round_trip(batch):
+    scored = batch.with_scores(np.linspace(0, 1, len(batch)), np.zeros(len(batch), dtype=np.uint64), ["Short"])
+    restored = pickle.loads(pickle.dumps(scored))
+    same(restored, scored)
+    assert np.array_equal(restored.fake_scores, scored.fake_scores)
+    assert restored.fingerprint() == scored.fingerprint()
+
+def test_pickled_slice_carries_only_its_window(batch):
+    part = batch.slice(400, 410)
+    restored = pickle.loads(pickle.dumps(part))
+    same(restored, part)
+    assert restored.columns["text"].offsets[0] == 0
+    assert len(pickle.dumps(part.columns["text"])) < len(batch.columns["text"].data) / 10
+
+def test_string_column_from_strings():
+    column = StringColumn.from_strings(["a", "", "ccc"])
+    assert list(column) == ["a", "", "ccc"]
+    assert list(StringColumn.concat([column.slice(1, 3), column.slice(0, 1)])) == ["", "ccc", "a"]
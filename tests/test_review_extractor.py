@@ -0,0 +1,35 @@
+"""
+Review container cutting of ReviewExtractor (user-007).
+"""
+import pytest
+from components.ReviewExtractor import BACKENDS, ReviewExtractor
+
+def review(text):
+    return (
+        '<div data-hook="review"><span class="a-profile-name">Sam</span>'
+        f'<span data-hook="review-body"> {text} </span></div>'
+    )
+
+PAGE = (
+    '<html><body><div id="nav"><div data-hook="review">Ad</div></div>'
+    '<div id="cm_cr-review_list" class="a-section">'
+    f'<div class="a-row">{review("Works well.")}</div>{review("Too loud.")}'
+    '</div>'
+    f'<div id="recommendations">{review("From another product.")}</div>'
+    '</body></html>'
+)
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_only_reviews_inside_the_container_are_extracted(backend):
+    reviews = ReviewExtractor("amazon", backend).extract(PAGE)
+    assert [fields["text"] for fields in reviews] == ["Works well.", "Too loud."]
+
+def test_subtree_ends_at_the_container_end_tag():
+    subtree = ReviewExtractor("amazon", "bs4")._review_subtree(PAGE)
+    assert subtree.startswith('<div id="cm_cr-review_list"')
+    assert subtree.endswith(f'{review("Too loud.")}</div>')
+
+def test_unclosed_container_keeps_the_rest_of_the_page():
+    truncated = PAGE[:PAGE.index('<div id="recommendations">') - len("</div>")]
+    subtree = ReviewExtractor("amazon", "bs4")._review_subtree(truncated)
+    assert subtree == truncated[truncated.index('<div id="cm_cr-review_list"'):]
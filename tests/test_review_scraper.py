@@ -0,0 +1,59 @@
+"""
+Review page URLs and the incremental stop of ReviewScraper (user-019).
+"""
+import asyncio
+from urllib.parse import parse_qs, urlparse
+import pytest
+from components.ReviewScraper import ReviewScraper
+
+@pytest.mark.parametrize("url, site, path, params", [
+    ("https://www.amazon.com/Some-Product/dp/B000000001?ref=x", "amazon", "/product-reviews/B000000001/",
+     {"sortBy": ["recent"], "pageNumber": ["3"], "ref": ["x"]}),
+    ("https://www.bestbuy.com/site/reviews/some-product/1234567", "bestbuy", "/site/reviews/some-product/1234567",
+     {"sort": ["MOST_RECENT"], "page": ["3"]}),
+    ("https://www.walmart.com/reviews/product/123456", "walmart", "/reviews/product/123456",
+     {"sort": ["submission-desc"], "page": ["3"]}),
+])
+def test_page_urls_are_sorted_newest_first(url, site, path, params):
+    page_url = urlparse(ReviewScraper()._page_url(url, site, 3))
+    assert page_url.path == path
+    assert parse_qs(page_url.query) == params
+
+class PagesFetcher:
+    """
+    Serves canned review pages by page number.
+    """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    async def fetch(self, url):
+        page = int(parse_qs(urlparse(url).query)["pageNumber"][0])
+        self.requested.append(url)
+        return self.pages.get(page)
+
+def test_paging_stops_at_first_seen_review(monkeypatch):
+    reviews = [{"text": f"review {index}"} for index in range(6)]
+    scraper = ReviewScraper(fetcher=PagesFetcher({1: "1", 2: "2", 3: "3"}))
+    monkeypatch.setattr(scraper, "_parse_page", lambda html, site: reviews[(int(html) - 1) * 2:int(html) * 2])
+
+    class Seen:
+        def __contains__(self, review):
+            return review["text"] == "review 3"
+
+    async def collect():
+        return [page async for page in scraper.astream("https://www.amazon.com/dp/B000000001", "amazon", 100, 3, Seen())]
+
+    pages = asyncio.run(collect())
+    assert pages == [reviews[0:2], reviews[2:3]]
+
+def test_demo_fallback_only_without_seen_reviews():
+    scraper = ReviewScraper(fetcher=PagesFetcher({}))
+    url = "https://www.amazon.com/dp/B000000001"
+    assert len(scraper.scrape(url, min_count=10)) == 10
+    assert len(scraper.scrape(url, min_count=10, seen=set())) == 0
+    assert len(scraper.scrape(url, min_count=10, mock_fallback=False)) == 0
+    assert len(scraper.scrape("https://shop.example.com/p/1", min_count=10)) == 10
+    with pytest.raises(ValueError):
+        scraper.scrape("https://shop.example.com/p/1", mock_fallback=False)
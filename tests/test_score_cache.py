@@ -0,0 +1,68 @@
+"""
+ScoreCache disk accounting, sharing across threads and reuse by ReviewAnalyzer (user-005).
+"""
+import pickle
+import threading
+import numpy as np
+from components.ReviewAnalyzer import ReviewAnalyzer
+from components.ReviewGenerator import ReviewGenerator
+from components.ScoreCache import ScoreCache
+
+def stored_bytes(cache):
+    return cache._connect().execute("SELECT COALESCE(SUM(size), 0) FROM scores").fetchone()[0]
+
+def test_replacing_a_row_does_not_grow_disk_bytes(tmp_path):
+    cache = ScoreCache(path=str(tmp_path / "scores.sqlite"))
+    for round in range(5):
+        for index in range(100):
+            cache.put(f"key-{index}", 0.5, ["Very short review"] * (round % 3))
+    cache.flush()
+    assert cache.stats()["disk_bytes"] == stored_bytes(cache)
+
+    reopened = ScoreCache(path=cache.path)
+    assert reopened.get("key-0") == (0.5, ["Very short review"])
+    assert reopened.stats()["disk_bytes"] == stored_bytes(cache)
+
+def test_disk_tier_stays_under_its_limit(tmp_path):
+    cache = ScoreCache(max_items=10, path=str(tmp_path / "scores.sqlite"), max_disk_bytes=20000)
+    for round in range(3):
+        for index in range(500):
+            cache.put(f"key-{index}", 0.5, ["Unverified purchase"])
+            if index % 50 == 49:
+                cache.flush()
+    assert cache.stats()["disk_bytes"] == stored_bytes(cache) <= 20000
+    assert cache.get("key-499") == (0.5, ["Unverified purchase"])
+
+def test_analyzer_reuses_cached_scores(tmp_path):
+    reviews = ReviewGenerator(seed=0).batch(100).to_reviews()
+    analyzer = ReviewAnalyzer(cache=ScoreCache(path=str(tmp_path / "scores.sqlite")))
+    first = analyzer.analyze_reviews(reviews)
+    second = ReviewAnalyzer(cache=ScoreCache(path=analyzer.cache.path)).analyze_reviews(reviews)
+    assert np.array_equal(first.fake_scores, second.fake_scores)
+    assert [review["flags"] for review in first.reviews] == [review["flags"] for review in second.reviews]
+
+def test_cache_is_shared_across_threads(tmp_path):
+    cache = ScoreCache(max_items=50, path=str(tmp_path / "scores.sqlite"))
+    cache.put("warm", 0.1, [])
+    errors = []
+
+    def work(thread):
+        try:
+            for index in range(300):
+                cache.put(f"key-{thread}-{index}", index / 300, ["New reviewer"])
+                assert cache.get(f"key-{thread}-{index}") == (index / 300, ["New reviewer"])
+                if index % 100 == 99:
+                    cache.flush()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(thread,)) for thread in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert cache.stats()["memory_items"] == 50
+    assert cache.stats()["disk_bytes"] == stored_bytes(cache)
+    assert pickle.loads(pickle.dumps(cache)).get("key-3-0") == (0.0, ["New reviewer"])
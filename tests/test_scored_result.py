@@ -0,0 +1,42 @@
+"""
+Re-slicing a ScoredResult at other thresholds (user-009).
+"""
+import csv
+import numpy as np
+import pytest
+from components.ReviewAnalyzer import ReviewAnalyzer
+from components.ReviewGenerator import ReviewGenerator
+
+@pytest.fixture
+def result():
+    return ReviewAnalyzer().analyze_reviews(ReviewGenerator(seed=0).batch(3000), threshold=0.7)
+
+@pytest.mark.parametrize("threshold", [0.0, 0.05, 0.3, 0.5, 0.7, 0.9, 0.95, 1.0])
+def test_with_threshold_matches_rescoring_the_mask(result, threshold):
+    sliced = result.with_threshold(threshold)
+    expected = result.fake_scores > threshold
+
+    assert sliced.threshold == threshold
+    assert sliced.fake_count() == int(expected.sum())
+    assert np.array_equal(sliced.is_fake, expected)
+    assert sorted(sliced.fake_indices().tolist()) == np.flatnonzero(expected).tolist()
+    assert sliced.fake_percentage == round(expected.mean() * 100)
+    assert sliced.real_percentage == 100 - sliced.fake_percentage
+    assert [review["is_fake"] for review in sliced.head(50)] == expected[:50].tolist()
+
+def test_with_threshold_shares_arrays(result):
+    sliced = result.with_threshold(0.2)
+    assert sliced.fake_scores is result.fake_scores
+    assert sliced._order is result._order
+    assert result.threshold == 0.7
+
+def test_threshold_curve(result):
+    curve = result.threshold_curve([0.1, 0.5, 0.9])
+    for threshold, rate in zip(curve["threshold"], curve["fake_rate"]):
+        assert rate == pytest.approx((result.fake_scores > threshold).mean())
+
+def test_exports_follow_the_threshold(result):
+    sliced = result.with_threshold(0.5)
+    rows = list(csv.DictReader("".join(sliced.iter_csv(chunk_rows=100)).splitlines()))
+    assert len(rows) == len(result)
+    assert [row["Is Fake"] == "True" for row in rows] == sliced.is_fake.tolist()
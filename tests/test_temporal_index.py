@@ -0,0 +1,60 @@
+"""
+Bursts and repeat reviewers in the TemporalIndex (user-021).
+"""
+import numpy as np
+from components.ReviewAnalyzer import ReviewAnalyzer
+from components.ReviewBatch import ReviewBatch
+from components.TemporalIndex import TemporalIndex
+
+def test_generic_reviewer_names_are_not_counted():
+    index = TemporalIndex()
+    names = ["Amazon Customer", " kindle customer", "A Customer", "Jane Doe", "JD", "", None, "Jane Doe", "Jane Doe"]
+    index.add(["2024-03-01"] * len(names), [5] * len(names), names)
+
+    assert TemporalIndex.is_generic(names).tolist() == [True, True, True, False, True, True, True, False, False]
+    assert index.reviewer_counts(["Amazon Customer", "Jane Doe", "JD", ""]).tolist() == [0, 3, 0, 0]
+    assert index.reviewer_stats("Amazon Customer") is None
+    # Generic names still count toward the product's timeline
+    assert len(index) == len(names)
+
+def test_bursts_and_reviewer_stats():
+    index = TemporalIndex(window_days=1, burst_min=5, burst_ratio=2)
+    spread = [f"2024-01-{day:02d}" for day in range(1, 29)]
+    dates = spread + ["Reviewed in the United States on March 3, 2024"] * 6 + ["2 months ago"]
+    reviewers = [f"Reviewer {day}" for day in range(len(spread))] + ["Sam Roe"] * 7
+    days = index.add(dates, [4] * len(spread) + [5] * 7, reviewers)
+
+    assert days[-1] == -1
+    bursts = index.bursts(days, [4] * len(spread) + [5] * 7)
+    assert not bursts[:len(spread)].any() and bursts[len(spread):-1].all() and not bursts[-1]
+    stats = index.reviewer_stats("Sam Roe")
+    assert stats["reviews"] == 7 and stats["first_day"] == stats["last_day"] == days[len(spread)]
+
+def test_analyzer_flags_only_named_repeat_reviewers():
+    reviews = [
+        dict(text="Works as described", rating=4, date="2024-03-01", verified_purchase=True, helpful_votes=1,
+             reviewer=name, reviewer_history={"total_reviews": 5, "avg_rating": 4.0, "verified_purchases": 3})
+        for name in ["Amazon Customer"] * 3 + ["Jane Doe"] * 3
+    ]
+    analyzer = ReviewAnalyzer(temporal=TemporalIndex())
+    result = analyzer.analyze_reviews(ReviewBatch.from_reviews(reviews))
+    flagged = [ReviewAnalyzer.REPEAT_REVIEWER_FLAG in review["flags"] for review in result.reviews]
+    assert flagged == [False] * 3 + [True] * 3
+    assert np.array_equal(analyzer.temporal.reviewer_counts(["Amazon Customer", "Jane Doe"]), [0, 3])
+
+def test_incremental_adds_match_one_add():
+    rng = np.random.default_rng(0)
+    dates = (np.datetime64("2024-01-01") + rng.integers(0, 90, 5000)).astype(str)
+    ratings = rng.integers(1, 6, 5000)
+    whole = TemporalIndex(window_days=3)
+    days = whole.add(dates, ratings, [""] * 5000)
+
+    incremental = TemporalIndex(window_days=3)
+    for start in range(0, 5000, 37):
+        incremental.add(dates[start:start + 37], ratings[start:start + 37], [""] * len(dates[start:start + 37]))
+
+    assert len(incremental) == len(whole) == 5000
+    assert incremental.burst_sizes(days, ratings).tolist() == whole.burst_sizes(days, ratings).tolist()
+    assert incremental.window_histogram(days[0], days[0] + 10).tolist() == whole.window_histogram(days[0], days[0] + 10).tolist()
+    # Chunks at least double in length, so a rating holds O(log n) of them
+    assert all(len(chunks) <= 7 for chunks in incremental._days.values())